@@ -1,37 +1,130 @@
-import streamlit as st
+import os
+import sys
+import time
+import fcntl
 import hashlib
+import tempfile
+import threading
 
 # Simple file-based user storage (replace with DB in production)
 USER_DB = "users.txt"
 
+# In-memory index of USER_DB: username -> password hash. users.txt stays the
+# source of truth; the index is refreshed when its stat signature changes, and
+# appended lines are parsed incrementally instead of re-reading the whole file.
+_lock = threading.Lock()
+_index = {"path": None, "signature": None, "offset": 0, "users": {}}
+
+
 def hash_password(password):
     return hashlib.sha256(password.encode()).hexdigest()
 
-def save_user(username, password):
-    with open(USER_DB, "a") as f:
-        f.write(f"{username}:{hash_password(password)}\n")
 
-def validate_user(username, password):
+# --- Index ---
+def _parse_lines(data, users):
+    for line in data.splitlines():
+        u, sep, p = line.rpartition(":")
+        if sep:
+            users.setdefault(u, p)
+
+
+def _refresh(path):
+    """Bring the index up to date with `path` (caller holds _lock)"""
     try:
-        with open(USER_DB, "r") as f:
-            users = f.readlines()
-        hashed = hash_password(password)
-        for user in users:
-            u, p = user.strip().split(":")
-            if u == username and p == hashed:
-                return True
-        return False
+        st = os.stat(path)
     except FileNotFoundError:
-        return False
+        _index.update(path=path, signature=None, offset=0, users={})
+        return
+    signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+    if _index["path"] == path and _index["signature"] == signature:
+        return
+
+    appended = (
+        _index["path"] == path
+        and _index["signature"] is not None
+        and _index["signature"][0] == st.st_ino
+        and st.st_size > _index["offset"]
+    )
+    users = _index["users"] if appended else {}
+    offset = _index["offset"] if appended else 0
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    # only index complete lines; a half-written last line is picked up next time
+    end = data.rfind(b"\n") + 1
+    _parse_lines(data[:end].decode("utf-8", errors="replace"), users)
+    _index.update(path=path, signature=signature, offset=offset + end, users=users)
+
+
+def _lookup(username):
+    with _lock:
+        _refresh(USER_DB)
+        return _index["users"].get(username)
+
+
+# --- Public API ---
+def register_user(username, password):
+    """Atomically add a user; returns False if the username is already taken"""
+    hashed = hash_password(password)
+    with _lock:
+        with open(USER_DB, "a+b") as f:
+            # the file lock covers other processes, _lock covers other sessions in this one
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                _refresh(USER_DB)
+                if username in _index["users"]:
+                    return False
+                f.write(f"{username}:{hashed}\n".encode())
+                f.flush()
+                os.fsync(f.fileno())
+                _refresh(USER_DB)
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+    return True
+
+
+def save_user(username, password):
+    register_user(username, password)
+
+
+def validate_user(username, password):
+    stored = _lookup(username)
+    return stored is not None and stored == hash_password(password)
+
 
 def user_exists(username):
-    try:
-        with open(USER_DB, "r") as f:
-            users = f.readlines()
-        for user in users:
-            u, _ = user.strip().split(":")
-            if u == username:
-                return True
-        return False
-    except FileNotFoundError:
-        return False
+    return _lookup(username) is not None
+
+
+# --- Benchmark ---
+def benchmark(sizes=(10, 1_000, 100_000, 1_000_000), logins=2_000):
+    """Login latency against user files of increasing size"""
+    global USER_DB
+    original = USER_DB
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            USER_DB = os.path.join(tmp, f"users_{size}.txt")
+            hashed = hash_password("secret")
+            with open(USER_DB, "w") as f:
+                f.writelines(f"user{i}:{hashed}\n" for i in range(size))
+
+            start = time.perf_counter()
+            user_exists("warmup")
+            load = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for i in range(logins):
+                validate_user(f"user{(i * 7919) % size}", "secret")
+            per_login = (time.perf_counter() - start) / logins
+
+            start = time.perf_counter()
+            register_user(f"new{size}", "secret")
+            register = time.perf_counter() - start
+            print(f"{size:>9,} users: index build {load * 1000:8.1f}ms, "
+                  f"login {per_login * 1e6:6.2f}us, register {register * 1000:6.2f}ms")
+    USER_DB = original
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark()
@@ -0,0 +1,268 @@
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import hashlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from PIL import Image, ImageDraw
+
+# Deterministic synthetic data in the app's own storage formats, for scaling
+# tests: proverbs_posts.json + likes.json, Stories Sharing/posts.json,
+# meme_data.json, users.txt, plus template / story images for the posts to
+# point at. Every stream draws from its own Random seeded with (seed, stream),
+# so a seed always produces the same bytes whichever files are generated.
+# Records are generated lazily and written as they come: memory stays flat
+# for millions of posts.
+#
+#   python -m bench.corpus --generate /tmp/corpus           # POSTS posts per feed
+#   CORPUSEUM_CORPUS_POSTS=10000 python -m bench.corpus --generate /tmp/corpus
+
+POSTS = int(os.environ.get("CORPUSEUM_CORPUS_POSTS", "1000000"))  # per feed
+USERS = int(os.environ.get("CORPUSEUM_CORPUS_USERS", "10000"))
+SEED = int(os.environ.get("CORPUSEUM_CORPUS_SEED", "7"))
+PASSWORD = "secret"  # every generated user's password
+TEMPLATES = 24  # generated meme templates / story images
+IMAGE_SIZE = (600, 600)
+START = datetime(2024, 1, 1)
+
+_WORDS = (
+    "సామెత", "కథ", "మీమ్", "అమ్మ", "నాన్న", "అమ్మమ్మ", "పరీక్ష", "ఆఫీసు", "పండుగ", "సినిమా",
+    "బిర్యానీ", "పులిహోర", "వర్షం", "ఊరు", "పల్లె", "చదువు", "స్నేహం", "ప్రేమ", "డబ్బు", "కాలం",
+    "నీరు", "అన్నం", "ఆవు", "కొడుకు", "గుర్రం", "ఇల్లు", "బడి", "పొలం", "దేవుడు", "రాజు",
+    "మంచి", "చెడు", "పెద్ద", "చిన్న", "కొత్త", "పాత", "చాలా", "ఎప్పుడూ", "ఇప్పుడు", "మళ్ళీ",
+    "monday", "office", "exam", "reel", "cricket", "traffic", "chai", "weekend", "boss", "hostel",
+)
+_SUFFIXES = ("", "", "", "కు", "ని", "తో", "లో", "లు", "గారు", "లా")
+_ENDINGS = ("", "!", "?", "...", " 😂", " 🙏", " 🔥")
+
+
+# --- Records ---
+def _rng(seed, stream):
+    return random.Random(f"{seed}:{stream}")
+
+
+def sentence(rng, words):
+    """`words` random Telugu / Tenglish words, some inflected"""
+    text = " ".join(rng.choice(_WORDS) + rng.choice(_SUFFIXES) for _ in range(words))
+    return text + rng.choice(_ENDINGS)
+
+
+def username(n):
+    return f"user{n}"
+
+
+def _skewed(rng, n):
+    # log-uniform index in [0, n): low indexes come up far more often (user0 is the most active user)
+    return int(n ** rng.random()) - 1
+
+
+def _user(rng, users):
+    return username(_skewed(rng, users))
+
+
+def _popularity(rng, cap):
+    # log-normal counts: most posts get a handful of upvotes / likes, a few get hundreds
+    return min(cap, int(rng.lognormvariate(1.0, 1.5)))
+
+
+def _comments(rng, author, users):
+    comments = []
+    for _ in range(min(20, int(rng.expovariate(0.4)))):
+        comment = {"user": _user(rng, users), "text": sentence(rng, rng.randint(2, 10))}
+        roll = rng.random()
+        if roll < 0.2:
+            comment["reply"] = sentence(rng, rng.randint(2, 8))  # the author's reply under the comment
+        elif roll < 0.3:
+            comment["reply"] = ""
+        comments.append(comment)
+        if rng.random() < 0.1:
+            comments.append({"user": author, "text": sentence(rng, rng.randint(2, 6))})  # author answers in thread
+    return comments
+
+
+def _timestamps(rng):
+    created_at = START
+    while True:
+        created_at += timedelta(seconds=rng.randint(1, 900))
+        yield created_at.isoformat()
+
+
+def proverb_posts(count, seed=SEED, users=USERS, first_id=1):
+    """Posts shaped like proverbs_posts.json"""
+    rng = _rng(seed, "proverbs")
+    for n, created_at in zip(range(first_id, first_id + count), _timestamps(rng)):
+        author = _user(rng, users)
+        yield {
+            "id": str(n),
+            "caption": sentence(rng, rng.randint(3, 7)),
+            "description": sentence(rng, rng.randint(10, 30)),
+            "author": author,
+            "image": f"https://via.placeholder.com/300x200.png?text=Proverb+{n}",
+            "section": "Proverb and Entertainment",
+            "upvotes": _popularity(rng, users),
+            "comments": _comments(rng, author, users),
+            "timestamp": created_at,
+        }
+
+
+def proverb_likes(count, seed=SEED, users=USERS, first_id=1):
+    """(username, [post id, ...]) pairs shaped like likes.json, popular posts liked most"""
+    rng = _rng(seed, "proverb_likes")
+    for n in range(users):
+        liked = {first_id + _skewed(rng, count) for _ in range(_popularity(rng, count))}
+        if liked:
+            yield username(n), [str(post_id) for post_id in sorted(liked)]
+
+
+def story_posts(count, seed=SEED, users=USERS, first_id=1, images=("stories.jpg",)):
+    """Posts shaped like posts/Stories Sharing/posts.json"""
+    rng = _rng(seed, "stories")
+    for n, created_at in zip(range(first_id, first_id + count), _timestamps(rng)):
+        author = _user(rng, users)
+        paragraphs = rng.randint(1, 4)
+        yield {
+            "id": str(n),
+            "caption": sentence(rng, rng.randint(2, 5)),
+            "description": " ".join(sentence(rng, rng.randint(15, 60)) for _ in range(paragraphs)),
+            "author": author,
+            "image": rng.choice(images),
+            "section": "Stories Sharing",
+            "upvotes": _popularity(rng, users),
+            "comments": _comments(rng, author, users),
+            "timestamp": created_at,
+        }
+
+
+def memes(count, seed=SEED, users=USERS, templates=("meme10.jpg",)):
+    """Memes shaped like meme_data.json; each points at one of `templates` as its image"""
+    rng = _rng(seed, "memes")
+    for _ in range(count):
+        author = _user(rng, users)
+        template = rng.choice(templates)
+        likes = rng.sample(range(users), _popularity(rng, users))
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "username": author,
+            "text": sentence(rng, rng.randint(2, 8)),
+            "template": template,
+            "image_path": template,
+            "likes": [username(n) for n in likes],
+            "comments": _comments(rng, author, users),
+            "caption": sentence(rng, rng.randint(1, 4)) + " #తెలుగు_వైబ్స్",
+        }
+
+
+def user_lines(users=USERS):
+    """users.txt lines; every password is PASSWORD"""
+    hashed = hashlib.sha256(PASSWORD.encode()).hexdigest()
+    for n in range(users):
+        yield f"{username(n)}:{hashed}\n"
+
+
+# --- Images ---
+def make_images(folder, prefix, count=TEMPLATES, fmt="PNG", seed=SEED):
+    """`count` gradient-and-shapes images named <prefix>_NN.<ext> in `folder`; returns the names"""
+    rng = _rng(seed, f"images:{prefix}")
+    extension = {"PNG": "png", "JPEG": "jpg"}[fmt]
+    os.makedirs(folder, exist_ok=True)
+    names = []
+    for n in range(count):
+        top, bottom = [tuple(rng.randrange(256) for _ in range(3)) for _ in range(2)]
+        gradient = Image.linear_gradient("L").resize(IMAGE_SIZE)
+        image = Image.composite(Image.new("RGB", IMAGE_SIZE, bottom), Image.new("RGB", IMAGE_SIZE, top), gradient)
+        draw = ImageDraw.Draw(image)
+        for _ in range(rng.randint(3, 8)):
+            x, y = rng.randrange(IMAGE_SIZE[0]), rng.randrange(IMAGE_SIZE[1])
+            r = rng.randint(20, 120)
+            draw.ellipse((x - r, y - r, x + r, y + r), fill=tuple(rng.randrange(256) for _ in range(3)))
+        name = f"{prefix}_{n:02d}.{extension}"
+        with _replacing(os.path.join(folder, name), "wb") as f:
+            image.save(f, format=fmt)
+        names.append(name)
+    return names
+
+
+# --- Writers ---
+@contextmanager
+def _replacing(path, mode="w"):
+    """Write to a temp file next to `path` and move it into place when the block succeeds"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_json_array(path, records):
+    """Stream `records` into `path` as a JSON array, one record per line; returns the count"""
+    count = 0
+    with _replacing(path) as f:
+        f.write("[")
+        for record in records:
+            f.write(",\n" if count else "\n")
+            f.write(json.dumps(record, ensure_ascii=False))
+            count += 1
+        f.write("\n]\n")
+    return count
+
+
+def write_json_object(path, items):
+    """Stream (key, value) pairs into `path` as a JSON object; returns the count"""
+    count = 0
+    with _replacing(path) as f:
+        f.write("{")
+        for key, value in items:
+            f.write(",\n" if count else "\n")
+            f.write(f"{json.dumps(key, ensure_ascii=False)}: {json.dumps(value, ensure_ascii=False)}")
+            count += 1
+        f.write("\n}\n")
+    return count
+
+
+def write_lines(path, lines):
+    count = 0
+    with _replacing(path) as f:
+        for line in lines:
+            f.write(line)
+            count += 1
+    return count
+
+
+# --- Whole corpus ---
+def generate(out_dir, posts=POSTS, seed=SEED, users=USERS):
+    """Write a full corpus under `out_dir`, laid out like the repository; prints one line per file"""
+    def report(path, count, start):
+        print(f"{os.path.relpath(path, out_dir):50s} {count:>10,} records {os.path.getsize(path) / 2**20:9.1f} MB "
+              f"{time.perf_counter() - start:7.1f}s")
+
+    start = time.perf_counter()
+    templates = make_images(os.path.join(out_dir, "sections", "templates"), "synthetic", seed=seed)
+    story_images = make_images(os.path.join(out_dir, "image"), "synthetic_story", fmt="JPEG", seed=seed)
+    print(f"{2 * TEMPLATES} images in {time.perf_counter() - start:.1f}s")
+
+    proverbs_dir = os.path.join(out_dir, "posts", "Proverb and Entertainment")
+    outputs = (
+        (os.path.join(proverbs_dir, "proverbs_posts.json"), write_json_array, proverb_posts(posts, seed, users)),
+        (os.path.join(proverbs_dir, "likes.json"), write_json_object, proverb_likes(posts, seed, users)),
+        (os.path.join(out_dir, "posts", "Stories Sharing", "posts.json"), write_json_array,
+         story_posts(posts, seed, users, images=story_images)),
+        (os.path.join(out_dir, "sections", "meme_data.json"), write_json_array,
+         memes(posts, seed, users, templates=templates)),
+        (os.path.join(out_dir, "users.txt"), write_lines, user_lines(users)),
+    )
+    for path, write, records in outputs:
+        start = time.perf_counter()
+        report(path, write(path, records), start)
+
+
+if __name__ == "__main__":
+    if "--generate" in sys.argv:
+        generate(sys.argv[sys.argv.index("--generate") + 1])
@@ -0,0 +1,442 @@
+import os
+import sys
+import time
+import random
+import shutil
+import socket
+import asyncio
+import resource
+import tempfile
+import subprocess
+import multiprocessing
+import urllib.request
+
+from . import corpus
+
+# Headless load test: every page (main.run(), phonetictranslate.run() and each
+# section's *_app()) is driven through streamlit.testing.v1.AppTest against a
+# synthetic post store of POSTS posts (bench/corpus.py), with comments and
+# skewed likes.
+#
+# SESSIONS simulated users each open every page, then click through ACTIONS
+# random interactions (rerun, page, like, comment, post meme). Each session is
+# its own process: AppTest swaps process-wide Streamlit state on every run, so
+# sessions can't share one, and a process per session gives clean counters.
+# Reported per action: p50 / p95 / p99 rerun latency and bytes written
+# (/proc/self/io wchar: SQLite, thumbnails, meme files), plus the peak RSS of
+# the sessions.
+#
+#   python -m bench.loadtest --bench
+#   CORPUSEUM_LOADTEST_POSTS=1000 CORPUSEUM_LOADTEST_SESSIONS=8 python -m bench.loadtest --bench
+#
+# --interactions measures what a like or a comment costs the server: a real
+# `streamlit run` process serves each feed over a FEED_POSTS-post corpus, and a
+# minimal websocket client clicks like / comment widgets the way the frontend
+# does (fragment-scoped when the widget sits in a fragment). Reported per
+# click: server CPU time (/proc/<pid>/stat) and latency until the run finished.
+#
+#   python -m bench.loadtest --interactions
+
+POSTS = tuple(int(n) for n in os.environ.get("CORPUSEUM_LOADTEST_POSTS", "1000,100000,1000000").split(","))
+SESSIONS = int(os.environ.get("CORPUSEUM_LOADTEST_SESSIONS", "4"))
+ACTIONS = int(os.environ.get("CORPUSEUM_LOADTEST_ACTIONS", "40"))  # per session, after opening every page
+SEED = 7
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = ("main", "phonetictranslate", "stories_sharing", "proverb_entertainment", "desi_meme_creator", "about_developers")
+
+# Feed widgets per section: pagination key, like button prefix, comment input prefix and submit key
+FEEDS = {
+    "proverb_entertainment": ("proverb_feed", "like_", "comment_", "FormSubmitter:comment_form_{}-Post"),
+    "stories_sharing": ("stories_feed", "up_", "comm_", "submit_{}"),
+    "desi_meme_creator": ("meme_feed", "like_", "comment_", "FormSubmitter:comment_form_{}-Post"),
+}
+SECTIONS = {
+    "proverb_entertainment": "Proverb and Entertainment",
+    "stories_sharing": "Stories Sharing",
+    "desi_meme_creator": "Desi Meme Creator",
+}
+# Interactions and how often sessions pick them
+ACTION_WEIGHTS = {"rerun": 3, "page": 3, "like": 4, "comment": 2, "post_meme": 1}
+MEME_TEMPLATE = "meme10.jpg"
+POST_TIMEOUT = 120  # seconds to wait for a queued meme to be published
+FEED_POSTS = 500  # posts per feed for --interactions
+CLICKS = int(os.environ.get("CORPUSEUM_LOADTEST_CLICKS", "40"))  # likes + comments per feed
+
+# --- Corpus ---
+def build_corpus(posts, seed=SEED):
+    """Fill the post store with `posts` synthetic posts (bench/corpus.py) split over the three feeds"""
+    from sections import desi_meme_creator, post_store, proverb_entertainment, stories_sharing  # seeds the JSON posts
+
+    templates = sorted(name for name in os.listdir(desi_meme_creator.TEMPLATE_FOLDER)
+                       if not name.startswith("meme_") and not desi_meme_creator.meme_render.is_animated(
+                           os.path.join(desi_meme_creator.TEMPLATE_FOLDER, name)))
+    count = posts // len(SECTIONS)
+    proverbs_from = int(post_store.allocate_id(SECTIONS["proverb_entertainment"]))
+    feeds = {
+        "proverb_entertainment": corpus.proverb_posts(count, seed, first_id=proverbs_from),
+        "stories_sharing": corpus.story_posts(
+            count, seed, first_id=int(post_store.allocate_id(SECTIONS["stories_sharing"])), images=("stories.jpg",)),
+        "desi_meme_creator": corpus.memes(count, seed, templates=templates),
+    }
+    start = time.perf_counter()
+    conn = post_store.get_connection()
+    conn.execute("BEGIN")
+    for page, records in feeds.items():
+        for post in records:
+            post_store._insert_post(conn, SECTIONS[page], post)
+    for username, post_ids in corpus.proverb_likes(count, seed, first_id=proverbs_from):
+        conn.executemany(
+            "INSERT OR IGNORE INTO likes (section, post_id, username) VALUES (?, ?, ?)",
+            [(SECTIONS["proverb_entertainment"], post_id, username) for post_id in post_ids],
+        )
+    conn.execute("COMMIT")
+    # fold the bulk load into the database file now, not in the first session that writes
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    post_store._written()
+    return {"seconds": time.perf_counter() - start, "db_bytes": os.path.getsize(post_store.DB_FILE)}
+
+
+# --- Sessions ---
+def _page():
+    # AppTest script: renders the page named in session state, as the launcher would
+    import importlib
+    import streamlit as st
+
+    page = st.session_state["loadtest_page"]
+    if page == "main":
+        import main
+        main.run()
+    elif page == "phonetictranslate":
+        import phonetictranslate
+        phonetictranslate.run()
+    else:
+        getattr(importlib.import_module(f"sections.{page}"), f"{page}_app")()
+
+
+def _written_bytes():
+    try:
+        with open("/proc/self/io") as f:
+            return next(int(line.split()[1]) for line in f if line.startswith("wchar:"))
+    except (OSError, StopIteration):
+        return 0
+
+
+def _keys(widgets, prefix):
+    return [w.key[len(prefix):] for w in widgets if w.key and w.key.startswith(prefix)]
+
+
+def _page_step(at, page, rng):
+    feed = FEEDS[page][0]
+    buttons = {b.key: b for b in at.button if b.key in (f"{feed}_next", f"{feed}_prev")}
+    for key in (f"{feed}_next", f"{feed}_prev") if rng.random() < 0.8 else (f"{feed}_prev", f"{feed}_next"):
+        if key in buttons and not buttons[key].disabled:
+            return buttons[key].click
+    return None
+
+
+def _like_step(at, page, rng):
+    post_ids = _keys(at.button, FEEDS[page][1])
+    if not post_ids:
+        return None
+    return at.button(key=FEEDS[page][1] + rng.choice(post_ids)).click
+
+
+def _comment_step(at, page, rng):
+    _, _, input_prefix, submit_key = FEEDS[page]
+    post_ids = [post_id for post_id in _keys(at.text_input, input_prefix)
+                if any(b.key == submit_key.format(post_id) for b in at.button)]
+    if not post_ids:
+        return None
+    post_id = rng.choice(post_ids)
+
+    def step():
+        at.text_input(key=input_prefix + post_id).input(corpus.sentence(rng, rng.randint(2, 6)))
+        return at.button(key=submit_key.format(post_id)).click()
+    return step
+
+
+def _post_meme_step(at, page, rng):
+    post_buttons = [b for b in at.button if "Post Meme" in b.label]
+    if len(at.text_area) < 2 or not post_buttons:
+        return None
+
+    def step():
+        at.text_area[0].input(corpus.sentence(rng, 4))
+        at.text_area[1].input(corpus.sentence(rng, 3))
+        return post_buttons[0].click()
+    return step
+
+
+def _wait_published(at):
+    deadline = time.perf_counter() + POST_TIMEOUT
+    while time.perf_counter() < deadline:
+        time.sleep(0.2)
+        at.run()
+        if any("posted" in s.value for s in at.success) or at.exception:
+            return
+    raise TimeoutError("meme was not published in time")
+
+
+_STEPS = {"page": _page_step, "like": _like_step, "comment": _comment_step, "post_meme": _post_meme_step}
+
+
+def _session(index, actions, seed):
+    """One simulated user: open every page, then `actions` random interactions.
+
+    Returns (action, page, ms, bytes written, exceptions shown) samples and the peak RSS in KB.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    from sections import desi_meme_creator
+
+    rng = random.Random(seed * 1000 + index)
+    samples = []
+    apps = {}
+    for page in PAGES:
+        at = apps[page] = AppTest.from_function(_page, default_timeout=600)
+        at.session_state["loadtest_page"] = page
+        at.session_state["username"] = f"loadtest{index}"
+        at.session_state["selected_template"] = os.path.join(desi_meme_creator.TEMPLATE_FOLDER, MEME_TEMPLATE)
+        at.session_state["selected_template_name"] = MEME_TEMPLATE
+
+    def measure(action, page, step, settle=None):
+        written = _written_bytes()
+        start = time.perf_counter()
+        at = step().run()
+        ms = (time.perf_counter() - start) * 1000
+        if settle is not None:
+            settle(at)
+            samples.append((f"{action} (published)", page, (time.perf_counter() - start) * 1000, None, 0))
+        samples.append((action, page, ms, _written_bytes() - written, len(at.exception)))
+
+    for page in PAGES:
+        measure("open", page, lambda: apps[page])
+
+    names, weights = zip(*ACTION_WEIGHTS.items())
+    for _ in range(actions):
+        action = rng.choices(names, weights)[0]
+        page = "desi_meme_creator" if action == "post_meme" else rng.choice(
+            PAGES if action == "rerun" else tuple(FEEDS))
+        at = apps[page]
+        if action == "rerun":
+            measure(action, page, lambda: at)
+            continue
+        step = _STEPS[action](at, page, rng)
+        if step is None:
+            continue  # nothing to click on this page right now
+        measure(action, page, step, _wait_published if action == "post_meme" else None)
+    return samples, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+# --- Report ---
+def _percentile(values, q):
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def _report(samples):
+    by_action = {action: ([], [], [0]) for action in ("open", "rerun", *_STEPS, "post_meme (published)")}
+    for action, _, ms, written, errors in samples:
+        entry = by_action[action]
+        entry[0].append(ms)
+        if written is not None:
+            entry[1].append(written)
+        entry[2][0] += errors
+    print(f"  {'action':22s} {'n':>5s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'KB written':>11s} {'errors':>7s}")
+    for action, (latencies, written, errors) in by_action.items():
+        if not latencies:
+            continue
+        latencies.sort()
+        kb = f"{sum(written) / len(written) / 1024:11.1f}" if written else f"{'-':>11s}"
+        print(f"  {action:22s} {len(latencies):5d} {_percentile(latencies, 0.5):9.1f} {_percentile(latencies, 0.95):9.1f} "
+              f"{_percentile(latencies, 0.99):9.1f} {kb} {errors[0]:7d}")
+
+
+def _use_scratch(tmp):
+    """Point the post store, caches, media and meme templates at `tmp`, for the processes spawned from now on.
+
+    The meme templates are copied over, so memes posted during a run land in `tmp`, never in the app's tree.
+    """
+    templates = os.path.join(tmp, "templates")
+    shutil.copytree(os.path.join(ROOT, "sections", "templates"), templates,
+                    ignore=shutil.ignore_patterns("meme_*"))  # the app's own posted memes stay behind
+    os.environ.update(
+        CORPUSEUM_DB=os.path.join(tmp, "posts.db"),
+        CORPUSEUM_THUMB_DIR=os.path.join(tmp, "thumbnails"),
+        CORPUSEUM_MEDIA_DIR=os.path.join(tmp, "media"),
+        CORPUSEUM_TEMPLATE_DIR=templates,
+        CORPUSEUM_METRICS_PORT="0",
+        STREAMLIT_LOGGER_LEVEL="error",  # AppTest runs print "missing ScriptRunContext" otherwise
+    )
+
+
+def run(posts, sessions=SESSIONS, actions=ACTIONS, seed=SEED):
+    """Build a corpus of `posts` posts in a scratch directory and run `sessions` concurrent sessions on it"""
+    saved_env = dict(os.environ)
+    spawn = multiprocessing.get_context("spawn")  # fresh processes pick up the scratch paths below
+    with tempfile.TemporaryDirectory() as tmp:
+        _use_scratch(tmp)
+        try:
+            with spawn.Pool(1) as pool:
+                built = pool.apply(build_corpus, (posts, seed))
+            print(f"{posts:,} posts: corpus built in {built['seconds']:.1f}s, {built['db_bytes'] / 2**20:.1f} MB; "
+                  f"{sessions} sessions x {actions} actions")
+            with spawn.Pool(sessions) as pool:
+                results = pool.starmap(_session, [(index, actions, seed) for index in range(sessions)])
+        finally:
+            os.environ.clear()
+            os.environ.update(saved_env)
+
+    _report([sample for samples, _ in results for sample in samples])
+    print(f"  peak RSS per session: {max(rss for _, rss in results) / 1024:.0f} MB")
+
+
+def benchmark():
+    for posts in POSTS:
+        run(posts)
+
+
+# --- Interaction CPU ---
+_SERVER_SCRIPT = """
+import sys
+import importlib
+import streamlit as st
+
+sys.path.insert(0, {root!r})
+st.session_state.setdefault("username", "loadtest0")
+page = st.query_params["page"]
+getattr(importlib.import_module(f"sections.{{page}}"), f"{{page}}_app")()
+"""
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _cpu_seconds(pid):
+    """utime + stime of a process, from /proc/<pid>/stat"""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+class _Browser:
+    """Just enough of the frontend's websocket protocol to rerun a page and click widgets by key"""
+
+    def __init__(self, connection, query_string):
+        self.connection = connection
+        self.query_string = query_string
+        self.widgets = {}  # widget key -> (widget id, fragment id)
+
+    async def rerun(self, *states, fragment_id=""):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        message = BackMsg()
+        message.rerun_script.query_string = self.query_string
+        message.rerun_script.fragment_id = fragment_id
+        message.rerun_script.widget_states.widgets.extend(states)
+        await self.connection.send(message.SerializeToString())
+        while True:
+            data = await asyncio.wait_for(self.connection.recv(), 60)
+            forward = ForwardMsg.FromString(data)
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                if element.WhichOneof("type") in ("button", "text_input"):
+                    widget_id = getattr(element, element.WhichOneof("type")).id
+                    self.widgets[widget_id.split("-", 2)[2]] = (widget_id, forward.delta.fragment_id)
+            elif kind == "script_finished" and forward.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                return
+
+    def keys(self, prefix):
+        return [key[len(prefix):] for key in self.widgets if key.startswith(prefix)]
+
+    async def click(self, key, text_key=None, text=""):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        widget_id, fragment_id = self.widgets[key]
+        states = [WidgetState(id=widget_id, trigger_value=True)]
+        if text_key is not None:
+            states.append(WidgetState(id=self.widgets[text_key][0], string_value=text))
+        await self.rerun(*states, fragment_id=fragment_id)
+
+
+async def _click_feed(port, pid, page, clicks, seed):
+    from websockets.asyncio.client import connect
+
+    rng = random.Random(seed)
+    _, like_prefix, input_prefix, submit_key = FEEDS[page]
+    browser = _Browser(await connect(f"ws://127.0.0.1:{port}/_stcore/stream", max_size=None), f"page={page}")
+    for _ in range(3):
+        await browser.rerun()  # open the page and warm its caches
+    samples = {"like": [], "comment": []}
+    for n in range(clicks):
+        action = ("like", "comment")[n % 2]
+        post_id = rng.choice(browser.keys(like_prefix))
+        cpu, start = _cpu_seconds(pid), time.perf_counter()
+        if action == "like":
+            await browser.click(like_prefix + post_id)
+        else:
+            await browser.click(submit_key.format(post_id), input_prefix + post_id, corpus.sentence(rng, 4))
+        samples[action].append((_cpu_seconds(pid) - cpu, time.perf_counter() - start))
+    fragments = {fragment_id for _, fragment_id in browser.widgets.values() if fragment_id}
+    await browser.connection.close()
+    return samples, len(fragments)
+
+
+def interactions(posts=FEED_POSTS, clicks=CLICKS, seed=SEED):
+    """Server CPU time per like / comment on each feed, over a corpus of `posts` posts per feed"""
+    saved_env = dict(os.environ)
+    spawn = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        _use_scratch(tmp)
+        script = os.path.join(tmp, "feed_page.py")
+        with open(script, "w", encoding="utf-8") as f:
+            f.write(_SERVER_SCRIPT.format(root=ROOT))
+        port = _free_port()
+        server = None
+        try:
+            with spawn.Pool(1) as pool:
+                pool.apply(build_corpus, (posts * len(SECTIONS), seed))
+            server = subprocess.Popen(
+                [sys.executable, "-m", "streamlit", "run", script, "--server.headless", "true",
+                 "--server.port", str(port), "--server.fileWatcherType", "none",
+                 "--browser.gatherUsageStats", "false", "--logger.level", "error"],
+                cwd=ROOT, stdout=subprocess.DEVNULL,
+            )
+            deadline = time.perf_counter() + 60
+            while True:
+                try:
+                    urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+                    break
+                except OSError:
+                    if time.perf_counter() > deadline or server.poll() is not None:
+                        raise RuntimeError("streamlit server did not start")
+                    time.sleep(0.2)
+
+            print(f"{posts:,} posts per feed, {clicks} clicks per feed")
+            print(f"  {'feed':24s} {'action':8s} {'n':>4s} {'CPU ms':>8s} {'p50 ms':>8s} {'p95 ms':>8s} {'fragments':>10s}")
+            for page in FEEDS:
+                samples, fragments = asyncio.run(_click_feed(port, server.pid, page, clicks, seed))
+                for action, values in samples.items():
+                    latencies = sorted(ms for _, ms in values)
+                    cpu_ms = sum(cpu for cpu, _ in values) / len(values) * 1000
+                    print(f"  {page:24s} {action:8s} {len(values):4d} {cpu_ms:8.1f} "
+                          f"{_percentile(latencies, 0.5) * 1000:8.1f} {_percentile(latencies, 0.95) * 1000:8.1f} "
+                          f"{fragments:10d}")
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+            os.environ.clear()
+            os.environ.update(saved_env)
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark()
+    if "--interactions" in sys.argv:
+        interactions()
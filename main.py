@@ -1,54 +1,18 @@
 import streamlit as st
 import os
-import importlib
-import base64
 
-def run():
-
-    # ---------------- Page Configuration ----------------
-    # st.set_page_config(page_title="Telugu Community App", layout="wide")
-
-    # ---------------- Section Mapping ----------------
-    SECTIONS = {
-        "Stories Sharing": {
-            "module": "stories_sharing",
-            "icon": "📖",
-            "description": "Share and discover Telugu stories"
-        },
-        "Proverb Hub": {
-            "module": "proverb_entertainment", 
-            "icon": "🎭",
-            "description": "Telugu proverbs and fun activities"
-        },
-        "Desi Meme Creator": {
-            "module": "desi_meme_creator",
-            "icon": "😄", 
-            "description": "Create hilarious desi memes"
-        },
-        "About Developers": {
-            "module": "about_developers",
-            "icon": "👨‍💻",
-            "description": "Meet the team behind the app"
-        },
-        # "Cooking and Recipe": {
-        #     "module": "cooking_recipe",
-        #     "icon": "🍛",
-        #     "description": "Traditional Telugu recipes"
-        # },
-        # "Landmarks and Historical Places": {
-        #     "module": "landmarks_and_historical_places",
-        #     "icon": "🏛️",
-        #     "description": "Explore Telugu heritage sites"
-        # },
-    }
+from sections import media, metrics, registry, stylesheets
 
-    # Initialize session state for sidebar
-    if 'sidebar_open' not in st.session_state:
-        st.session_state.sidebar_open = True
+# Import and warm every section in the background as soon as the server loads this module
+registry.preload()
+# Prometheus text on 127.0.0.1:CORPUSEUM_METRICS_PORT (sections/metrics.py)
+metrics.start_server()
 
-    # ---------------- Enhanced CSS Styling ----------------
-    st.markdown(
-        """
+# ---------------- Enhanced CSS Styling ----------------
+# Registered (and minified) once per process; run() injects it once per page render
+stylesheets.register(
+    "app",
+    """
         <style>
         /* Import Google Fonts */
         @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap');
@@ -289,33 +253,9 @@ def run():
  
 
         </style>
-        """,
-        unsafe_allow_html=True,
-    )
-
-    # ---------------- Hamburger Button (Simple Toggle) ----------------
-    # col1, col2, col3 = st.columns([1, 8, 1])
-    # with col1:
-    #     if st.button("☰" if st.session_state.sidebar_open else "☰", 
-    #                  key="hamburger_toggle", 
-    #                  help="Toggle Menu"):
-    #         st.session_state.sidebar_open = not st.session_state.sidebar_open
-    #         st.rerun()
-
-    # ---------------- Enhanced Sidebar ----------------
-
-
-    username = st.session_state.get("username", "User")
-    display_name = username if len(username) <= 7 else username[:7] + "..."
-    def get_base64_image(image_path):
-        with open(image_path, "rb") as img_file:
-            return base64.b64encode(img_file.read()).decode()
-
-    img_base64 = get_base64_image("image/Profile-PNG-Photo.png")
-
-    if st.session_state.sidebar_open:
-        with st.sidebar:
-            st.markdown("""
+    """,
+    # Sidebar profile and expander
+    """
             <style>
             .profile-container {
                 display: flex;
@@ -381,63 +321,9 @@ def run():
                 100% { background-position: 0% 50%; }
             }
             </style>
-            """, unsafe_allow_html=True)
-            col1,col2 = st.columns([1, 10])
-            with col1:
-                if st.button("🔄"):
-                    st.rerun()
-
-            st.markdown(f""" <div class="profile-container">
-                    <div class="profile-button">
-                        <img style="height:50px;width:50px" src="data:image/png;base64,{img_base64}" alt="Profile">
-                    </div>
-                    <div class="username-text">Hello, {display_name}</div>
-                </div>
-
-            """, unsafe_allow_html=True)
-            st.markdown('<div class="sidebar-title">📚 Telugu Corpuseum</div>', unsafe_allow_html=True)
-            
-            # Initialize selected section
-            if 'selected_section' not in st.session_state:
-                st.session_state.selected_section = list(SECTIONS.keys())[0]
-            
-            # Custom radio buttons
-            st.markdown('<div class="custom-radio-container">', unsafe_allow_html=True)
-            
-            for section_name, section_info in SECTIONS.items():
-                active_class = "active" if st.session_state.selected_section == section_name else ""
-                
-                if st.button(
-                    f"{section_info['icon']} {section_name}",
-                    key=f"radio_{section_name}",
-                    help=section_info['description'],
-                    use_container_width=True
-                ):
-                    st.session_state.selected_section = section_name
-                    st.rerun()
-            
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-            st.markdown("---")
-
-            st.markdown(
-                """
-                <div style='
-                    text-align: center;
-                    color: #ffffff;
-                    font-size: 17px;
-                    background: rgba(0, 0, 0, 0.3);
-                    padding: 12px 16px;
-                    border-radius: 8px;
-                '>
-                    🌟 Feel Free to Use Our Phonetic Translator To Type Telugu Words in English and Get Directly Converted Telugu Text
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
-
-
-            st.markdown("""
+    """,
+    # Sidebar primary button
+    """
                 <style>
                 div[data-testid="stSidebarContent"] div[data-testid="stButton"] button[kind="primary"] {
       background: linear-gradient(135deg, rgba(0,123,255,0.85), rgba(0,86,179,0.85));
@@ -460,26 +346,9 @@ div[data-testid="stSidebarContent"] div[data-testid="stButton"] button[kind="pri
     box-shadow: 0 6px 20px rgba(0,153,255,0.6);
 }
 </style>
-            """, unsafe_allow_html=True)
-            st.markdown("---")
-
-            if st.sidebar.button("Phonetic Translation", key="phonetic_btn", type="primary"):
-                st.session_state.view = "file"
-                st.rerun()
- 
-            st.markdown("---")
-
-            st.markdown(
-    """
-    <a href="/" target="_self" class="logout-button">
-        🚪 Logout
-    </a>
     """,
-    unsafe_allow_html=True
-      )
-            st.markdown("---")
-                
-            st.sidebar.markdown("""
+    # Sidebar about card
+    """
             <style>
             /* parent black-tinted card */
             .about-container {
@@ -554,9 +423,126 @@ div[data-testid="stSidebarContent"] div[data-testid="stButton"] button[kind="pri
             color: #eaf6ff;
             }
             </style>
+    """,
+)
+
+
+def run():
+    """Render one page; the whole rerun and the selected section are timed in sections/metrics.py"""
+    with metrics.timer("rerun"):
+        _render_page()
+
+
+def _render_page():
+
+    # ---------------- Page Configuration ----------------
+    # st.set_page_config(page_title="Telugu Community App", layout="wide")
+
+    # ---------------- Section Mapping ----------------
+    # Configured in sections/registry.py (preloaded in the background at startup)
+    SECTIONS = registry.SECTIONS
+
+    # Initialize session state for sidebar
+    if 'sidebar_open' not in st.session_state:
+        st.session_state.sidebar_open = True
+
+    # ---------------- Enhanced CSS Styling ----------------
+    # One <style> block per render; sections add theirs through sections/stylesheets.py
+    stylesheets.begin_render(st.session_state.get("selected_section", list(SECTIONS.keys())[0]))
+    stylesheets.inject("app")
+
+    # ---------------- Hamburger Button (Simple Toggle) ----------------
+    # col1, col2, col3 = st.columns([1, 8, 1])
+    # with col1:
+    #     if st.button("☰" if st.session_state.sidebar_open else "☰", 
+    #                  key="hamburger_toggle", 
+    #                  help="Toggle Menu"):
+    #         st.session_state.sidebar_open = not st.session_state.sidebar_open
+    #         st.rerun()
+
+    # ---------------- Enhanced Sidebar ----------------
+
+
+    username = st.session_state.get("username", "User")
+    display_name = username if len(username) <= 7 else username[:7] + "..."
+    # Read once per process (media URL or cached data URI, see sections/media.py)
+    profile_img_src = media.image_url("image/Profile-PNG-Photo.png")
+
+    if st.session_state.sidebar_open:
+        with st.sidebar:
+            col1,col2 = st.columns([1, 10])
+            with col1:
+                if st.button("🔄"):
+                    st.rerun()
+
+            st.markdown(f""" <div class="profile-container">
+                    <div class="profile-button">
+                        <img style="height:50px;width:50px" src="{profile_img_src}" alt="Profile">
+                    </div>
+                    <div class="username-text">Hello, {display_name}</div>
+                </div>
 
-          
             """, unsafe_allow_html=True)
+            st.markdown('<div class="sidebar-title">📚 Telugu Corpuseum</div>', unsafe_allow_html=True)
+            
+            # Initialize selected section
+            if 'selected_section' not in st.session_state:
+                st.session_state.selected_section = list(SECTIONS.keys())[0]
+            
+            # Custom radio buttons
+            st.markdown('<div class="custom-radio-container">', unsafe_allow_html=True)
+            
+            for section_name, section_info in SECTIONS.items():
+                active_class = "active" if st.session_state.selected_section == section_name else ""
+                
+                if st.button(
+                    f"{section_info['icon']} {section_name}",
+                    key=f"radio_{section_name}",
+                    help=section_info['description'],
+                    use_container_width=True
+                ):
+                    st.session_state.selected_section = section_name
+                    st.rerun()
+            
+            st.markdown('</div>', unsafe_allow_html=True)
+            
+            st.markdown("---")
+
+            st.markdown(
+                """
+                <div style='
+                    text-align: center;
+                    color: #ffffff;
+                    font-size: 17px;
+                    background: rgba(0, 0, 0, 0.3);
+                    padding: 12px 16px;
+                    border-radius: 8px;
+                '>
+                    🌟 Feel Free to Use Our Phonetic Translator To Type Telugu Words in English and Get Directly Converted Telugu Text
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+
+
+            st.markdown("---")
+
+            if st.sidebar.button("Phonetic Translation", key="phonetic_btn", type="primary"):
+                st.session_state.view = "file"
+                st.rerun()
+ 
+            st.markdown("---")
+
+            st.markdown(
+    """
+    <a href="/" target="_self" class="logout-button">
+        🚪 Logout
+    </a>
+    """,
+    unsafe_allow_html=True
+      )
+            st.markdown("---")
+                
 
 
             # Add some footer info
@@ -596,25 +582,31 @@ div[data-testid="stSidebarContent"] div[data-testid="stButton"] button[kind="pri
     function_name = f"{module_name}_app"
 
     try:
-        # Dynamically import the section module
-        section_module = importlib.import_module(f"sections.{module_name}")
-        
-        # Try to get the expected function from the module
-        section_app_function = getattr(section_module, function_name)
-        
-        # Call the app function
-        section_app_function()
-
-    except ModuleNotFoundError:
-        st.error(f"❌ Module `sections.{module_name}` not found.")
-        st.info("💡 Make sure you have created the module file in the 'sections' directory.")
-        
-    except AttributeError:
+        # Already imported by registry.preload() unless this is the very first request
+        section_module = registry.load(module_name)
+    except Exception as e:
+        # Only report "not found" for the section itself, not for a missing dependency inside it
+        if isinstance(e, ModuleNotFoundError) and e.name == f"sections.{module_name}":
+            st.error(f"❌ Module `sections.{module_name}` not found.")
+            st.info("💡 Make sure you have created the module file in the 'sections' directory.")
+        else:
+            st.error(f"❌ Failed to load the {selected_section} section due to an unexpected error.")
+            with st.expander("View Error Details"):
+                st.exception(e)
+        return
+
+    # Try to get the expected function from the module
+    section_app_function = getattr(section_module, function_name, None)
+    if section_app_function is None:
         st.error(f"❌ Function `{function_name}()` is missing in `{module_name}.py`.")
         st.info(f"💡 Add this function to your module:\n```python\ndef {function_name}():\n    st.title('{selected_section}')\n    st.write('Content for {selected_section}')\n```")
-        
+        return
+
+    try:
+        # Call the app function; failures are recorded (outcome="error") before they're shown below
+        with metrics.timer("section", section=module_name):
+            section_app_function()
     except Exception as e:
         st.error(f"❌ Failed to load the {selected_section} section due to an unexpected error.")
         with st.expander("View Error Details"):
             st.exception(e)
-
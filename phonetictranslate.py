@@ -2,17 +2,19 @@
 import streamlit as st
 from PIL import Image, ImageDraw, ImageFont
 import io
-import pandas as pd
 import datetime
 import html
 
+from sections import stylesheets
+from transliterator import transliterate_incremental
+
 # # ---- Page config ----
 # st.set_page_config(page_title="Phonetic Telugu Typing", page_icon="📝", layout="wide")
 
-def run():
-    # ---- CSS styling ----
-    # put this after st.set_page_config(...)
-    st.markdown("""
+# ---- Static page content (built once per process, not on every keystroke rerun) ----
+PAGE_STYLES = stylesheets.register(
+    "phonetic",
+    """
     <style>
     :root{
     --bg: #ffffff;
@@ -148,163 +150,10 @@ def run():
                 ul {
     color: white !important;  /* change this to your preferred color */
 }
-    </style>""", unsafe_allow_html=True)
-
-
-    # ---- Transliteration rules (phonetic) ----
-    # Independent vowels (include both common variants)
-    VOWELS_INDEPENDENT = {
-        "aa": "ఆ", "a": "అ",
-        "ii": "ఈ", "ee": "ఈ", "i": "ఇ",
-        "eh": "ఏ", "e": "ఎ",
-        "ai": "ఐ",
-        "uu": "ఊ", "u": "ఉ",
-        "oo": "ఓ", "o": "ఒ",
-        "au": "ఔ"
-    }
-
-    # vowel signs (matras) used when vowel follows a consonant
-    VOWEL_SIGNS = {
-        "a": "",    # implicit vowel
-        "aa": "ా",
-        "ii": "ీ", "ee": "ీ", "i": "ి",
-        "eh": "ే", "e": "ె",
-        "ai": "ై",
-        "uu": "ూ", "u": "ు",
-        "oo": "ో", "o": "ొ",
-        "au": "ౌ"
-    }
-
-    # Consonants (base glyphs; we add virama only when needed)
-    CONSONANTS = {
-        # longer tokens first (digraphs)
-        "chh": "ఛ", "ch": "చ",
-        "kh": "ఖ", "gh": "ఘ",
-        "ph": "ఫ", "bh": "భ",
-        "jh": "ఝ", "sh": "శ", "ss": "ష",
-        "tth":"త",
-        "th": "థ", "dh": "ధ",
-        "ny": "ఞ", "gn": "ఙ",
-        "kh": "ఖ",
-        # retroflex markers (capital D for retroflex is supported)
-        "dd":"ద","Dh": "ఢ", "D": "డ",
-        # single-letter consonants (lowercase dental/default)
-        "k": "క", "g": "గ",
-        "c": "చ", "j": "జ",
-        "t": "ట", "d": "డ",
-        "n": "న", "m": "మ",
-        "p": "ప", "b": "బ",
-        "y": "య", "r": "ర", "l": "ల",
-        "v": "వ", "w": "వ",
-        "s": "స", "h": "హ",
-        "x": "క్ష"
-    }
-
-    VIRAMA = "్"  # halant
-
-    # Make ordered lists of tokens for greedy matching (longest first)
-    CONSONANT_TOKENS = sorted(CONSONANTS.keys(), key=lambda x: -len(x))
-    VOWEL_TOKENS = sorted(VOWELS_INDEPENDENT.keys(), key=lambda x: -len(x))
-
-    # helper: match token at position (case-sensitive)
-    def match_token_at(text, i, tokens):
-        for t in tokens:
-            if text.startswith(t, i):
-                return t
-        return None
-
-    # ---- Transliteration function ----
-    def transliterate_phonetic(input_text: str) -> str:
-        """
-        Greedy rule-based transliteration:
-        - attempt vowel token at current position first (independent vowel)
-        - else attempt consonant tokens (longest first)
-        - if consonant followed by vowel -> base + vowel_sign
-        - if consonant followed by consonant + vowel -> treat cluster/gemination
-        - if consonant not followed by vowel -> append virama (half-letter)
-        """
-        t = input_text  # preserve case (we allow 'D' / 'Dh' for retroflex)
-        out = []
-        i = 0
-        n = len(t)
-        while i < n:
-            ch = t[i]
-
-            # keep spaces/punct unchanged
-            if ch.isspace() or not ch.isalnum():
-                out.append(ch)
-                i += 1
-                continue
-
-            # Try independent vowel token first (e.g., 'eh', 'ee', 'ai', 'au', etc.)
-            v = match_token_at(t, i, VOWEL_TOKENS)
-            if v:
-                out.append(VOWELS_INDEPENDENT[v])
-                i += len(v)
-                continue
-
-            # Try consonant token
-            c = match_token_at(t, i, CONSONANT_TOKENS)
-            if c:
-                next_i = i + len(c)
-                c2 = None
-                if next_i < n:
-                    c2 = match_token_at(t, next_i, CONSONANT_TOKENS)
-
-                # lookahead for vowel after c (or after c2 for clusters)
-                v1 = None
-                if next_i <= n:
-                    v1 = match_token_at(t, next_i, VOWEL_TOKENS)
-
-                # Handle gemination / cluster when we have c + c2 + vowel
-                if c2:
-                    after_c2 = next_i + len(c2)
-                    v2 = match_token_at(t, after_c2, VOWEL_TOKENS)
-                    if v2 and c == c2:
-                        # geminated identical consonant: first + virama + second + vowel_sign
-                        first = CONSONANTS.get(c, c)
-                        second = CONSONANTS.get(c2, c2)
-                        sign = VOWEL_SIGNS.get(v2, "")
-                        out.append(first + VIRAMA + second + sign)
-                        i = after_c2 + len(v2)
-                        continue
-                    elif v2:
-                        # consonant cluster (different consonants) + vowel: first + virama + second + sign
-                        first = CONSONANTS.get(c, c)
-                        second = CONSONANTS.get(c2, c2)
-                        sign = VOWEL_SIGNS.get(v2, "")
-                        out.append(first + VIRAMA + second + sign)
-                        i = after_c2 + len(v2)
-                        continue
-                    # else no vowel after c2 -> fallthrough to normal handling
-
-                # Normal consonant + vowel handling
-                if v1:
-                    base = CONSONANTS.get(c, c)
-                    # base + vowel sign (if sign empty -> implicit 'a')
-                    sign = VOWEL_SIGNS.get(v1, "")
-                    out.append(base + sign)
-                    i = next_i + len(v1)
-                    continue
-                else:
-                    # consonant not followed by vowel -> half-letter (append virama)
-                    base = CONSONANTS.get(c, c)
-                    out.append(base + VIRAMA)
-                    i += len(c)
-                    continue
-
-            # fallback: append character as-is
-            out.append(ch)
-            i += 1
-
-        return "".join(out)
-
-    # ---- UI ----
-
-    st.markdown('<div class="app-wrapper">', unsafe_allow_html=True)
-
-    st.title("📝 Phonetic Telugu Typing — Live")
-    st.markdown("""
+    </style>
+    """,
+    # Info box under the title
+    """
     <style>
     .custom-info {
         background-color: #222;    /* dark background */
@@ -327,7 +176,67 @@ def run():
         color: #f4d35e;            /* highlight bold text */
     }
     </style>
+    """,
+    # "How the typing works" heading and list
+    """
+    <style>
+    /* Style the heading */
+    h3 {
+        color: #4CAF50;  /* green color, change as you like */
+        font-weight: bold;
+        margin-bottom: 10px;
+    }
+    </style>
+    """,
+    """
+    <style>
+    ul {
+        color: white;  /* change this to your preferred color */
+    }
+    </style>
+    """,
+)
+
+GUIDE_PAIRS = [
+    ("a", "అ"), ("aa", "ఆ"), ("i", "ఇ"), ("ii / ee", "ఈ"), ("u", "ఉ"), ("uu / oo", "ఊ / ఓ"),
+    ("e", "ఎ"), ("eh", "ఏ"), ("ai", "ఐ"), ("o", "ఒ"), ("au", "ఔ"),
+    ("ka", "క"), ("kha", "ఖ"), ("ga", "గ"), ("gha", "ఘ"), ("nga", "ఙ"),
+    ("cha / c", "చ"), ("ja", "జ"), ("ta", "త"), ("da", "ద"), ("Da (or D)", "డ (retroflex)"),
+    ("dha", "ధ"), ("Dha", "ఢ"), ("na", "న"), ("n (end) → న్", "న్"),
+    ("pa", "ప"), ("ba", "బ"), ("ma", "మ"), ("ya", "య"), ("ra", "ర"), ("la", "ల"), ("va / w", "వ"),
+    ("sa", "స"), ("sha", "శ"), ("ss / ṣa", "ష"), ("ha", "హ"),
+    ("dd (geminate)", "ద్ద"), ("kk (geminate)", "క్క"), ("tt (geminate)", "త్త")
+]
+
+
+def _guide_grid_html(pairs):
+    grid_html = '<div class="grid">'
+    for k,v in pairs:
+        grid_html += f'<div class="kv"><strong>{html.escape(k)}</strong><div style="font-family: Noto Sans Telugu; font-size:18px; margin-top:6px">{html.escape(v)}</div></div>'
+    grid_html += '</div>'
+    return grid_html
+
 
+GUIDE_HTML = _guide_grid_html(GUIDE_PAIRS)
+
+
+def run():
+    # ---- CSS styling ----
+    # put this after st.set_page_config(...)
+    stylesheets.begin_render("Phonetic Translation")
+    stylesheets.inject(PAGE_STYLES)
+
+
+    # ---- Transliteration ----
+    # Rules and the compiled longest-match tries live in transliterator.py (built once at import);
+    # the live box converts word by word through a shared cache, so a rerun only converts the edited word
+
+    # ---- UI ----
+
+    st.markdown('<div class="app-wrapper">', unsafe_allow_html=True)
+
+    st.title("📝 Phonetic Telugu Typing — Live")
+    st.markdown("""
     <div class="custom-info">
     Type naturally using English letters (e.g. <code>voddu</code>, <code>vellu</code>, <code>bangaaru</code>). Use <code>D</code> or <code>Da</code> for retroflex డ. Single consonant at the <strong>end</strong> is rendered as half-letter (virama).
     </div>
@@ -349,7 +258,7 @@ def run():
     with col2:
         # st.markdown('<div class="card">', unsafe_allow_html=True)
         st.subheader("Telugu Output (live)")
-        telugu = transliterate_phonetic(user)
+        telugu = transliterate_incremental(user)
         # show telugu with nice font
         st.markdown(f'<div class="telugu-out">{html.escape(telugu)}</div>', unsafe_allow_html=True)
 
@@ -382,10 +291,12 @@ def run():
 
     # Corpus viewer
     st.subheader("📚 Session Corpus")
-    df = pd.DataFrame(st.session_state.get("corpus", []))
-    if df.empty:
+    corpus = st.session_state.get("corpus", [])
+    if not corpus:
         st.info("No saved items. Use the 'Save to session corpus' button.")
     else:
+        import pandas as pd  # only needed once something is saved; keeps cold start light
+        df = pd.DataFrame(corpus)
         st.table(df[["id","input","telugu","ts"]])
         csv_bytes = df.to_csv(index=False).encode("utf-8")
         st.download_button("Download corpus CSV", csv_bytes, file_name="telugu_corpus.csv", mime="text/csv")
@@ -396,23 +307,7 @@ def run():
     st.subheader("⌨️ Phonetic Mapping Guide")
     st.markdown("Cheat-sheet — use the roman forms on the left and you will get the Telugu on the right. Vowel notes: `ee` / `ii` → ఈ, `eh` → ఏ.")
 
-    guide_pairs = [
-        ("a", "అ"), ("aa", "ఆ"), ("i", "ఇ"), ("ii / ee", "ఈ"), ("u", "ఉ"), ("uu / oo", "ఊ / ఓ"),
-        ("e", "ఎ"), ("eh", "ఏ"), ("ai", "ఐ"), ("o", "ఒ"), ("au", "ఔ"),
-        ("ka", "క"), ("kha", "ఖ"), ("ga", "గ"), ("gha", "ఘ"), ("nga", "ఙ"),
-        ("cha / c", "చ"), ("ja", "జ"), ("ta", "త"), ("da", "ద"), ("Da (or D)", "డ (retroflex)"),
-        ("dha", "ధ"), ("Dha", "ఢ"), ("na", "న"), ("n (end) → న్", "న్"),
-        ("pa", "ప"), ("ba", "బ"), ("ma", "మ"), ("ya", "య"), ("ra", "ర"), ("la", "ల"), ("va / w", "వ"),
-        ("sa", "స"), ("sha", "శ"), ("ss / ṣa", "ష"), ("ha", "హ"),
-        ("dd (geminate)", "ద్ద"), ("kk (geminate)", "క్క"), ("tt (geminate)", "త్త")
-    ]
-
-    # display grid
-    grid_html = '<div class="grid">'
-    for k,v in guide_pairs:
-        grid_html += f'<div class="kv"><strong>{html.escape(k)}</strong><div style="font-family: Noto Sans Telugu; font-size:18px; margin-top:6px">{html.escape(v)}</div></div>'
-    grid_html += '</div>'
-    st.markdown(grid_html, unsafe_allow_html=True)
+    st.markdown(GUIDE_HTML, unsafe_allow_html=True)
 
     # # ---- Generate downloadable PNG guide ----
     # def make_guide_png(pairs):
@@ -455,27 +350,12 @@ def run():
     #     buf.seek(0)
         
     #     return buf
-    # png_buf = make_guide_png(guide_pairs)
+    # png_buf = make_guide_png(GUIDE_PAIRS)
     # st.download_button("⬇️ Download mapping PNG", data=png_buf, file_name="telugu_mapping.png", mime="image/png")
 
     st.markdown("---")
-    st.markdown("""<style>
-/* Style the heading */
-h3 {
-    color: #4CAF50;  /* green color, change as you like */
-    font-weight: bold;
-    margin-bottom: 10px;
-}
-                </style>
-
-<h3>How the typing works (quick rules)</h3> """,unsafe_allow_html=True)
+    st.markdown("""<h3>How the typing works (quick rules)</h3> """,unsafe_allow_html=True)
     st.markdown("""
-                <style>
-ul {
-    color: white;  /* change this to your preferred color */
-}
-</style>
-
     - Type naturally: consonant + vowel (e.g. `ka` => `క`).  
     - If you just type `k` and it is not followed by a vowel, it yields `క్` (half-letter with virama).  
     - Long vowels: `aa` → ఆ, `ii`/`ee` → ఈ, `eh` → ఏ, `uu` → ఊ.  
@@ -1,8 +1,9 @@
 import streamlit as st
 
-def about_developers_app():
-    """About developers section"""
-    css_styles = """
+from . import stylesheets
+
+# Registered once per process, see sections/stylesheets.py
+PAGE_STYLES = stylesheets.register("about_developers", """
     <style>
 
     .main .block-container {
@@ -98,7 +99,11 @@ def about_developers_app():
         background: rgba(255,255,255,0.08);
     }
     </style>
-    """
+""")
+
+
+def about_developers_app():
+    """About developers section"""
     
     html_content = """
     <div class="about-container">
@@ -171,6 +176,6 @@ def about_developers_app():
     </div>
     """
     
-    st.markdown(css_styles, unsafe_allow_html=True)
+    stylesheets.inject(PAGE_STYLES)
     st.markdown(html_content, unsafe_allow_html=True)
 
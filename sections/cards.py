@@ -0,0 +1,38 @@
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from . import post_store
+
+# Feed cards are fragments (st.fragment): a like or a comment reruns only the
+# card it was made on. A fragment rerun replays the card with the arguments of
+# the last full run, so after a write the card keeps a fresh copy of its post
+# in session state and shows that instead. Each full run of a feed loads its
+# page fresh from the store and drops the copies. A click that arrives in a full
+# run (e.g. from AppTest, which always reruns the whole script) reruns the app.
+
+_STATE_KEY = "_card_posts"
+
+
+def begin_feed(section):
+    """Forget the card copies of a feed; call on every full run, before its cards"""
+    st.session_state.setdefault(_STATE_KEY, {})[section] = {}
+
+
+def current(section, post):
+    """The card's own copy of `post` when it changed since the feed was loaded, else `post`"""
+    return st.session_state.get(_STATE_KEY, {}).get(section, {}).get(post["id"], post)
+
+
+def refresh(section, post_id, with_likes=False):
+    """Re-read one post after a write and rerun only the card showing it"""
+    post = post_store.get_post(section, post_id, with_likes=with_likes)
+    if post is None:
+        st.rerun()  # deleted meanwhile: reload the whole feed
+    st.session_state.setdefault(_STATE_KEY, {}).setdefault(section, {})[str(post_id)] = post
+    rerun()
+
+
+def rerun():
+    """Rerun the card being run, or the whole app when this is a full run"""
+    ctx = get_script_run_ctx()
+    st.rerun(scope="fragment" if ctx is not None and ctx.fragment_ids_this_run else "app")
@@ -1,28 +1,218 @@
 import streamlit as st
 import os
-import json
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image
 import uuid
 import base64
-from io import BytesIO
+
+from . import cards, durable, file_cache, media, meme_render, metrics, pagination, post_store, render_queue, stylesheets, thumbnails
 
 # --- Constants ---
+SECTION = "Desi Meme Creator"
 BASE_DIR = os.path.dirname(__file__)
-TEMPLATE_FOLDER = os.path.join(BASE_DIR, "templates")
+TEMPLATE_FOLDER = os.environ.get("CORPUSEUM_TEMPLATE_DIR", os.path.join(BASE_DIR, "templates"))
 DATA_FILE = os.path.join(BASE_DIR, "meme_data.json")
 FONT_PATH = os.path.join(BASE_DIR,"..","fonts", "Telugu.otf")
 CSS_FILE = os.path.join(BASE_DIR, "styles", "style.css")
 
-# Save proverbs to JSON file
-def save_memes(data):
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+# Memes, their likes and comments live in the SQLite post store; meme_data.json only seeds it once
+post_store.seed_from_json(SECTION, DATA_FILE)
+
+# Stylesheets (registered once per process, see sections/stylesheets.py)
+PAGE_STYLES = stylesheets.register("meme_page", """
+    <style>
+    .stTabs [data-baseweb="tab-list"] {
+        display: flex;
+        justify-content: space-around;
+        border-radius: 12px;
+        overflow: hidden;
+        background-color: #f0f2f6;
+        padding: 5px;
+    }
+    .stTabs [data-baseweb="tab"] {
+        font-size: 18px;
+        font-weight: 600;
+        color: black;
+        border-radius: 16px;
+        padding: 12px 24px;
+        margin: 4px;
+        transition: all 0.3s ease-in-out;
+    }
+    .stTabs [aria-selected="true"] {
+        background-color: #0066cc;
+        color: white;
+    }
+    .meme-card {
+        border: 1px solid #ddd;
+        border-radius: 10px;
+        padding: 15px;
+        margin: 10px 0;
+        background-color: #fafafa;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+    }
+    .meme-stats {
+        display: flex;
+        gap: 15px;
+        margin: 10px 0;
+        font-size: 14px;
+        color: #666;
+    }
+    .comment-section {
+        background-color: #f8f9fa;
+        border-radius: 5px;
+        padding: 10px;
+        margin-top: 10px;
+    }
+    .comment {
+        background-color: white;
+        border-radius: 5px;
+        padding: 8px;
+        margin: 5px 0;
+        border-left: 3px solid #0066cc;
+    }
+    </style>
+""")
+# Instagram-like post card
+CARD_STYLES = stylesheets.register("meme_card", """
+    <style>
+        .instagram-card {
+            background-color: rgba(0, 0, 0, 0.55);
+            backdrop-filter: blur(10px);
+            -webkit-backdrop-filter: blur(10px);
+            border-radius: 12px;
+            box-shadow: 0 8px 32px rgba(0, 0, 0, 0.3);
+            margin: 15px 0;
+            overflow: hidden;
+            border: 1px solid rgba(255, 255, 255, 0.1);
+            max-width: 400px;
+            width: 100%;
+            height:100%;
+            transition: transform 0.3s cubic-bezier(0.25, 0.46, 0.45, 0.94),
+                        box-shadow 0.3s cubic-bezier(0.25, 0.46, 0.45, 0.94);
+            cursor: pointer;
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+        }
+
+        .instagram-card:hover {
+            transform: scale(1.05) translateY(-5px);
+            box-shadow: 0 20px 40px rgba(0, 0, 0, 0.4);
+        }
+
+        .card-header {
+            padding: 12px 16px;
+            display: flex;
+            align-items: center;
+            border-bottom: 1px solid rgba(255, 255, 255, 0.1);
+            background: rgba(0, 0, 0, 0);
+        }
+
+        .avatar {
+            width: 32px;
+            height: 32px;
+            border-radius: 50%;
+            background: linear-gradient(45deg, #f09433 0%, #e6683c 25%, #dc2743 50%, #cc2366 75%, #bc1888 100%);
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            color: white;
+            font-weight: bold;
+            font-size: 14px;
+            margin-right: 10px;
+        }
+
+        .username {
+            font-weight: 600;
+            color: white;
+        }
+
+        .image-container {
+            position: relative;
+            height: 300px;
+            overflow: hidden;
+            background: rgba(0, 0, 0, 0.8);
+        }
+
+        .post-image {
+            width: 100%;
+            height: 100%;
+            object-fit: cover;
+            display: block;
+            transition: transform 0.3s cubic-bezier(0.25, 0.46, 0.45, 0.94);
+        }
+
+        .instagram-card:hover .post-image {
+            transform: scale(1.1);
+        }
+
+        .card-footer {
+            padding: 12px 16px;
+            background: rgba(0, 0, 0, 0);
+        }
+
+        .caption {
+            margin: 0;
+            color: white;
+            line-height: 1.4;
+        }
+
+        .caption-username {
+            font-weight: 600;
+            color: white;
+        }
+
+        .image-container::before {
+            content: '';
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+            bottom: 0;
+            background: linear-gradient(90deg, rgba(255,255,255,0.1) 0%, rgba(255,255,255,0.2) 50%, rgba(255,255,255,0.1) 100%);
+            background-size: 200% 100%;
+            animation: shimmer 1.5s infinite;
+            z-index: 1;
+            opacity: 0;
+            transition: opacity 0.3s;
+        }
+
+        .post-image:not(.loaded) + .image-container::before {
+            opacity: 1;
+        }
+
+        @keyframes shimmer {
+            0% { background-position: -200% 0; }
+            100% { background-position: 200% 0; }
+        }
+    </style>
+""")
+# Reply form buttons
+REPLY_FORM_STYLES = stylesheets.register("meme_reply_form", """
+    <style>
+        div[data-testid="stForm"] button[kind="primary"] {
+            background: linear-gradient(135deg, #28a745 0%, #20c997 100%) !important;
+            color: white !important;
+            border: none !important;
+            border-radius: 8px !important;
+            font-weight: 600 !important;
+        }
+        div[data-testid="stForm"] button[kind="primary"]:hover {
+            background: linear-gradient(135deg, #218838 0%, #1ea085 100%) !important;
+            transform: translateY(-1px) !important;
+        }
+    </style>
+""")
+
+# Load memes (with their likes lists) from the post store
+def load_memes(username=None, limit=None, offset=0):
+    return post_store.list_posts(
+        SECTION, author=username, order="recent", with_likes=True, limit=limit, offset=offset
+    )
 
 # --- Load CSS ---
 def local_css(file_path):
-    if os.path.exists(file_path):
-        with open(file_path) as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+    css = file_cache.read_text(file_path)
+    if css is not None:
+        # re-minified only when the file changes
+        stylesheets.inject(stylesheets.register(f"file:{os.path.basename(file_path)}", css))
     else:
         st.warning(f"⚠️ Style file not found: {file_path}")
 
@@ -30,39 +220,10 @@ def local_css(file_path):
 def image_to_base64(image_path, target_size=(400, 400)):
     """Convert image to base64 string for HTML display with uniform sizing"""
     try:
-        with Image.open(image_path) as img:
-            # Convert to RGB if necessary
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            # Create a square canvas with white background
-            canvas = Image.new('RGB', target_size, 'white')
-            
-            # Calculate scaling to fit image in square while maintaining aspect ratio
-            img_ratio = img.width / img.height
-            target_ratio = target_size[0] / target_size[1]
-            
-            if img_ratio > target_ratio:
-                # Image is wider, scale by width
-                new_width = target_size[0]
-                new_height = int(target_size[0] / img_ratio)
-            else:
-                # Image is taller, scale by height
-                new_height = target_size[1]
-                new_width = int(target_size[1] * img_ratio)
-            
-            # Resize image
-            img_resized = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            # Center the image on the canvas
-            x_offset = (target_size[0] - new_width) // 2
-            y_offset = (target_size[1] - new_height) // 2
-            canvas.paste(img_resized, (x_offset, y_offset))
-            
-            buffer = BytesIO()
-            canvas.save(buffer, format='PNG')
-            img_str = base64.b64encode(buffer.getvalue()).decode()
-            return f"data:image/png;base64,{img_str}"
+        # Thumbnails are cached by file hash + size, so each template is resized only once
+        data = thumbnails.thumbnail_for_file(image_path, target_size)
+        img_str = base64.b64encode(data).decode()
+        return f"data:image/png;base64,{img_str}"
     except Exception as e:
         st.error(f"Error loading image {image_path}: {e}")
         return None
@@ -70,165 +231,38 @@ def image_to_base64(image_path, target_size=(400, 400)):
 def pil_to_base64(pil_image, target_size=(400, 400)):
     """Convert PIL image to base64 string with uniform sizing"""
     try:
-        # Convert to RGB if necessary
-        if pil_image.mode != 'RGB':
-            pil_image = pil_image.convert('RGB')
-        
-        # Create a square canvas with white background
-        canvas = Image.new('RGB', target_size, 'white')
-        
-        # Calculate scaling to fit image in square while maintaining aspect ratio
-        img_ratio = pil_image.width / pil_image.height
-        target_ratio = target_size[0] / target_size[1]
-        
-        if img_ratio > target_ratio:
-            # Image is wider, scale by width
-            new_width = target_size[0]
-            new_height = int(target_size[0] / img_ratio)
-        else:
-            # Image is taller, scale by height
-            new_height = target_size[1]
-            new_width = int(target_size[1] * img_ratio)
-        
-        # Resize image
-        img_resized = pil_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        
-        # Center the image on the canvas
-        x_offset = (target_size[0] - new_width) // 2
-        y_offset = (target_size[1] - new_height) // 2
-        canvas.paste(img_resized, (x_offset, y_offset))
-        
-        buffer = BytesIO()
-        canvas.save(buffer, format='PNG')
-        img_str = base64.b64encode(buffer.getvalue()).decode()
+        data = thumbnails.thumbnail_for_image(pil_image, target_size)
+        img_str = base64.b64encode(data).decode()
         return f"data:image/png;base64,{img_str}"
     except Exception as e:
         st.error(f"Error processing image: {e}")
         return None
 
 # --- Display image with HTML (Instagram-like format) ---
-def display_image_html(image_path_or_base64, username="", caption="", is_base64=False, post_style=False):
-    """Display image using HTML with Instagram-like styling"""
+def display_image_html(image_path_or_base64, username="", caption="", is_base64=False, post_style=False, animate=False):
+    """Display image using HTML with Instagram-like styling
+
+    `is_base64=True` means the first argument is already an <img> src (data URI or media URL).
+    `animate=True` shows animated GIF / WebP files as they are instead of a still thumbnail.
+    """
     if is_base64:
         img_data = image_path_or_base64
     else:
-        img_data = image_to_base64(image_path_or_base64)
+        try:
+            if animate and meme_render.is_animated(image_path_or_base64):
+                img_data = media.image_url(image_path_or_base64)
+            else:
+                # Cached thumbnail, referenced by URL or inlined depending on media.MEDIA_MODE
+                img_data = media.thumbnail_url(image_path_or_base64)
+        except Exception as e:
+            st.error(f"Error loading image {image_path_or_base64}: {e}")
+            img_data = None
     
     if img_data:
         if True:
             # Instagram-like post format
+            stylesheets.inject(CARD_STYLES)
             html_content = f"""
-            <style>
-                .instagram-card {{
-                    background-color: rgba(0, 0, 0, 0.55);
-                    backdrop-filter: blur(10px);
-                    -webkit-backdrop-filter: blur(10px);
-                    border-radius: 12px;
-                    box-shadow: 0 8px 32px rgba(0, 0, 0, 0.3);
-                    margin: 15px 0;
-                    overflow: hidden;
-                    border: 1px solid rgba(255, 255, 255, 0.1);
-                    max-width: 400px;
-                    width: 100%;
-                    height:100%;
-                    transition: transform 0.3s cubic-bezier(0.25, 0.46, 0.45, 0.94),
-                                box-shadow 0.3s cubic-bezier(0.25, 0.46, 0.45, 0.94);
-                    cursor: pointer;
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                }}
-
-                .instagram-card:hover {{
-                    transform: scale(1.05) translateY(-5px);
-                    box-shadow: 0 20px 40px rgba(0, 0, 0, 0.4);
-                }}
-
-                .card-header {{
-                    padding: 12px 16px;
-                    display: flex;
-                    align-items: center;
-                    border-bottom: 1px solid rgba(255, 255, 255, 0.1);
-                    background: rgba(0, 0, 0, 0);
-                }}
-
-                .avatar {{
-                    width: 32px;
-                    height: 32px;
-                    border-radius: 50%;
-                    background: linear-gradient(45deg, #f09433 0%, #e6683c 25%, #dc2743 50%, #cc2366 75%, #bc1888 100%);
-                    display: flex;
-                    align-items: center;
-                    justify-content: center;
-                    color: white;
-                    font-weight: bold;
-                    font-size: 14px;
-                    margin-right: 10px;
-                }}
-
-                .username {{
-                    font-weight: 600;
-                    color: white;
-                }}
-
-                .image-container {{
-                    position: relative;
-                    height: 300px;
-                    overflow: hidden;
-                    background: rgba(0, 0, 0, 0.8);
-                }}
-
-                .post-image {{
-                    width: 100%;
-                    height: 100%;
-                    object-fit: cover;
-                    display: block;
-                    transition: transform 0.3s cubic-bezier(0.25, 0.46, 0.45, 0.94);
-                }}
-
-                .instagram-card:hover .post-image {{
-                    transform: scale(1.1);
-                }}
-
-                .card-footer {{
-                    padding: 12px 16px;
-                    background: rgba(0, 0, 0, 0);
-                }}
-
-                .caption {{
-                    margin: 0;
-                    color: white;
-                    line-height: 1.4;
-                }}
-
-                .caption-username {{
-                    font-weight: 600;
-                    color: white;
-                }}
-
-                .image-container::before {{
-                    content: '';
-                    position: absolute;
-                    top: 0;
-                    left: 0;
-                    right: 0;
-                    bottom: 0;
-                    background: linear-gradient(90deg, rgba(255,255,255,0.1) 0%, rgba(255,255,255,0.2) 50%, rgba(255,255,255,0.1) 100%);
-                    background-size: 200% 100%;
-                    animation: shimmer 1.5s infinite;
-                    z-index: 1;
-                    opacity: 0;
-                    transition: opacity 0.3s;
-                }}
-
-                .post-image:not(.loaded) + .image-container::before {{
-                    opacity: 1;
-                }}
-
-                @keyframes shimmer {{
-                    0% {{ background-position: -200% 0; }}
-                    100% {{ background-position: 200% 0; }}
-                }}
-            </style>
-
             <div class="instagram-card">
                 <div class="card-header">
                     <div class="avatar">
@@ -298,6 +332,239 @@ def show_login_form():
                 del st.session_state.username
                 st.rerun()
 
+# --- Startup warmup ---
+def warmup():
+    """Prime the first feed page and its thumbnails (called by sections.registry at startup)"""
+    post_store.count_posts(SECTION)
+    for meme in load_memes(limit=pagination.PAGE_SIZE):
+        meme_image_path = os.path.join(TEMPLATE_FOLDER, meme["image_path"])
+        if os.path.exists(meme_image_path):
+            media.thumbnail_url(meme_image_path)
+
+
+# --- Save Meme ---
+def save_meme(image, username, text, template_name,cap):
+    meme_id = str(uuid.uuid4())
+    # Animated memes come from meme_render.render_animated() already encoded
+    animated = isinstance(image, dict)
+    filename = f"meme_{meme_id}{image['extension'] if animated else '.png'}"
+    path = os.path.join(TEMPLATE_FOLDER, filename)
+    
+    # Ensure templates directory exists
+    os.makedirs(TEMPLATE_FOLDER, exist_ok=True)
+    
+    if animated:
+        durable.write_bytes(path, image["data"])
+    else:
+        with metrics.timer("image", op="save_meme", format="PNG") as span:
+            image.save(path)
+            span["bytes"] = os.path.getsize(path)
+
+    meme_entry = {
+        "id": meme_id,
+        "username": username,
+        "text": text,
+        "template": template_name,
+        "image_path": filename,
+        "likes": [],
+        "comments": [],
+        "caption": cap,
+    }
+
+    post_store.add_post(SECTION, meme_entry)
+    return meme_id
+
+# --- Generate Meme ---
+def generate_meme(template_path, text):
+    # text = text.encode('utf-8').decode('unicode-escape')
+    font = meme_render.load_font(FONT_PATH, 40)  # loaded once per process
+
+    if meme_render.is_animated(template_path):
+        # Caption on every frame; returns the encoded GIF / WebP plus its size and timings
+        return meme_render.render_animated(template_path, text, font)
+
+    image = Image.open(template_path).convert("RGB")
+    return meme_render.draw_caption(image, text, font)
+
+
+# --- Post pipeline (runs on the render queue, off the script thread) ---
+def publish_meme(stage, template_path, text, username, template_name, cap):
+    """Render, save and post a meme; returns what the page needs to show the preview"""
+    with stage("render"):
+        meme_img = generate_meme(template_path, text)
+    with stage("save"):
+        meme_id = save_meme(meme_img, username, text, template_name, cap)
+    with stage("preview"):
+        if isinstance(meme_img, dict):
+            preview = media.bytes_url(meme_img["data"], meme_img["extension"])
+            details = (
+                f"{meme_img['frames']} frames, {meme_img['bytes'] / 1024:.0f} KB "
+                f"(rendered in {meme_img['render_ms']:.0f} ms, encoded in {meme_img['encode_ms']:.0f} ms)"
+            )
+        else:
+            preview = media.pil_thumbnail_url(meme_img)
+            details = None
+    return {"id": meme_id, "preview": preview, "details": details, "username": username, "caption": cap}
+
+
+def show_post_jobs():
+    """Status of this session's queued / rendering memes and the preview of finished ones"""
+    pending = False
+    for job_id in list(st.session_state.get("meme_jobs", [])):
+        job = render_queue.status(job_id)
+        if job is None:
+            st.session_state.meme_jobs.remove(job_id)
+            continue
+        if job["status"] == "queued":
+            pending = True
+            ahead = render_queue.position(job_id)
+            st.info(f"⏳ Meme queued{f' ({ahead} ahead of it)' if ahead else ''}…")
+        elif job["status"] == "running":
+            pending = True
+            st.info("🎨 Rendering your meme…")
+        elif job["status"] == "failed":
+            st.error(f"Error creating meme: {job['error']}")
+            if st.button("Dismiss", key=f"dismiss_{job_id}"):
+                st.session_state.meme_jobs.remove(job_id)
+                render_queue.forget(job_id)
+                st.rerun()
+        else:
+            result = job["result"]
+            st.success("✅ Meme posted successfully!")
+            st.subheader("Your Created Meme:")
+            if result["details"]:
+                st.caption(result["details"])
+            display_image_html(result["preview"], username=result["username"], caption=result["caption"],
+                               is_base64=True, post_style=True)
+            stages = job["stages"]
+            st.caption(" · ".join(f"{name} {stages[name]:.0f} ms"
+                                  for name in ("wait", "render", "save", "preview", "total") if name in stages))
+            st.info("🎉 Want to create another meme with the same template? Just fill in the form above!")
+            if st.button("Done", key=f"dismiss_{job_id}"):
+                st.session_state.meme_jobs.remove(job_id)
+                render_queue.forget(job_id)
+                st.rerun()
+    return pending
+
+
+def _poll_post_jobs():
+    # fragment body: reruns on its own timer while a job is pending, then hands back to a full rerun
+    # so the feed picks up the new post and the timer stops
+    if not show_post_jobs():
+        st.rerun()
+
+
+# --- Feed card ---
+@st.fragment
+def _meme_card(meme, username):
+    """One meme in the feed; liking or commenting reruns just this card (see sections/cards.py)"""
+    meme = cards.current(SECTION, meme)
+    meme_image_path = os.path.join(TEMPLATE_FOLDER, meme["image_path"])
+
+    # # Display meme info
+    # st.markdown(f"**@{meme['username']}** posted:")
+    # st.markdown(f"*\"{meme['text']}\"*")
+
+    # Display meme image
+    if os.path.exists(meme_image_path):
+        display_image_html(meme_image_path,username=meme['username'], caption=meme['caption'], animate=True)
+    else:
+        st.error(f"Image not found: {meme['image_path']}")
+        return
+
+    # Stats and interactions
+    col1, col2 = st.columns([1, 1])
+
+    with col1:
+        # Like button
+        if st.button(f"👍 {len(meme['likes'])}", key=f"like_{meme['id']}", help="Like this meme"):
+            user_id = username
+            if post_store.set_like(SECTION, meme["id"], user_id):
+                cards.refresh(SECTION, meme["id"], with_likes=True)
+
+
+    # Display existing comments with custom styling using st.expander
+    with st.expander(f"💬 View Comments  ({len(meme['comments'])})"):
+        if meme["comments"]:
+            # Handle both old string comments and new dict comments
+            for comment in meme["comments"]:
+                if isinstance(comment, str):
+                    # Old format - simple string
+                    st.markdown(f"""
+                    <div style='margin-left: 20px;margin-bottom:5px; padding: 8px 12px; border-left: 3px solid #888; border-radius: 5px;'>
+                        <b>Anonymous</b>: {comment}
+                    </div>
+                    """, unsafe_allow_html=True)
+                else:
+                    # New format - dict with user info
+                    user = comment.get("user", "Anonymous")
+                    text = comment.get("text", "")
+                    reply = comment.get("reply", "")
+
+                    # Check if this is author's reply
+                    if user == meme["username"]:
+                        st.markdown(f"""
+                        <div style='margin-left: 40px; padding: 6px 12px; border-left: 2px dashed #aaa; border-radius: 5px; background-color: #f0f8ff;'>
+                            <i>↳ <b>{user} (Author):</b> {text}</i>
+                        </div>
+                        """, unsafe_allow_html=True)
+                    else:
+                        # Main comment block
+                        st.markdown(f"""
+                        <div style='margin-left: 20px;margin-bottom:5px; padding: 8px 12px; border-left: 3px solid #888; border-radius: 5px;'>
+                            <b>{user}</b>: {text}
+                        </div>
+                        """, unsafe_allow_html=True)
+
+                    # Optional reply (if exists)
+                    if reply:
+                        st.markdown(f"""
+                        <div style='margin-left: 40px; padding: 6px 12px; border-left: 2px dashed #aaa; border-radius: 5px;'>
+                            <i>↳ <b>{meme["username"]}:</b> {reply}</i>
+                        </div>
+                        """, unsafe_allow_html=True)
+        else:
+            st.write("No comments yet.")
+
+    # Comment input section (after view comments)
+    col1, col2 = st.columns([5, 2])
+
+    with col1:
+        comment_key = f"comment_{meme['id']}"
+
+        # Reset the input BEFORE rendering the widget
+        if f"clear_comment_{meme['id']}" in st.session_state and st.session_state[f"clear_comment_{meme['id']}"]:
+            st.session_state[comment_key] = ""
+            st.session_state[f"clear_comment_{meme['id']}"] = False  # Reset the flag
+
+        new_text = st.text_input(
+            " ",
+            placeholder="Add a comment...",
+            key=comment_key
+        )
+
+    with col2:
+        with st.form(key=f"comment_form_{meme['id']}", clear_on_submit=True):
+            st.write("")
+            submitted = st.form_submit_button(
+                "Post",
+                use_container_width=True
+            )
+
+            if submitted and new_text.strip():
+                # Store comment as dict with user info
+                comment_data = {
+                    "user": username,
+                    "text": new_text.strip(),
+                    "reply": ""
+                }
+                post_store.add_comment(SECTION, meme["id"], comment_data)
+
+                # Clear the comment input
+                st.session_state[f"clear_comment_{meme['id']}"] = True
+                cards.refresh(SECTION, meme["id"], with_likes=True)
+
+
 # --- App Entry Point ---
 def desi_meme_creator_app():
     # Show login form first
@@ -310,160 +577,11 @@ def desi_meme_creator_app():
         return
     
     # Custom Tab Styling
-    st.markdown(
-        """
-        <style>
-        .stTabs [data-baseweb="tab-list"] {
-            display: flex;
-            justify-content: space-around;
-            border-radius: 12px;
-            overflow: hidden;
-            background-color: #f0f2f6;
-            padding: 5px;
-        }
-        .stTabs [data-baseweb="tab"] {
-            font-size: 18px;
-            font-weight: 600;
-            color: black;
-            border-radius: 16px;
-            padding: 12px 24px;
-            margin: 4px;
-            transition: all 0.3s ease-in-out;
-        }
-        .stTabs [aria-selected="true"] {
-            background-color: #0066cc;
-            color: white;
-        }
-        .meme-card {
-            border: 1px solid #ddd;
-            border-radius: 10px;
-            padding: 15px;
-            margin: 10px 0;
-            background-color: #fafafa;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-        .meme-stats {
-            display: flex;
-            gap: 15px;
-            margin: 10px 0;
-            font-size: 14px;
-            color: #666;
-        }
-        .comment-section {
-            background-color: #f8f9fa;
-            border-radius: 5px;
-            padding: 10px;
-            margin-top: 10px;
-        }
-        .comment {
-            background-color: white;
-            border-radius: 5px;
-            padding: 8px;
-            margin: 5px 0;
-            border-left: 3px solid #0066cc;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
-
-    # --- Save Meme ---
-    def save_meme(image, username, text, template_name,cap):
-        meme_id = str(uuid.uuid4())
-        filename = f"meme_{meme_id}.png"
-        path = os.path.join(TEMPLATE_FOLDER, filename)
-        
-        # Ensure templates directory exists
-        os.makedirs(TEMPLATE_FOLDER, exist_ok=True)
-        
-        image.save(path)
-
-        meme_entry = {
-            "id": meme_id,
-            "username": username,
-            "text": text,
-            "template": template_name,
-            "image_path": filename,
-            "likes": [],
-            "comments": [],
-            "caption": cap,
-        }
-
-        meme_data.append(meme_entry)
-        with open(DATA_FILE, "w",encoding='utf-8') as f:
-            json.dump(meme_data, f, indent=2)
-
-    # --- Generate Meme ---
-    def generate_meme(template_path, text):
-        # text = text.encode('utf-8').decode('unicode-escape')
-        image = Image.open(template_path).convert("RGB")
-        draw = ImageDraw.Draw(image)
-        try:
-            font = ImageFont.truetype(FONT_PATH, 40)
-        except:
-            font = ImageFont.load_default()
-
-        width, height = image.size
-        
-        # Split text into lines if too long
-        words = text.split()
-        lines = []
-        current_line = ""
-        
-        for word in words:
-            test_line = current_line + " " + word if current_line else word
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            if bbox[2] - bbox[0] > width * 0.9:  # 90% of image width
-                if current_line:
-                    lines.append(current_line)
-                    current_line = word
-                else:
-                    lines.append(word)
-            else:
-                current_line = test_line
-        
-        if current_line:
-            lines.append(current_line)
-        
-        # Calculate total text height
-        line_height = font.getbbox("A")[3] - font.getbbox("A")[1] + 5
-        total_text_height = len(lines) * line_height
-        
-        # Position text at bottom
-        start_y = height - total_text_height - 40
-        
-        for i, line in enumerate(lines):
-            bbox = draw.textbbox((0, 0), line, font=font)
-            text_width = bbox[2] - bbox[0]
-            x = (width - text_width) / 2
-            y = start_y + (i * line_height)
-            
-            # Add black outline for better visibility
-            outline_width = 2
-            for dx in range(-outline_width, outline_width + 1):
-                for dy in range(-outline_width, outline_width + 1):
-                    if dx != 0 or dy != 0:
-                        draw.text((x + dx, y + dy), line, fill="black", font=font)
-            
-            draw.text((x, y), line, fill="white", font=font)
-        
-        return image
+    stylesheets.inject(PAGE_STYLES)
 
     # --- App Initialization ---
     local_css(CSS_FILE)
 
-    # Ensure data file exists
-    if not os.path.exists(DATA_FILE):
-        os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
-        with open(DATA_FILE, "w",encoding='utf-8') as f:
-            json.dump([], f)
-
-    try:
-        with open(DATA_FILE, "r",encoding='utf-8') as f:
-            meme_data = json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        meme_data = []
-
     st.markdown("<h2 style='text-align:center;'>🎭 Desi Meme Creator</h2>", unsafe_allow_html=True)
     st.markdown(
         "<div class='subhead'>Welcome to the Desi Meme Creator. Unleash your creativity and spread laughter across the desi universe! 🎭✨</div>", 
@@ -514,7 +632,7 @@ def desi_meme_creator_app():
                 template_files = [
                     f
                     for f in os.listdir(TEMPLATE_FOLDER)
-                    if f.lower().endswith((".png", ".jpg", ".jpeg", ".gif")) and not f.startswith("meme_")
+                    if f.lower().endswith((".png", ".jpg", ".jpeg", ".gif", ".webp")) and not f.startswith("meme_")
                 ]
 
                 if not template_files:
@@ -555,166 +673,74 @@ def desi_meme_creator_app():
 
                 if st.button("🚀 Post Meme"):
                     if text:
-                        try:
-                            meme_img = generate_meme(
-                                st.session_state.selected_template, text
-                            )
-                            save_meme(
-                                meme_img,
-                                username,
-                                text,
-                                st.session_state.get('selected_template_name', 'Unknown'),
-                                cap
-                            )
-                            st.success("✅ Meme posted successfully!")
-                            
-                            # Show preview of created meme
-                            st.subheader("Your Created Meme:")
-                            meme_base64 = pil_to_base64(meme_img)
-                            display_image_html(meme_base64, username=username, caption=cap, is_base64=True, post_style=True)
-                            
-                            # Keep template selected but clear the form
-                            st.info("🎉 Want to create another meme with the same template? Just fill in the form above!")
-                            
-                        except Exception as e:
-                            st.error(f"Error creating meme: {e}")
+                        # Rendering and saving run on the render queue; this run only queues the job
+                        job_id = render_queue.submit(
+                            username,
+                            publish_meme,
+                            st.session_state.selected_template,
+                            text,
+                            username,
+                            st.session_state.get('selected_template_name', 'Unknown'),
+                            cap,
+                        )
+                        if job_id is None:
+                            st.warning("⏳ Lots of memes are being made right now. Please try again in a moment.")
+                        else:
+                            st.session_state.setdefault("meme_jobs", []).append(job_id)
                     else:
                         st.error("⚠️ Please enter meme text.")
 
+                pending = any(
+                    (render_queue.status(job_id) or {}).get("status") in ("queued", "running")
+                    for job_id in st.session_state.get("meme_jobs", [])
+                )
+                if pending:
+                    # the card styles go out with the page, not inside the fragment, so fragment reruns keep them
+                    stylesheets.inject(CARD_STYLES)
+                    st.fragment(_poll_post_jobs, run_every=1.0)()
+                else:
+                    show_post_jobs()
+
     # --- Tab 2: Meme Feed ---
     with tabs[1]:
         st.header("🔥 Meme Feed")
-        if meme_data:
-            # Sort memes by most recent first
-            sorted_memes = sorted(meme_data, key=lambda x: x.get('id', ''), reverse=True)
+        query = pagination.search_box("meme_feed", "🔍 Search memes")
+        total_memes = post_store.count_matches(SECTION, query) if query else post_store.count_posts(SECTION)
+        if total_memes:
+            offset, limit = pagination.page_window("meme_feed", total_memes)
+            if query:
+                # Best matches first, from the full-text index
+                sorted_memes = post_store.search_posts(SECTION, query, with_likes=True, limit=limit, offset=offset)
+            else:
+                # Most recent first; only the visible page is loaded from the store
+                sorted_memes = load_memes(limit=limit, offset=offset)
             
+            # the card styles go out with the page, not inside the card fragments, so card reruns keep them
+            stylesheets.inject(CARD_STYLES)
+            cards.begin_feed(SECTION)
+
             # Display 2 memes per row
             for i in range(0, len(sorted_memes), 2):
                 cols = st.columns(2)
                 
                 for j in range(2):
                     if i + j < len(sorted_memes):
-                        meme = sorted_memes[i + j]
-                        meme_image_path = os.path.join(TEMPLATE_FOLDER, meme["image_path"])
-                        
                         with cols[j]:
-                            # # Display meme info
-                            # st.markdown(f"**@{meme['username']}** posted:")
-                            # st.markdown(f"*\"{meme['text']}\"*")
-                            
-                            # Display meme image
-                            if os.path.exists(meme_image_path):
-                                display_image_html(meme_image_path,username=meme['username'], caption=meme['caption'])
-                            else:
-                                st.error(f"Image not found: {meme['image_path']}")
-                                continue
-                            
-                            # Stats and interactions
-                            col1, col2 = st.columns([1, 1])
-                            
-                            with col1:
-                                # Like button
-                                if st.button(f"👍 {len(meme['likes'])}", key=f"like_{meme['id']}", help="Like this meme"):
-                                    user_id = username
-                                    if user_id not in meme["likes"]:
-                                        meme["likes"].append(user_id)
-                                        with open(DATA_FILE, "w",encoding='utf-8') as f:
-                                            json.dump(meme_data, f, indent=2)
-                                        st.rerun()
-                            
-                            
-                            # Display existing comments with custom styling using st.expander
-                            with st.expander(f"💬 View Comments  ({len(meme['comments'])})"):
-                                if meme["comments"]:
-                                    # Handle both old string comments and new dict comments
-                                    for comment in meme["comments"]:
-                                        if isinstance(comment, str):
-                                            # Old format - simple string
-                                            st.markdown(f"""
-                                            <div style='margin-left: 20px;margin-bottom:5px; padding: 8px 12px; border-left: 3px solid #888; border-radius: 5px;'>
-                                                <b>Anonymous</b>: {comment}
-                                            </div>
-                                            """, unsafe_allow_html=True)
-                                        else:
-                                            # New format - dict with user info
-                                            user = comment.get("user", "Anonymous")
-                                            text = comment.get("text", "")
-                                            reply = comment.get("reply", "")
-                                            
-                                            # Check if this is author's reply
-                                            if user == meme["username"]:
-                                                st.markdown(f"""
-                                                <div style='margin-left: 40px; padding: 6px 12px; border-left: 2px dashed #aaa; border-radius: 5px; background-color: #f0f8ff;'>
-                                                    <i>↳ <b>{user} (Author):</b> {text}</i>
-                                                </div>
-                                                """, unsafe_allow_html=True)
-                                            else:
-                                                # Main comment block
-                                                st.markdown(f"""
-                                                <div style='margin-left: 20px;margin-bottom:5px; padding: 8px 12px; border-left: 3px solid #888; border-radius: 5px;'>
-                                                    <b>{user}</b>: {text}
-                                                </div>
-                                                """, unsafe_allow_html=True)
-                                            
-                                            # Optional reply (if exists)
-                                            if reply:
-                                                st.markdown(f"""
-                                                <div style='margin-left: 40px; padding: 6px 12px; border-left: 2px dashed #aaa; border-radius: 5px;'>
-                                                    <i>↳ <b>{meme["username"]}:</b> {reply}</i>
-                                                </div>
-                                                """, unsafe_allow_html=True)
-                                else:
-                                    st.write("No comments yet.")
-                            
-                            # Comment input section (after view comments)
-                            col1, col2 = st.columns([5, 2])
-                            
-                            with col1:
-                                comment_key = f"comment_{meme['id']}"
-                                
-                                # Reset the input BEFORE rendering the widget
-                                if f"clear_comment_{meme['id']}" in st.session_state and st.session_state[f"clear_comment_{meme['id']}"]:
-                                    st.session_state[comment_key] = ""
-                                    st.session_state[f"clear_comment_{meme['id']}"] = False  # Reset the flag
-                                
-                                new_text = st.text_input(
-                                    " ",
-                                    placeholder="Add a comment...",
-                                    key=comment_key
-                                )
-                            
-                            with col2:
-                                with st.form(key=f"comment_form_{meme['id']}", clear_on_submit=True):
-                                    st.write("")
-                                    submitted = st.form_submit_button(
-                                        "Post",
-                                        use_container_width=True
-                                    )
-                                    
-                                    if submitted and new_text.strip():
-                                        # Store comment as dict with user info
-                                        comment_data = {
-                                            "user": username,
-                                            "text": new_text.strip(),
-                                            "reply": ""
-                                        }
-                                        meme["comments"].append(comment_data)
-                                        with open(DATA_FILE, "w",encoding='utf-8') as f:
-                                            json.dump(meme_data, f, indent=2)
-                                        
-                                        # Clear the comment input
-                                        st.session_state[f"clear_comment_{meme['id']}"] = True
-                                        st.rerun()
+                            _meme_card(sorted_memes[i + j], username)
                 
                 # Add spacing between rows
                 st.markdown("<br>", unsafe_allow_html=True)
+
+            pagination.page_controls("meme_feed", total_memes)
+        elif query:
+            st.info(f"No memes match “{query}”.")
         else:
             st.info("No memes yet. Be the first to post!")
 
     # --- Tab 3: My Posts ---
     with tabs[2]:
             st.header("👤 My Posted Memes")
-            my_memes = [m for m in meme_data if m["username"] == username]
+            my_memes = load_memes(username=username)
             
             if my_memes:
                 st.success(f"Found {len(my_memes)} meme(s) by @{username}")
@@ -737,7 +763,7 @@ def desi_meme_creator_app():
                                 meme_image_path = os.path.join(TEMPLATE_FOLDER, meme["image_path"])
                                 
                                 if os.path.exists(meme_image_path):
-                                    display_image_html(meme_image_path, username=meme["username"], caption=meme["text"], post_style=True)
+                                    display_image_html(meme_image_path, username=meme["username"], caption=meme["text"], post_style=True, animate=True)
                                     
                                     # Stats
                                     stat_col1, stat_col2 = st.columns(2)
@@ -792,21 +818,7 @@ def desi_meme_creator_app():
                                                                     cancel_reply = st.form_submit_button("Cancel")
 
                                                                 # Add button styling
-                                                                st.markdown("""
-                                                                    <style>
-                                                                        div[data-testid="stForm"] button[kind="primary"] {
-                                                                            background: linear-gradient(135deg, #28a745 0%, #20c997 100%) !important;
-                                                                            color: white !important;
-                                                                            border: none !important;
-                                                                            border-radius: 8px !important;
-                                                                            font-weight: 600 !important;
-                                                                        }
-                                                                        div[data-testid="stForm"] button[kind="primary"]:hover {
-                                                                            background: linear-gradient(135deg, #218838 0%, #1ea085 100%) !important;
-                                                                            transform: translateY(-1px) !important;
-                                                                        }
-                                                                    </style>
-                                                                """, unsafe_allow_html=True)
+                                                                stylesheets.inject(REPLY_FORM_STYLES)
 
                                                                 if submit_reply and reply_text.strip():
                                                                     # Get current username
@@ -817,14 +829,8 @@ def desi_meme_creator_app():
                                                                         "text": reply_text.strip()
                                                                     }
 
-                                                                    # Find the original meme in meme_data and update it
-                                                                    for original_meme in meme_data:
-                                                                        if original_meme['id'] == meme['id']:
-                                                                            original_meme["comments"].insert(idx + 1, new_reply)
-                                                                            break
-                                                                    
-                                                                    # Save the data
-                                                                    save_memes(meme_data)
+                                                                    # Insert the reply just after the comment it answers
+                                                                    post_store.add_comment(SECTION, meme['id'], new_reply, index=idx + 1)
                                                                     
                                                                     # Clear the reply state
                                                                     st.session_state.reply_to[meme['id']] = -1
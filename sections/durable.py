@@ -0,0 +1,308 @@
+import os
+import sys
+import json
+import time
+import fcntl
+import tempfile
+import threading
+import multiprocessing
+from contextlib import contextmanager
+
+try:
+    from . import metrics
+except ImportError:  # loaded as a top-level module by python sections/merge_posts.py
+    import metrics
+
+# Crash-safe whole-file writes: the new content goes to a temp file in the same
+# directory, is fsynced, and then atomically replaces the target with os.replace.
+# Readers see either the old file or the new one, never a truncated one.
+#
+# With group_commit=True, concurrent writers of the same file share one
+# write + fsync: while a write is in flight, newer snapshots queue up and only
+# the latest one is written next. Every caller returns once a snapshot at least
+# as new as its own is on disk (last writer wins, as with plain rewrites).
+#
+# update_json() is the read-modify-write path for files shared by several
+# Streamlit processes: an advisory fcntl lock per file plus a version stamp
+# (kept in the hidden lock file) for compare-and-swap retries.
+
+MAX_CAS_RETRIES = 5
+
+_groups_lock = threading.Lock()
+_groups = {}
+_counters = {"requests": 0, "commits": 0}
+
+
+def _fsync_dir(directory):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _replace(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    # hidden name so directory listings of post files skip it
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    # make the rename itself durable
+    _fsync_dir(directory)
+    with _groups_lock:
+        _counters["commits"] += 1
+
+
+def _group_for(path):
+    path = os.path.abspath(path)
+    with _groups_lock:
+        group = _groups.get(path)
+        if group is None:
+            group = {
+                "cond": threading.Condition(),
+                "version": 0,  # last version handed out
+                "durable": 0,  # last version known to be on disk
+                "pending": None,  # (version, data) waiting for the next commit
+                "writing": False,
+                "error": None,
+            }
+            _groups[path] = group
+        return group
+
+
+def _group_write(path, data):
+    group = _group_for(path)
+    cond = group["cond"]
+    with cond:
+        group["version"] += 1
+        version = group["version"]
+        group["pending"] = (version, data)
+        # wait while another thread is writing; it may pick up our snapshot
+        while group["writing"] and group["durable"] < version:
+            cond.wait()
+        if group["durable"] >= version:
+            if group["error"] is not None and group["error"][0] >= version:
+                raise group["error"][1]
+            return
+        group["writing"] = True
+
+    # we are the leader: keep writing the newest snapshot until none is pending
+    while True:
+        with cond:
+            pending = group["pending"]
+            group["pending"] = None
+            if pending is None:
+                group["writing"] = False
+                cond.notify_all()
+                break
+        written_version, written_data = pending
+        error = None
+        try:
+            _replace(path, written_data)
+        except OSError as e:
+            error = e
+        with cond:
+            group["durable"] = max(group["durable"], written_version)
+            group["error"] = (written_version, error) if error is not None else None
+            cond.notify_all()
+        if error is not None and written_version >= version:
+            with cond:
+                group["writing"] = False
+                cond.notify_all()
+            raise error
+
+
+# --- Public API ---
+def write_bytes(path, data, group_commit=False):
+    """Atomically replace `path` with `data`"""
+    with _groups_lock:
+        _counters["requests"] += 1
+    with metrics.timer("storage", op="write_file") as span:
+        span["bytes"] = len(data)
+        if group_commit:
+            _group_write(path, data)
+        else:
+            _replace(path, data)
+
+
+def write_text(path, text, encoding="utf-8", group_commit=False):
+    """Atomically replace `path` with `text`"""
+    write_bytes(path, text.encode(encoding), group_commit=group_commit)
+
+
+def write_json(path, obj, group_commit=False, **dump_kwargs):
+    """Atomically replace `path` with `obj` serialized as JSON (json.dumps keyword arguments pass through)"""
+    write_text(path, json.dumps(obj, **dump_kwargs), group_commit=group_commit)
+
+
+def stats():
+    """Write requests vs. actual commits (fewer commits = requests coalesced)"""
+    with _groups_lock:
+        return dict(_counters)
+
+
+# --- Cross-process read-modify-write ---
+def _lock_path(path):
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, f".{name}.lock")
+
+
+def _read_version(f):
+    f.seek(0)
+    raw = f.read().strip()
+    return int(raw) if raw else 0
+
+
+def version(path):
+    """Version stamp of `path`, bumped by every update_json (0 if never updated)"""
+    try:
+        with open(_lock_path(path), "rb") as f:
+            return _read_version(f)
+    except (OSError, ValueError):
+        return 0
+
+
+@contextmanager
+def locked(path):
+    """Hold the advisory exclusive lock of `path` (shared by all processes); yields the lock file"""
+    lock_path = _lock_path(path)
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    with open(lock_path, "a+b") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield f
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _load_fresh(path, default):
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return json.loads(json.dumps(default))  # private copy of the default
+    with f, metrics.timer("storage", op="read_file") as span:
+        data = f.read()
+        span["bytes"] = len(data)
+    return json.loads(data.decode("utf-8"))
+
+
+def _commit(f, path, obj, dump_kwargs):
+    write_json(path, obj, **dump_kwargs)
+    # data first, then the stamp: a reader that sees the new stamp also sees the new data
+    new_version = _read_version(f) + 1
+    f.seek(0)
+    f.truncate()
+    f.write(str(new_version).encode())
+    f.flush()
+
+
+@metrics.timed("storage")
+def update_json(path, mutate, default=None, **dump_kwargs):
+    """Apply `mutate(obj)` to the JSON in `path` without losing concurrent updates.
+
+    Optimistic: read + mutate without the lock, then commit under the lock only if
+    the version stamp is unchanged; otherwise retry with fresh data. After
+    MAX_CAS_RETRIES conflicts the whole cycle runs under the lock.
+    `mutate` edits the object in place; returns the object that was written.
+    """
+    for _ in range(MAX_CAS_RETRIES):
+        seen = version(path)
+        obj = _load_fresh(path, default)
+        mutate(obj)
+        with locked(path) as f:
+            if _read_version(f) != seen:
+                continue
+            _commit(f, path, obj, dump_kwargs)
+            return obj
+
+    with locked(path) as f:
+        obj = _load_fresh(path, default)
+        mutate(obj)
+        _commit(f, path, obj, dump_kwargs)
+        return obj
+
+
+# --- Benchmark ---
+def benchmark(sessions=(1, 4, 16), seconds=2.0, posts=200):
+    """Writes/sec of a whole-feed JSON file rewritten by concurrent sessions"""
+    feed = [
+        {"id": str(i), "caption": f"post {i}", "description": "x" * 200, "upvotes": i, "comments": []}
+        for i in range(posts)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        for group_commit in (False, True):
+            for count in sessions:
+                path = os.path.join(tmp, f"feed_{count}_{group_commit}.json")
+                done = [0] * count
+                deadline = time.perf_counter() + seconds
+
+                def session(n):
+                    while time.perf_counter() < deadline:
+                        write_json(path, feed, group_commit=group_commit, ensure_ascii=False)
+                        done[n] += 1
+
+                before = stats()["commits"]
+                threads = [threading.Thread(target=session, args=(n,)) for n in range(count)]
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+                commits = stats()["commits"] - before
+                with open(path, "r", encoding="utf-8") as f:
+                    assert json.load(f) == feed
+                label = "group commit" if group_commit else "plain       "
+                print(f"{label} {count:>3} sessions: {sum(done) / seconds:8,.0f} writes/sec, "
+                      f"{commits / seconds:8,.0f} fsyncs/sec")
+
+
+def _stress_worker(path, likes, posts):
+    def like(n):
+        def mutate(feed):
+            feed[n % posts]["upvotes"] += 1
+        return mutate
+
+    for n in range(likes):
+        update_json(path, like(n))
+
+
+def stress(processes=8, likes=500, posts=4):
+    """Fire processes x likes concurrent read-modify-write likes at one feed file and check the totals"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "feed.json")
+        write_json(path, [{"id": str(i), "upvotes": 0} for i in range(posts)])
+        start = time.perf_counter()
+        workers = [
+            multiprocessing.Process(target=_stress_worker, args=(path, likes, posts)) for _ in range(processes)
+        ]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        elapsed = time.perf_counter() - start
+        with open(path, "r", encoding="utf-8") as f:
+            total = sum(post["upvotes"] for post in json.load(f))
+        expected = processes * likes
+        print(f"{processes} processes x {likes} likes: {total:,}/{expected:,} counted, "
+              f"{expected / elapsed:,.0f} likes/sec, version {version(path)}")
+        assert total == expected, "lost updates"
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark()
+    if "--stress" in sys.argv:
+        stress()
@@ -0,0 +1,104 @@
+import os
+import json
+import threading
+
+from . import metrics
+
+# Process-wide cache of parsed files, shared by every Streamlit session.
+# An entry is reused until the stat signature (inode, size, mtime) of the
+# files it was built from changes. Cached objects are shared: treat them as read-only.
+
+_lock = threading.Lock()
+_entries = {}
+_counters = {"hits": 0, "misses": 0}
+_path_counters = {}
+
+
+def file_signature(*paths):
+    """(inode, size, mtime_ns) for each path, None for missing files"""
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            signature.append(None)
+        else:
+            signature.append((st.st_ino, st.st_size, st.st_mtime_ns))
+    return tuple(signature)
+
+
+def load(path, parse, key=None, watch=None, token=None):
+    """Return `parse(path)`, re-running it only when the watched files change.
+
+    key:   extra cache key when one file backs several views (e.g. a query)
+    watch: files whose signature decides freshness (defaults to `path`)
+    token: extra value that must match, e.g. an in-process write counter
+    """
+    path = os.path.abspath(path)
+    watch = tuple(os.path.abspath(p) for p in (watch or (path,)))
+    cache_key = (path, key)
+    signature = (file_signature(*watch), token)
+
+    with _lock:
+        entry = _entries.get(cache_key)
+        counters = _path_counters.setdefault(path, {"hits": 0, "misses": 0})
+        if entry is not None and entry[0] == signature:
+            _counters["hits"] += 1
+            counters["hits"] += 1
+            return entry[1]
+        _counters["misses"] += 1
+        counters["misses"] += 1
+
+    value = parse(path)
+
+    with _lock:
+        _entries[cache_key] = (signature, value)
+    return value
+
+
+def _read_text(path):
+    with metrics.timer("storage", op="read_file") as span:
+        with open(path, "rb") as f:
+            data = f.read()
+        span["bytes"] = len(data)
+    return data.decode("utf-8")
+
+
+def _read_json(path):
+    return json.loads(_read_text(path))
+
+
+def load_json(path, default=None):
+    """Cached json.load; returns `default` when the file is missing"""
+    if not os.path.exists(path):
+        return default
+    return load(path, _read_json)
+
+
+def read_text(path, default=None):
+    """Cached text read; returns `default` when the file is missing"""
+    if not os.path.exists(path):
+        return default
+    return load(path, _read_text)
+
+
+def invalidate(path=None):
+    """Drop the cached entries for one file, or everything"""
+    with _lock:
+        if path is None:
+            _entries.clear()
+            return
+        path = os.path.abspath(path)
+        for cache_key in [k for k in _entries if k[0] == path]:
+            del _entries[cache_key]
+
+
+def stats():
+    """Hit/miss counters, overall and per file"""
+    with _lock:
+        return {
+            "hits": _counters["hits"],
+            "misses": _counters["misses"],
+            "entries": len(_entries),
+            "files": {path: dict(c) for path, c in _path_counters.items()},
+        }
@@ -1,9 +1,10 @@
 # landmarks_and_historical_places.py
 import streamlit as st
 import os
-import json
 import uuid
 
+from . import durable, file_cache, ranking
+
 DATA_DIR = "posts"
 SECTION = "Landmarks and Historical Places"
 DEFAULT_IMAGE = "landmark.jpg"
@@ -11,21 +12,41 @@ DEFAULT_IMAGE = "landmark.jpg"
 os.makedirs(os.path.join(DATA_DIR, SECTION), exist_ok=True)
 
 
-def load_posts(section):
+def load_posts(section, limit=None, offset=0):
+    """Posts with the most upvotes first, read from the section's ranking index"""
     path = os.path.join(DATA_DIR, section)
-    posts = []
-    for post_file in os.listdir(path):
-        with open(os.path.join(path, post_file), "r") as f:
-            posts.append(json.load(f))
-    posts.sort(key=lambda x: x["upvotes"], reverse=True)
-    return posts
+    # the directory signature changes when post files are added or removed
+    signature = file_cache.file_signature(path)
+    if not ranking.is_current(path, signature):
+        posts = []
+        for post_file in os.listdir(path):
+            if post_file.startswith("."):
+                continue  # in-progress durable.write_json temp file
+            posts.append(file_cache.load_json(os.path.join(path, post_file)))
+        ranking.build(path, posts, signature)
+    return ranking.top(path, limit=limit, offset=offset)
 
 
 def save_post(section, post):
     path = os.path.join(DATA_DIR, section)
     post_id = post.get("id", str(uuid.uuid4())) + ".json"
-    with open(os.path.join(path, post_id), "w") as f:
-        json.dump(post, f)
+    previous = file_cache.file_signature(path)
+    durable.write_json(os.path.join(path, post_id), post)
+    # re-rank just this post instead of re-sorting the section on the next render
+    ranking.update(path, post, signature=file_cache.file_signature(path), previous=previous)
+
+
+def update_post(section, post_id, change):
+    """Apply `change(post)` to the stored post without losing other processes' votes / comments"""
+    path = os.path.join(DATA_DIR, section)
+    previous = file_cache.file_signature(path)
+    post = durable.update_json(os.path.join(path, post_id + ".json"), change)
+    ranking.update(path, post, signature=file_cache.file_signature(path), previous=previous)
+    return post
+
+
+def vote(post, delta):
+    update_post(post["section"], post["id"], lambda p: p.update(upvotes=p["upvotes"] + delta))
 
 
 def display_post(post):
@@ -41,14 +62,12 @@ def display_post(post):
     cols = st.columns([1, 5, 1])
     with cols[0]:
         if st.button("👍", key=f"up_{post['id']}"):
-            post["upvotes"] += 1
-            save_post(post["section"], post)
+            vote(post, 1)
     with cols[1]:
         st.write(f"**{post['upvotes']} Likes**")
     with cols[2]:
         if st.button("👎", key=f"down_{post['id']}"):
-            post["upvotes"] -= 1
-            save_post(post["section"], post)
+            vote(post, -1)
 
     with st.expander("View Comments"):
         for comment in post["comments"][:5]:
@@ -73,8 +92,8 @@ def display_post(post):
         )
     with col2:
         if st.button("Post", key=submit_key):
-            post["comments"].append({"user": post["author"], "text": text, "reply": ""})
-            save_post(post["section"], post)
+            comment = {"user": post["author"], "text": text, "reply": ""}
+            update_post(post["section"], post["id"], lambda p: p["comments"].append(comment))
             st.session_state[clear_flag_key] = True
             st.rerun()
 
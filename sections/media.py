@@ -0,0 +1,174 @@
+import os
+import re
+import base64
+import shutil
+import hashlib
+import tempfile
+import threading
+import mimetypes
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from . import file_cache, thumbnails
+
+# How images reach the browser:
+#   "static" - files published under ./static/media and served by Streamlit
+#              (default; .streamlit/config.toml turns on server.enableStaticServing)
+#   "inline" - base64 data URIs inside the HTML (needs no static serving)
+#   "server" - files published under ./static/media and served by a small
+#              endpoint on MEDIA_HOST that sends long-lived immutable
+#              Cache-Control headers; put it behind a proxy and set
+#              CORPUSEUM_MEDIA_URL to the public URL browsers reach it at
+MEDIA_MODE = os.environ.get("CORPUSEUM_MEDIA_MODE", "static")
+
+BASE_DIR = os.path.dirname(__file__)
+MEDIA_DIR = os.environ.get("CORPUSEUM_MEDIA_DIR", os.path.join(BASE_DIR, "..", "static", "media"))
+MEDIA_HOST = os.environ.get("CORPUSEUM_MEDIA_HOST", "127.0.0.1")
+MEDIA_PORT = int(os.environ.get("CORPUSEUM_MEDIA_PORT", "8765"))
+MEDIA_MAX_AGE = 365 * 24 * 3600
+# Public base URL for published files (required in server mode)
+MEDIA_URL = os.environ.get("CORPUSEUM_MEDIA_URL") or "/app/static/media"
+if MEDIA_MODE == "server" and not os.environ.get("CORPUSEUM_MEDIA_URL"):
+    raise RuntimeError(
+        "CORPUSEUM_MEDIA_MODE=server needs CORPUSEUM_MEDIA_URL, the public URL of the media endpoint"
+    )
+
+_HASHED_NAME = re.compile(r"/[0-9a-f]{32}\.[a-z0-9]+")
+
+_server_lock = threading.Lock()
+_server_started = False
+
+
+# --- Local media endpoint ---
+class _ImmutableMediaHandler(SimpleHTTPRequestHandler):
+    """Serves content-hashed files, so every response can be cached forever.
+
+    Only existing files with a hashed name are served; anything else, directory
+    listings included, is a plain uncached 404.
+    """
+
+    _immutable = False
+
+    def send_head(self):
+        self._immutable = False
+        path = self.path.split("?", 1)[0].split("#", 1)[0]
+        if not _HASHED_NAME.fullmatch(path) or not os.path.isfile(self.translate_path(path)):
+            self.send_error(404)
+            return None
+        self._immutable = True
+        return super().send_head()
+
+    def list_directory(self, path):
+        self.send_error(404)
+        return None
+
+    def send_error(self, code, message=None, explain=None):
+        self._immutable = False
+        super().send_error(code, message, explain)
+
+    def end_headers(self):
+        if self._immutable:
+            self.send_header("Cache-Control", f"public, max-age={MEDIA_MAX_AGE}, immutable")
+            self.send_header("Access-Control-Allow-Origin", "*")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_media_server():
+    """Start the media endpoint once per process (no-op if another worker already owns the port)"""
+    global _server_started
+    with _server_lock:
+        if _server_started:
+            return
+        _server_started = True
+        os.makedirs(MEDIA_DIR, exist_ok=True)
+        handler = partial(_ImmutableMediaHandler, directory=os.path.abspath(MEDIA_DIR))
+        try:
+            server = ThreadingHTTPServer((MEDIA_HOST, MEDIA_PORT), handler)
+        except OSError:
+            return
+        threading.Thread(target=server.serve_forever, name="media-server", daemon=True).start()
+
+
+# --- Publishing ---
+def _data_uri(data, mime):
+    return f"data:{mime};base64,{base64.b64encode(data).decode()}"
+
+
+def _publish(name, write):
+    """Make sure MEDIA_DIR/name exists (written via `write(tmp_path)`) and return its URL"""
+    target = os.path.join(MEDIA_DIR, name)
+    if not os.path.exists(target):
+        os.makedirs(MEDIA_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=MEDIA_DIR, suffix=".tmp")
+        os.close(fd)
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, target)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    if MEDIA_MODE == "server":
+        start_media_server()
+    return f"{MEDIA_URL}/{name}"
+
+
+def publish_bytes(data, extension):
+    """Publish in-memory bytes under a content-hashed name and return the URL"""
+    name = hashlib.sha256(data).hexdigest()[:32] + extension
+
+    def write(tmp_path):
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+
+    return _publish(name, write)
+
+
+def _original_url(path):
+    extension = os.path.splitext(path)[1].lower()
+    if MEDIA_MODE == "inline":
+        with open(path, "rb") as f:
+            data = f.read()
+        return _data_uri(data, mimetypes.guess_type(path)[0] or "application/octet-stream")
+    name = thumbnails.file_hash(path)[:32] + extension
+    return _publish(name, lambda tmp_path: shutil.copyfile(path, tmp_path))
+
+
+# --- Public API ---
+def image_url(path):
+    """URL (or data URI in inline mode) for an original image file.
+
+    Memoized per file, so the file is only read again when it changes on disk.
+    """
+    return file_cache.load(path, _original_url, key=("image_url", MEDIA_MODE))
+
+
+def _thumbnail_url(path, target_size):
+    data = thumbnails.thumbnail_for_file(path, target_size)
+    if MEDIA_MODE == "inline":
+        return _data_uri(data, "image/png")
+    return publish_bytes(data, ".png")
+
+
+def thumbnail_url(path, target_size=(400, 400)):
+    """URL (or data URI) for the cached square thumbnail of an image file"""
+    return file_cache.load(
+        path, lambda p: _thumbnail_url(p, target_size), key=("thumbnail_url", MEDIA_MODE, target_size)
+    )
+
+
+def bytes_url(data, extension):
+    """URL (or data URI) for an in-memory file, e.g. a freshly rendered animated meme"""
+    if MEDIA_MODE == "inline":
+        return _data_uri(data, mimetypes.guess_type(f"file{extension}")[0] or "application/octet-stream")
+    return publish_bytes(data, extension)
+
+
+def pil_thumbnail_url(pil_image, target_size=(400, 400)):
+    """URL (or data URI) for the thumbnail of an in-memory PIL image"""
+    data = thumbnails.thumbnail_for_image(pil_image, target_size)
+    if MEDIA_MODE == "inline":
+        return _data_uri(data, "image/png")
+    return publish_bytes(data, ".png")
@@ -0,0 +1,302 @@
+import os
+import sys
+import time
+import threading
+from io import BytesIO
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageDraw, ImageFont, ImageSequence
+
+from . import file_cache, metrics
+
+# Caption rendering for meme templates. Static templates get the caption drawn
+# in place. Animated GIF / WebP templates get it drawn once onto a transparent
+# overlay, which a worker pool pastes onto every frame while the next frames are
+# still being decoded; frame durations and the loop count are carried over.
+# Fonts are loaded once per process and wrapped layouts are memoized per
+# (text, font, width), so re-rendering a caption only costs the drawing.
+
+BASE_DIR = os.path.dirname(__file__)
+TEMPLATE_FOLDER = os.environ.get("CORPUSEUM_TEMPLATE_DIR", os.path.join(BASE_DIR, "templates"))
+FONT_PATH = os.path.join(BASE_DIR, "..", "fonts", "Telugu.otf")
+
+OUTLINE_WIDTH = 2
+ANIMATED_EXTENSIONS = {"GIF": ".gif", "WEBP": ".webp"}
+DEFAULT_FRAME_DURATION = 100  # ms, for frames that don't say
+LAYOUT_CACHE_SIZE = 512
+FRAME_WORKERS = int(os.environ.get("CORPUSEUM_MEME_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_pool_lock = threading.Lock()
+_pool = None
+
+_fonts_lock = threading.Lock()
+_fonts = {}  # (path, size) -> font
+
+_layouts_lock = threading.Lock()
+_layouts = OrderedDict()  # (text, font, width) -> layout, least recently used first
+_layout_counters = {"hits": 0, "misses": 0}
+
+
+# --- Fonts ---
+def load_font(path, size):
+    """`path` at `size`, loaded once per process; Pillow's default font if it can't be loaded"""
+    key = (os.path.abspath(path), size)
+    with _fonts_lock:
+        font = _fonts.get(key)
+    if font is None:
+        try:
+            font = ImageFont.truetype(path, size)
+        except (OSError, ImportError):
+            font = ImageFont.load_default()
+        with _fonts_lock:
+            font = _fonts.setdefault(key, font)
+    return font
+
+
+# --- Caption layout ---
+def _wrap(draw, text, font, width):
+    # greedy wrap; keeps the measured width of every line so it isn't measured again
+    lines = []
+    current_line, current_width = "", 0
+
+    for word in text.split():
+        test_line = current_line + " " + word if current_line else word
+        bbox = draw.textbbox((0, 0), test_line, font=font)
+        test_width = bbox[2] - bbox[0]
+        if test_width > width * 0.9:  # 90% of image width
+            if current_line:
+                lines.append((current_line, current_width))
+                bbox = draw.textbbox((0, 0), word, font=font)
+                current_line, current_width = word, bbox[2] - bbox[0]
+            else:
+                lines.append((word, test_width))
+        else:
+            current_line, current_width = test_line, test_width
+
+    if current_line:
+        lines.append((current_line, current_width))
+    return lines
+
+
+def wrap_caption(draw, text, font, width):
+    """Split `text` into lines that fit in 90% of `width`"""
+    return [line for line, _ in _wrap(draw, text, font, width)]
+
+
+def _layout(text, font, width):
+    draw = ImageDraw.Draw(Image.new("L", (1, 1)))
+    top, bottom = font.getbbox("A")[1::2]
+    return tuple(_wrap(draw, text, font, width)), bottom - top + 5
+
+
+def layout_caption(text, font, width):
+    """((line, line_width), ...), line_height for `text` wrapped to `width`; memoized per (text, font, width)"""
+    key = (text, font, width)
+    with _layouts_lock:
+        layout = _layouts.get(key)
+        if layout is not None:
+            _layouts.move_to_end(key)
+            _layout_counters["hits"] += 1
+            return layout
+        _layout_counters["misses"] += 1
+    layout = _layout(text, font, width)
+    with _layouts_lock:
+        _layouts[key] = layout
+        while len(_layouts) > LAYOUT_CACHE_SIZE:
+            _layouts.popitem(last=False)
+    return layout
+
+
+def layout_stats():
+    """Layout cache hits / misses and the number of loaded fonts"""
+    with _layouts_lock:
+        stats = dict(_layout_counters, entries=len(_layouts))
+    with _fonts_lock:
+        stats["fonts"] = len(_fonts)
+    return stats
+
+
+def draw_caption(image, text, font):
+    """Draw the wrapped caption, white with a black outline, at the bottom of `image`"""
+    draw = ImageDraw.Draw(image)
+    width, height = image.size
+    lines, line_height = layout_caption(text, font, width)
+
+    # Position text at bottom
+    start_y = height - len(lines) * line_height - 40
+
+    for i, (line, text_width) in enumerate(lines):
+        x = (width - text_width) / 2
+        y = start_y + (i * line_height)
+        # one pass: the outline is FreeType's stroke, not 24 offset copies of the text
+        draw.text((x, y), line, fill="white", font=font, stroke_width=OUTLINE_WIDTH, stroke_fill="black")
+    return image
+
+
+def caption_overlay(size, text, font):
+    """(overlay, box): the caption on a transparent RGBA image, cropped to the area it covers"""
+    overlay = draw_caption(Image.new("RGBA", size, (0, 0, 0, 0)), text, font)
+    box = overlay.getbbox()
+    if box is None:
+        return None, None
+    return overlay.crop(box), box
+
+
+# --- Animated templates ---
+def _is_animated(path):
+    with Image.open(path) as img:
+        return img.format in ANIMATED_EXTENSIONS and getattr(img, "n_frames", 1) > 1
+
+
+def is_animated(path):
+    """True for GIF / WebP files with more than one frame (memoized per file)"""
+    return file_cache.load(path, _is_animated, key="animated")
+
+
+def _frame_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=max(1, FRAME_WORKERS), thread_name_prefix="meme-frames")
+        return _pool
+
+
+def _caption_frame(frame, overlay, box, fmt):
+    if overlay is not None:
+        frame.paste(overlay, box[:2], overlay)
+    if fmt == "GIF":
+        # per-frame palette; fast octree is ~10x quicker than median cut on big GIFs
+        return frame.quantize(256, method=Image.Quantize.FASTOCTREE)
+    return frame
+
+
+def render_animated(template_path, text, font):
+    """Caption every frame of an animated template.
+
+    Returns a dict with the encoded animation ("data", "format", "extension"),
+    the first captioned frame ("preview") and the frame count, output size and
+    render / encode times.
+    """
+    start = time.perf_counter()
+    pool = _frame_pool()
+    futures = []
+    durations = []
+    overlay = box = None
+    with Image.open(template_path) as img:
+        fmt = img.format
+        # a GIF without a loop extension plays once: only pass `loop` on when the source has one
+        save_options = {"loop": img.info["loop"]} if "loop" in img.info else {}
+        # frames decode in order (each builds on the previous one); captioning runs in the pool
+        for index, frame in enumerate(ImageSequence.Iterator(img)):
+            rgb = frame.convert("RGB")
+            rgb.info = {}  # drop the source palette's transparency, it doesn't apply to the new palette
+            durations.append(frame.info.get("duration", DEFAULT_FRAME_DURATION))  # 0 ms frames stay 0 ms
+            if index == 0:
+                overlay, box = caption_overlay(rgb.size, text, font)
+            futures.append(pool.submit(_caption_frame, rgb, overlay, box, fmt))
+        frames = [future.result() for future in futures]
+    rendered = time.perf_counter()
+
+    with metrics.timer("image", op="animated", format=fmt) as span:
+        buffer = BytesIO()
+        frames[0].save(buffer, format=fmt, save_all=True, append_images=frames[1:], duration=durations,
+                       **save_options)
+        data = buffer.getvalue()
+        span["bytes"] = len(data)
+    encoded = time.perf_counter()
+    return {
+        "data": data,
+        "format": fmt,
+        "extension": ANIMATED_EXTENSIONS[fmt],
+        "preview": frames[0],
+        "frames": len(frames),
+        "bytes": len(data),
+        "render_ms": round((rendered - start) * 1000, 1),
+        "encode_ms": round((encoded - rendered) * 1000, 1),
+    }
+
+
+# --- Benchmark ---
+def benchmark(text="ఇది ఒక మీమ్ caption for every frame"):
+    """Caption every animated template and print frames, size and timings"""
+    font = ImageFont.load_default(40)
+    for name in sorted(os.listdir(TEMPLATE_FOLDER)):
+        path = os.path.join(TEMPLATE_FOLDER, name)
+        if name.startswith("meme_") or not is_animated(path):
+            continue
+        result = render_animated(path, text, font)
+        print(f"{name:18s} {result['frames']:4d} frames  {os.path.getsize(path) / 1024:7.0f} KB -> "
+              f"{result['bytes'] / 1024:7.0f} KB  render {result['render_ms']:7.1f}ms  encode {result['encode_ms']:7.1f}ms")
+
+
+# Typical captions from the meme feed: Telugu, Telugu + English, short and long
+BENCH_CAPTIONS = (
+    "ఇది ఒక మీమ్",
+    "నేను ఎప్పుడూ ఇలాగే ఉంటాను",
+    "Monday morning office ki vellalante ఎంత కష్టమో",
+    "అమ్మ: చదువుకో రా! నేను: ఒక్క reel అయిపోగానే",
+    "పరీక్షలు దగ్గర పడుతున్నప్పుడు మన పరిస్థితి ఇదే, syllabus మొత్తం ఇంకా మిగిలే ఉంది",
+)
+
+
+def _draw_caption_offsets(image, text, font):
+    # the previous renderer: wrap on every call, outline as 24 offset copies of the text
+    draw = ImageDraw.Draw(image)
+    width, height = image.size
+    lines = wrap_caption(draw, text, font, width)
+    line_height = font.getbbox("A")[3] - font.getbbox("A")[1] + 5
+    start_y = height - len(lines) * line_height - 40
+    for i, line in enumerate(lines):
+        bbox = draw.textbbox((0, 0), line, font=font)
+        x = (width - (bbox[2] - bbox[0])) / 2
+        y = start_y + (i * line_height)
+        for dx in range(-OUTLINE_WIDTH, OUTLINE_WIDTH + 1):
+            for dy in range(-OUTLINE_WIDTH, OUTLINE_WIDTH + 1):
+                if dx != 0 or dy != 0:
+                    draw.text((x + dx, y + dy), line, fill="black", font=font)
+        draw.text((x, y), line, fill="white", font=font)
+    return image
+
+
+def caption_benchmark(font_path=FONT_PATH, size=40, seconds=2.0):
+    """Memes/sec for the BENCH_CAPTIONS on the static templates: previous renderer vs. cached fonts,
+    memoized layouts and single-pass stroke"""
+    def open_font():
+        try:
+            return ImageFont.truetype(font_path, size)
+        except OSError:
+            return ImageFont.load_default(size)  # no Telugu font installed; same code paths
+
+    templates = []
+    for name in sorted(os.listdir(TEMPLATE_FOLDER)):
+        path = os.path.join(TEMPLATE_FOLDER, name)
+        if name.startswith("meme_") or is_animated(path):
+            continue
+        with Image.open(path) as img:
+            templates.append(img.convert("RGB"))
+    jobs = [(image, text) for image in templates for text in BENCH_CAPTIONS]
+
+    font = open_font()
+    variants = (
+        ("font per meme, 25-pass outline", lambda image, text: _draw_caption_offsets(image, text, open_font())),
+        ("cached font + layout, stroke   ", lambda image, text: draw_caption(image, text, font)),
+    )
+    for label, render in variants:
+        done = 0
+        deadline = time.perf_counter() + seconds
+        start = time.perf_counter()
+        while time.perf_counter() < deadline:
+            image, text = jobs[done % len(jobs)]
+            render(image.copy(), text)
+            done += 1
+        elapsed = time.perf_counter() - start
+        print(f"{label} {done / elapsed:8.1f} memes/sec  ({len(templates)} templates x {len(BENCH_CAPTIONS)} captions)")
+    print(f"layout cache: {layout_stats()}")
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark()
+    if "--bench-captions" in sys.argv:
+        caption_benchmark()
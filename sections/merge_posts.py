@@ -1,6 +1,11 @@
 import os
 import json
 
+try:
+    from . import durable
+except ImportError:  # run as a script: python sections/merge_posts.py
+    import durable
+
 SECTION_DIR = "posts/Stories Sharing"
 OUTPUT_FILE = os.path.join(SECTION_DIR, "posts.json")
 
@@ -18,8 +23,7 @@ def merge_all_json_files():
                     print(f"Error reading {file}: {e}")
 
     # Save merged data
-    with open(OUTPUT_FILE, "w") as f:
-        json.dump(merged_posts, f, indent=2)
+    durable.write_json(OUTPUT_FILE, merged_posts, indent=2)
 
     print(f"✅ Merged {len(merged_posts)} files into {OUTPUT_FILE}")
 
@@ -0,0 +1,224 @@
+import os
+import sys
+import json
+import time
+import bisect
+import threading
+from functools import wraps
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Process-wide timing instrumentation. Code paths wrap themselves in
+# `with metrics.timer(kind, op=...) as span:` (or the @metrics.timed decorator);
+# each span lands in an in-process histogram per (kind, labels, outcome) and,
+# when the span sets span["bytes"], in a byte counter. Kinds used in the app:
+#   rerun, section        - main.run() and the section it dispatches to
+#   storage               - post store queries / writes, file reads and writes
+#   render_queue          - background job stages (sections/render_queue.py)
+#   image                 - thumbnail / meme encodes
+#   transliterate         - phonetic transliteration calls
+# render() formats everything in the Prometheus text format; start_server()
+# serves it on a local port. With CORPUSEUM_TRACE_FILE set, every span is also
+# appended to that file as one JSON line.
+
+METRICS_HOST = os.environ.get("CORPUSEUM_METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.environ.get("CORPUSEUM_METRICS_PORT", "9464"))  # 0 disables the endpoint
+TRACE_FILE = os.environ.get("CORPUSEUM_TRACE_FILE")
+
+# Histogram bucket upper bounds, seconds
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_histograms = {}  # (kind, labels) -> [bucket counts..., +Inf count], sum
+_bytes = {}  # (kind, labels) -> total bytes
+_gauges = {}  # name -> (help, fn returning {labels tuple: value})
+
+_trace_lock = threading.Lock()
+_trace = None
+
+_server_lock = threading.Lock()
+_server_started = False
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _write_trace(event):
+    global _trace
+    with _trace_lock:
+        if _trace is None:
+            _trace = open(TRACE_FILE, "a", encoding="utf-8", buffering=1)
+        _trace.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+
+# --- Recording ---
+def observe(kind, seconds, nbytes=0, outcome="ok", **labels):
+    """Record one finished span of `kind`"""
+    key = (kind, _label_key(dict(labels, outcome=outcome)))
+    with _lock:
+        entry = _histograms.get(key)
+        if entry is None:
+            entry = _histograms[key] = [[0] * (len(BUCKETS) + 1), 0.0]
+        entry[0][bisect.bisect_left(BUCKETS, seconds)] += 1
+        entry[1] += seconds
+        if nbytes:
+            bytes_key = (kind, _label_key(labels))
+            _bytes[bytes_key] = _bytes.get(bytes_key, 0) + nbytes
+    if TRACE_FILE:
+        _write_trace({
+            "ts": round(time.time(), 6),
+            "kind": kind,
+            **labels,
+            "ms": round(seconds * 1000, 3),
+            "bytes": nbytes,
+            "outcome": outcome,
+            "thread": threading.current_thread().name,
+        })
+
+
+@contextmanager
+def timer(kind, **labels):
+    """Time the block as one span; set span["bytes"] inside it to count bytes too.
+
+    Exceptions are recorded with outcome="error" and re-raised. Streamlit's
+    rerun / stop signals (BaseException, not Exception) count as "interrupted".
+    """
+    span = {"bytes": 0}
+    outcome = "ok"
+    start = time.perf_counter()
+    try:
+        yield span
+    except Exception:
+        outcome = "error"
+        raise
+    except BaseException:
+        outcome = "interrupted"
+        raise
+    finally:
+        observe(kind, time.perf_counter() - start, span["bytes"], outcome, **labels)
+
+
+def timed(kind, **labels):
+    """Decorator form of timer(); `op` defaults to the function name"""
+    def decorate(fn):
+        span_labels = dict(labels)
+        span_labels.setdefault("op", fn.__name__)
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timer(kind, **span_labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def gauge(name, help_text, read):
+    """Export `read()` as gauge `name`; it returns a number or {((label, value), ...): number}"""
+    with _lock:
+        _gauges[name] = (help_text, read)
+
+
+# --- Export ---
+def _format_labels(pairs, extra=()):
+    pairs = tuple(pairs) + tuple(extra)
+    if not pairs:
+        return ""
+    escaped = (f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+def snapshot():
+    """{kind: [{"labels", "count", "sum", "buckets"}]} and byte totals, for dashboards and benchmarks"""
+    with _lock:
+        spans = {}
+        for (kind, labels), (counts, total) in sorted(_histograms.items()):
+            spans.setdefault(kind, []).append(
+                {"labels": dict(labels), "count": sum(counts), "sum": total, "buckets": list(counts)}
+            )
+        byte_totals = {kind: {} for kind, _ in _bytes}
+        for (kind, labels), value in sorted(_bytes.items()):
+            byte_totals[kind][labels] = value
+    return {"spans": spans, "bytes": byte_totals}
+
+
+def render():
+    """All metrics in the Prometheus text exposition format"""
+    with _lock:
+        histograms = sorted((key, (list(counts), total)) for key, (counts, total) in _histograms.items())
+        byte_totals = sorted(_bytes.items())
+        gauges = sorted(_gauges.items())
+
+    lines = []
+    previous = None
+    for (kind, labels), (counts, total) in histograms:
+        name = f"corpuseum_{kind}_duration_seconds"
+        if kind != previous:
+            lines.append(f"# HELP {name} Time spent in {kind} spans.")
+            lines.append(f"# TYPE {name} histogram")
+            previous = kind
+        cumulative = 0
+        for bound, count in zip(BUCKETS + (float("inf"),), counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f"{name}_bucket{_format_labels(labels, (('le', le),))} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {total:.6f}")
+        lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+
+    previous = None
+    for (kind, labels), value in byte_totals:
+        name = f"corpuseum_{kind}_bytes_total"
+        if kind != previous:
+            lines.append(f"# HELP {name} Bytes read or written by {kind} spans.")
+            lines.append(f"# TYPE {name} counter")
+            previous = kind
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+
+    for name, (help_text, read) in gauges:
+        try:
+            values = read()
+        except Exception:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        if not isinstance(values, dict):
+            values = {(): values}
+        for labels, value in sorted(values.items()):
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+# --- Local endpoint ---
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server():
+    """Serve /metrics on METRICS_HOST:METRICS_PORT once per process (no-op if disabled or the port is taken)"""
+    global _server_started
+    with _server_lock:
+        if _server_started or not METRICS_PORT:
+            return
+        _server_started = True
+        try:
+            server = ThreadingHTTPServer((METRICS_HOST, METRICS_PORT), _MetricsHandler)
+        except OSError:
+            return
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+
+
+if __name__ == "__main__":
+    if "--dump" in sys.argv:
+        print(render(), end="")
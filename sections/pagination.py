@@ -0,0 +1,57 @@
+import streamlit as st
+
+# Shared feed pagination: each feed keeps an offset cursor in session state and
+# only asks the post store for the posts of the visible page. A feed's search box
+# shares its cursor, so a new query starts again from the first page.
+
+PAGE_SIZE = 10
+
+
+def _cursor_key(key):
+    return f"{key}_cursor"
+
+
+def page_window(key, total, page_size=PAGE_SIZE):
+    """(offset, limit) of the page currently shown for feed `key`"""
+    cursor_key = _cursor_key(key)
+    offset = st.session_state.get(cursor_key, 0)
+    # the feed may have shrunk since the cursor was set (deleted posts)
+    last_page_offset = max(0, (total - 1) // page_size * page_size)
+    offset = min(max(0, offset), last_page_offset)
+    st.session_state[cursor_key] = offset
+    return offset, page_size
+
+
+def _move(key, delta):
+    cursor_key = _cursor_key(key)
+    st.session_state[cursor_key] = max(0, st.session_state.get(cursor_key, 0) + delta)
+
+
+def page_controls(key, total, page_size=PAGE_SIZE):
+    """Previous / Next buttons and a "Page x of y" label (hidden when everything fits on one page)"""
+    if total <= page_size:
+        return
+    offset = st.session_state.get(_cursor_key(key), 0)
+    page = offset // page_size + 1
+    pages = (total + page_size - 1) // page_size
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        st.button("⬅️ Previous", key=f"{key}_prev", disabled=page <= 1,
+                  on_click=_move, args=(key, -page_size), use_container_width=True)
+    with col2:
+        st.markdown(f"<div style='text-align:center;padding-top:8px;'>Page {page} of {pages}</div>",
+                    unsafe_allow_html=True)
+    with col3:
+        st.button("Next ➡️", key=f"{key}_next", disabled=page >= pages,
+                  on_click=_move, args=(key, page_size), use_container_width=True)
+
+
+def _reset(key):
+    st.session_state[_cursor_key(key)] = 0
+
+
+def search_box(key, label="🔍 Search", placeholder="Search in Telugu or English..."):
+    """Search box for feed `key`; returns the stripped query ("" when empty)"""
+    query = st.text_input(label, key=f"{key}_search", placeholder=placeholder, on_change=_reset, args=(key,))
+    return (query or "").strip()
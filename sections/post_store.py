@@ -0,0 +1,711 @@
+import os
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from . import file_cache, metrics, ranking, search
+
+# --- Constants ---
+BASE_DIR = os.path.dirname(__file__)
+DB_FILE = os.environ.get(
+    "CORPUSEUM_DB", os.path.join(BASE_DIR, "..", "posts", "corpuseum.db")
+)
+
+# Columns kept outside the JSON payload so they can be indexed / updated in place
+_COLUMNS = ("id", "upvotes", "comments", "likes")
+
+# Feed orders -> ORDER BY clause; each one is backed by an index, so a page is a range read
+_ORDER_SQL = {
+    "upvotes": "upvotes DESC, seq",
+    "recent": "seq DESC",
+    "hot": "hot DESC, seq",
+}
+
+# bm25 weights of the search_index columns: title, body, comments
+_SEARCH_WEIGHTS = (4.0, 1.0, 0.5)
+# Searches matching more posts than this list the newest matches instead of ranking them all
+SEARCH_RANK_LIMIT = 5000
+# Match counts (for pagination) stop here
+SEARCH_COUNT_LIMIT = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+    section    TEXT NOT NULL,
+    id         TEXT NOT NULL,
+    author     TEXT NOT NULL DEFAULT 'Anonymous',
+    upvotes    INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT,
+    hot        REAL NOT NULL DEFAULT 0,
+    data       TEXT NOT NULL,
+    UNIQUE (section, id)
+);
+CREATE INDEX IF NOT EXISTS idx_posts_upvotes ON posts (section, upvotes DESC, seq);
+CREATE INDEX IF NOT EXISTS idx_posts_author ON posts (section, author);
+CREATE INDEX IF NOT EXISTS idx_posts_recent ON posts (section, seq DESC);
+
+CREATE TABLE IF NOT EXISTS comments (
+    seq      INTEGER PRIMARY KEY AUTOINCREMENT,
+    section  TEXT NOT NULL,
+    post_id  TEXT NOT NULL,
+    position REAL NOT NULL,
+    user     TEXT NOT NULL DEFAULT 'Anonymous',
+    text     TEXT NOT NULL DEFAULT '',
+    reply    TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_comments_post ON comments (section, post_id, position);
+
+CREATE TABLE IF NOT EXISTS likes (
+    section  TEXT NOT NULL,
+    post_id  TEXT NOT NULL,
+    username TEXT NOT NULL,
+    PRIMARY KEY (section, post_id, username)
+);
+CREATE INDEX IF NOT EXISTS idx_likes_user ON likes (section, username);
+
+-- Append-only log of votes; compact() folds it into likes / posts.upvotes
+CREATE TABLE IF NOT EXISTS like_events (
+    seq      INTEGER PRIMARY KEY AUTOINCREMENT,
+    section  TEXT NOT NULL,
+    post_id  TEXT NOT NULL,
+    username TEXT,              -- NULL for plain counter votes
+    delta    INTEGER NOT NULL,
+    liked    INTEGER            -- like state after the event, NULL for counter votes
+);
+CREATE INDEX IF NOT EXISTS idx_like_events_post ON like_events (section, post_id, username);
+
+-- Full-text index, one row per post (rowid = posts.seq). The columns hold
+-- search.index_text() output: normalized tokens joined by spaces. The prefix
+-- indexes keep search-as-you-type prefixes from merging every matching term.
+CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5 (
+    title, body, comments, tokenize = 'ascii', prefix = '2 3 4'
+);
+
+CREATE TABLE IF NOT EXISTS seeded (
+    section TEXT PRIMARY KEY,
+    source  TEXT
+);
+
+-- Last numeric post id handed out per section (allocate_id)
+CREATE TABLE IF NOT EXISTS id_counters (
+    section TEXT PRIMARY KEY,
+    last    INTEGER NOT NULL
+);
+"""
+
+_local = threading.local()
+_schema_lock = threading.Lock()
+_schema_ready = set()
+
+# Votes are appended to like_events and folded into the snapshot tables by a
+# background thread every COMPACT_INTERVAL seconds
+COMPACT_INTERVAL = float(os.environ.get("CORPUSEUM_COMPACT_SECONDS", "5"))
+_compactor_lock = threading.Lock()
+_compactor_started = False
+
+# Bumped on every write from this process so cached feeds never outlive our own writes;
+# writes from other processes are caught by the db / -wal file signature
+_writes = 0
+_writes_lock = threading.Lock()
+
+
+# --- Connection ---
+def get_connection():
+    """Return this thread's SQLite connection (WAL mode, schema created once)"""
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "path", None) == DB_FILE:
+        return conn
+
+    os.makedirs(os.path.dirname(os.path.abspath(DB_FILE)), exist_ok=True)
+    conn = sqlite3.connect(DB_FILE, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    conn.create_function("hot_score", 2, ranking.hot_score, deterministic=True)
+
+    with _schema_lock:
+        if DB_FILE not in _schema_ready:
+            conn.executescript(SCHEMA)
+            _migrate(conn)
+            _schema_ready.add(DB_FILE)
+
+    _local.conn = conn
+    _local.path = DB_FILE
+    return conn
+
+
+def _migrate(conn):
+    """Bring databases created before the hot ranking column up to date"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(posts)")}
+        if "hot" not in columns:
+            conn.execute("ALTER TABLE posts ADD COLUMN hot REAL NOT NULL DEFAULT 0")
+            conn.execute("UPDATE posts SET hot = hot_score(upvotes, created_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_hot ON posts (section, hot DESC, seq)")
+        # databases from before the search index: index every post once
+        if not conn.execute("SELECT 1 FROM search_index LIMIT 1").fetchone():
+            for row in conn.execute("SELECT seq, section, id FROM posts").fetchall():
+                _index_post(conn, row["section"], row["id"])
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+@contextmanager
+def _transaction():
+    """BEGIN IMMEDIATE ... COMMIT, or ROLLBACK if the block raises"""
+    conn = get_connection()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+    _written()
+
+
+def _written():
+    global _writes
+    with _writes_lock:
+        _writes += 1
+
+
+# --- Helpers ---
+def _author_of(post):
+    return (post.get("author") or post.get("username") or "Anonymous").strip() or "Anonymous"
+
+
+def _search_fields(data, comments):
+    # (title, body, comments) columns of the search index
+    comment_texts = []
+    for comment in comments:
+        if isinstance(comment, str):
+            comment_texts.append(comment)
+        else:
+            comment_texts.extend((comment.get("text"), comment.get("reply")))
+    return (
+        search.index_text(data.get("caption"), data.get("text")),
+        search.index_text(data.get("description")),
+        search.index_text(*comment_texts),
+    )
+
+
+def _index_post(conn, section, post_id):
+    """(Re)index one post from its stored row and comments"""
+    row = conn.execute(
+        "SELECT seq, data FROM posts WHERE section = ? AND id = ?", (section, str(post_id))
+    ).fetchone()
+    if row is None:
+        return
+    comments = [
+        _comment_to_dict(c)
+        for c in conn.execute(
+            "SELECT * FROM comments WHERE section = ? AND post_id = ? ORDER BY position", (section, str(post_id))
+        )
+    ]
+    conn.execute(
+        "INSERT OR REPLACE INTO search_index (rowid, title, body, comments) VALUES (?, ?, ?, ?)",
+        (row["seq"], *_search_fields(json.loads(row["data"]), comments)),
+    )
+
+
+def _insert_post(conn, section, post):
+    data = {k: v for k, v in post.items() if k not in _COLUMNS}
+    upvotes = int(post.get("upvotes", len(post.get("likes", []))) or 0)
+    created_at = post.get("timestamp") or datetime.now().isoformat()
+    cursor = conn.execute(
+        "INSERT INTO posts (section, id, author, upvotes, created_at, hot, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            section,
+            str(post["id"]),
+            _author_of(post),
+            upvotes,
+            created_at,
+            ranking.hot_score(upvotes, created_at),
+            json.dumps(data, ensure_ascii=False),
+        ),
+    )
+    conn.execute(
+        "INSERT INTO search_index (rowid, title, body, comments) VALUES (?, ?, ?, ?)",
+        (cursor.lastrowid, *_search_fields(data, post.get("comments", []))),
+    )
+    post_id = str(post["id"])
+    if post_id.isascii() and post_id.isdigit():
+        # posts inserted with their own numeric id (seeding, imports) move the counter past it
+        conn.execute("UPDATE id_counters SET last = MAX(last, ?) WHERE section = ?", (int(post_id), section))
+    for position, comment in enumerate(post.get("comments", [])):
+        _insert_comment(conn, section, post["id"], float(position), comment)
+    for username in post.get("likes", []):
+        conn.execute(
+            "INSERT OR IGNORE INTO likes (section, post_id, username) VALUES (?, ?, ?)",
+            (section, str(post["id"]), username),
+        )
+
+
+def _insert_comment(conn, section, post_id, position, comment):
+    if isinstance(comment, str):
+        # Old meme format - plain string comments
+        comment = {"user": "Anonymous", "text": comment}
+    conn.execute(
+        "INSERT INTO comments (section, post_id, position, user, text, reply) VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            section,
+            str(post_id),
+            position,
+            comment.get("user", "Anonymous"),
+            comment.get("text", ""),
+            comment.get("reply"),
+        ),
+    )
+
+
+def _comment_to_dict(row):
+    comment = {"user": row["user"], "text": row["text"]}
+    if row["reply"] is not None:
+        comment["reply"] = row["reply"]
+    return comment
+
+
+def _rows_to_posts(conn, section, rows, with_likes):
+    """Turn post rows into the same dicts the JSON files used to hold"""
+    posts = []
+    by_id = {}
+    for row in rows:
+        post = json.loads(row["data"])
+        post["id"] = row["id"]
+        post["upvotes"] = row["upvotes"]
+        post["comments"] = []
+        if with_likes:
+            post["likes"] = []
+        posts.append(post)
+        by_id[row["id"]] = post
+
+    if not posts:
+        return posts
+
+    # Small pages use an IN (...) lookup; whole-section listings just scan the section
+    if len(by_id) <= 500:
+        where = f"post_id IN ({','.join('?' * len(by_id))})"
+        params = (section, *by_id.keys())
+    else:
+        where = "1"
+        params = (section,)
+
+    for row in conn.execute(
+        f"SELECT * FROM comments WHERE section = ? AND {where} ORDER BY post_id, position", params
+    ):
+        if row["post_id"] in by_id:
+            by_id[row["post_id"]]["comments"].append(_comment_to_dict(row))
+
+    if with_likes:
+        for row in conn.execute(
+            f"SELECT post_id, username FROM likes WHERE section = ? AND {where}", params
+        ):
+            if row["post_id"] in by_id:
+                by_id[row["post_id"]]["likes"].append(row["username"])
+
+    # Votes that are still in the log (not compacted yet)
+    for row in conn.execute(
+        f"SELECT * FROM like_events WHERE section = ? AND {where} ORDER BY seq", params
+    ):
+        post = by_id.get(row["post_id"])
+        if post is not None:
+            _apply_event(post, row, with_likes)
+
+    return posts
+
+
+def _apply_event(post, event, with_likes):
+    """Replay one logged vote onto a post dict (same clamping as the compacted counter)"""
+    post["upvotes"] = max(0, post["upvotes"] + event["delta"])
+    if with_likes and event["username"] is not None:
+        if event["liked"] and event["username"] not in post["likes"]:
+            post["likes"].append(event["username"])
+        elif not event["liked"] and event["username"] in post["likes"]:
+            post["likes"].remove(event["username"])
+
+
+# --- Seeding from the legacy JSON files ---
+def seed_from_json(section, posts_file, likes_file=None):
+    """Import a section's JSON file once, the first time the database sees that section"""
+    conn = get_connection()
+    if conn.execute("SELECT 1 FROM seeded WHERE section = ?", (section,)).fetchone():
+        return
+
+    try:
+        posts = file_cache.load_json(posts_file, default=[])
+    except json.JSONDecodeError:
+        posts = []
+
+    likes = {}
+    if likes_file:
+        try:
+            likes = file_cache.load_json(likes_file, default={})
+        except json.JSONDecodeError:
+            likes = {}
+
+    with _transaction() as conn:
+        # Another session may have seeded while we were reading the files
+        if conn.execute("SELECT 1 FROM seeded WHERE section = ?", (section,)).fetchone():
+            return
+        for post in posts:
+            _insert_post(conn, section, post)
+        for username, post_ids in likes.items():
+            conn.executemany(
+                "INSERT OR IGNORE INTO likes (section, post_id, username) VALUES (?, ?, ?)",
+                [(section, str(post_id), username) for post_id in post_ids],
+            )
+        conn.execute("INSERT INTO seeded (section, source) VALUES (?, ?)", (section, posts_file))
+
+
+# --- Queries ---
+def _cached(key, query):
+    """Run `query()` through the process-wide cache until the database changes"""
+    get_connection()  # make sure the database file exists before it is stat'ed
+    return file_cache.load(
+        DB_FILE,
+        lambda _: query(),
+        key=key,
+        watch=(DB_FILE, DB_FILE + "-wal"),
+        token=_writes,
+    )
+
+
+def list_posts(section, author=None, order="upvotes", with_likes=False, limit=None, offset=0):
+    """Return a section's posts, ordered by "upvotes" (most liked first), "recent" (newest first)
+    or "hot" (upvotes decayed by age).
+
+    `limit` / `offset` select a window (one feed page) so only those posts and their
+    comments are read. Results are cached process-wide until the database changes;
+    treat them as read-only.
+    """
+    return _cached(
+        ("posts", section, author, order, with_likes, limit, offset),
+        lambda: _query_posts(section, author, order, with_likes, limit, offset),
+    )
+
+
+def count_posts(section, author=None):
+    """Number of posts in a section (optionally by one author)"""
+    return _cached(("count", section, author), lambda: _count_posts(section, author))
+
+
+def _where(section, author):
+    if author is None:
+        return "section = ?", (section,)
+    return "section = ? AND author = ?", (section, author)
+
+
+@metrics.timed("storage", op="list_posts")
+def _query_posts(section, author, order, with_likes, limit=None, offset=0):
+    conn = get_connection()
+    order_sql = _ORDER_SQL[order]
+    where, params = _where(section, author)
+    sql = f"SELECT * FROM posts WHERE {where} ORDER BY {order_sql}"
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params += (limit, offset)
+    rows = conn.execute(sql, params).fetchall()
+    return _rows_to_posts(conn, section, rows, with_likes)
+
+
+@metrics.timed("storage", op="count_posts")
+def _count_posts(section, author):
+    where, params = _where(section, author)
+    return get_connection().execute(f"SELECT COUNT(*) FROM posts WHERE {where}", params).fetchone()[0]
+
+
+def search_posts(section, query, author=None, with_likes=False, limit=None, offset=0):
+    """Posts of a section matching a search box query.
+
+    All query terms must match, the last one also as a prefix (search as you type).
+    Results are ranked by bm25, with captions / meme text weighing more than
+    descriptions, and descriptions more than comments. Queries matching more than
+    SEARCH_RANK_LIMIT posts list the newest matches instead: ranking has to score
+    every match, newest-first stops after one page. Cached like list_posts().
+    """
+    return _cached(
+        ("search", section, search.normalize(query), author, with_likes, limit, offset),
+        lambda: _search(section, query, author, with_likes, limit, offset),
+    )
+
+
+def count_matches(section, query, author=None):
+    """Number of posts in a section matching a search box query, capped at SEARCH_COUNT_LIMIT"""
+    return _cached(
+        ("search_count", section, search.normalize(query), author),
+        lambda: _count_matches(section, query, author),
+    )
+
+
+# CROSS JOIN keeps the full-text match as the outer loop; otherwise SQLite may walk
+# the section's posts and re-run the match for every one of them
+_SEARCH_FROM = "search_index CROSS JOIN posts ON posts.seq = search_index.rowid"
+
+
+def _hits(conn, match, cap):
+    # matching posts in all sections, counting stops at `cap`
+    return conn.execute(
+        "SELECT COUNT(*) FROM (SELECT 1 FROM search_index WHERE search_index MATCH ? LIMIT ?)", (match, cap)
+    ).fetchone()[0]
+
+
+def _search_plan(query):
+    """(match expression, broad) for a query; match is None when the query has no terms.
+
+    A prefix on the last term expands to every indexed term that starts with it,
+    which is slow for whole common words ("monday"* -> mondays, monday's, ...).
+    When the exact terms alone already match more than SEARCH_RANK_LIMIT posts the
+    expansion could only add more posts to a newest-first list, so it is skipped.
+    """
+    exact = search.match_expression(query, prefix=False)
+    if exact is None:
+        return None, False
+    conn = get_connection()
+    hits = _hits(conn, exact, SEARCH_RANK_LIMIT + 1)
+    match = search.match_expression(query)
+    if match != exact and hits <= SEARCH_RANK_LIMIT:
+        hits = _hits(conn, match, SEARCH_RANK_LIMIT + 1)
+    else:
+        match = exact
+    return match, hits > SEARCH_RANK_LIMIT
+
+
+def _search_where(section, match, author):
+    where = "search_index MATCH ? AND posts.section = ?"
+    params = (match, section)
+    if author is not None:
+        where += " AND posts.author = ?"
+        params += (author,)
+    return where, params
+
+
+@metrics.timed("storage", op="search_posts")
+def _search(section, query, author, with_likes, limit, offset):
+    match, broad = _cached(("search_plan", search.normalize(query)), lambda: _search_plan(query))
+    if match is None:
+        return []
+    conn = get_connection()
+    where, params = _search_where(section, match, author)
+    if broad:
+        order_sql = "search_index.rowid DESC"
+    else:
+        order_sql = "bm25(search_index, ?, ?, ?), posts.seq"
+        params += _SEARCH_WEIGHTS
+    sql = f"SELECT posts.* FROM {_SEARCH_FROM} WHERE {where} ORDER BY {order_sql}"
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params += (limit, offset)
+    rows = conn.execute(sql, params).fetchall()
+    return _rows_to_posts(conn, section, rows, with_likes)
+
+
+@metrics.timed("storage", op="count_matches")
+def _count_matches(section, query, author):
+    match, _ = _cached(("search_plan", search.normalize(query)), lambda: _search_plan(query))
+    if match is None:
+        return 0
+    where, params = _search_where(section, match, author)
+    return get_connection().execute(
+        f"SELECT COUNT(*) FROM (SELECT 1 FROM {_SEARCH_FROM} WHERE {where} LIMIT ?)",
+        params + (SEARCH_COUNT_LIMIT,),
+    ).fetchone()[0]
+
+
+@metrics.timed("storage")
+def get_post(section, post_id, with_likes=False):
+    """Return a single post or None"""
+    conn = get_connection()
+    rows = conn.execute(
+        "SELECT * FROM posts WHERE section = ? AND id = ?", (section, str(post_id))
+    ).fetchall()
+    posts = _rows_to_posts(conn, section, rows, with_likes)
+    return posts[0] if posts else None
+
+
+@metrics.timed("storage")
+def liked_post_ids(section, username):
+    """Ids of the posts `username` has liked in a section"""
+    conn = get_connection()
+    rows = conn.execute(
+        "SELECT post_id FROM likes WHERE section = ? AND username = ?", (section, username)
+    )
+    liked = {row["post_id"] for row in rows}
+    for row in conn.execute(
+        "SELECT post_id, liked FROM like_events WHERE section = ? AND username = ? ORDER BY seq",
+        (section, username),
+    ):
+        if row["liked"]:
+            liked.add(row["post_id"])
+        else:
+            liked.discard(row["post_id"])
+    return liked
+
+
+@metrics.timed("storage")
+def allocate_id(section):
+    """Reserve the next numeric id for sections that number their posts 1, 2, 3...
+
+    The per-section counter is advanced under the database write lock, so
+    concurrent sessions (and processes) never get the same id; an id whose post
+    is never added is skipped, not reused. Only the first allocation of a
+    section looks at the posts (to start after the largest id already there).
+    """
+    with _transaction() as conn:
+        row = conn.execute("SELECT last FROM id_counters WHERE section = ?", (section,)).fetchone()
+        if row is None:
+            last = conn.execute(
+                "SELECT COALESCE(MAX(CAST(id AS INTEGER)), 0) FROM posts WHERE section = ?", (section,)
+            ).fetchone()[0]
+            conn.execute("INSERT INTO id_counters (section, last) VALUES (?, ?)", (section, last + 1))
+        else:
+            last = row["last"]
+            conn.execute("UPDATE id_counters SET last = ? WHERE section = ?", (last + 1, section))
+    return str(last + 1)
+
+
+# --- Writes ---
+# Votes re-rank the post in place: the upvotes and hot indexes are updated with the row
+_UPDATE_UPVOTES = (
+    "UPDATE posts SET upvotes = MAX(0, upvotes + ?), hot = hot_score(MAX(0, upvotes + ?), created_at) "
+    "WHERE section = ? AND id = ?"
+)
+
+
+@metrics.timed("storage")
+def add_post(section, post):
+    """Insert a new post (with any comments / likes it already carries)"""
+    with _transaction() as conn:
+        _insert_post(conn, section, post)
+
+
+@metrics.timed("storage")
+def delete_post(section, post_id):
+    """Delete a post together with its comments and likes"""
+    post_id = str(post_id)
+    with _transaction() as conn:
+        conn.execute(
+            "DELETE FROM search_index WHERE rowid IN (SELECT seq FROM posts WHERE section = ? AND id = ?)",
+            (section, post_id),
+        )
+        conn.execute("DELETE FROM posts WHERE section = ? AND id = ?", (section, post_id))
+        conn.execute("DELETE FROM comments WHERE section = ? AND post_id = ?", (section, post_id))
+        conn.execute("DELETE FROM likes WHERE section = ? AND post_id = ?", (section, post_id))
+        conn.execute("DELETE FROM like_events WHERE section = ? AND post_id = ?", (section, post_id))
+
+
+@metrics.timed("storage")
+def change_upvotes(section, post_id, delta):
+    """Add `delta` to a post's upvote counter (never below zero)"""
+    get_connection().execute(
+        "INSERT INTO like_events (section, post_id, delta) VALUES (?, ?, ?)",
+        (section, str(post_id), delta),
+    )
+    _written()
+    _start_compactor()
+
+
+@metrics.timed("storage")
+def set_like(section, post_id, username, liked=True):
+    """Record (or remove) `username`'s like; the upvote counter follows when the log is compacted.
+
+    Returns True when something changed, False when the like was already in that state.
+    """
+    post_id = str(post_id)
+    with _transaction() as conn:
+        # current state: the latest logged event, else the compacted likes table
+        row = conn.execute(
+            "SELECT liked FROM like_events WHERE section = ? AND post_id = ? AND username = ? "
+            "ORDER BY seq DESC LIMIT 1",
+            (section, post_id, username),
+        ).fetchone()
+        if row is None:
+            row = conn.execute(
+                "SELECT 1 FROM likes WHERE section = ? AND post_id = ? AND username = ?",
+                (section, post_id, username),
+            ).fetchone()
+            currently_liked = row is not None
+        else:
+            currently_liked = bool(row["liked"])
+        if currently_liked == liked:
+            return False
+        conn.execute(
+            "INSERT INTO like_events (section, post_id, username, delta, liked) VALUES (?, ?, ?, ?, ?)",
+            (section, post_id, username, 1 if liked else -1, int(liked)),
+        )
+    _start_compactor()
+    return True
+
+
+# --- Compaction ---
+@metrics.timed("storage")
+def compact():
+    """Fold the logged votes into the likes table and upvote counters; returns the number folded"""
+    with _transaction() as conn:
+        events = conn.execute("SELECT * FROM like_events ORDER BY seq").fetchall()
+        for event in events:
+            if event["username"] is not None:
+                if event["liked"]:
+                    conn.execute(
+                        "INSERT OR IGNORE INTO likes (section, post_id, username) VALUES (?, ?, ?)",
+                        (event["section"], event["post_id"], event["username"]),
+                    )
+                else:
+                    conn.execute(
+                        "DELETE FROM likes WHERE section = ? AND post_id = ? AND username = ?",
+                        (event["section"], event["post_id"], event["username"]),
+                    )
+            conn.execute(
+                _UPDATE_UPVOTES, (event["delta"], event["delta"], event["section"], event["post_id"])
+            )
+        if events:
+            conn.execute("DELETE FROM like_events WHERE seq <= ?", (events[-1]["seq"],))
+    return len(events)
+
+
+def _compact_forever():
+    while True:
+        time.sleep(COMPACT_INTERVAL)
+        try:
+            compact()
+        except sqlite3.Error:
+            pass  # busy / locked; try again next round
+
+
+def _start_compactor():
+    """Start the background compactor once per process"""
+    global _compactor_started
+    with _compactor_lock:
+        if _compactor_started:
+            return
+        _compactor_started = True
+    threading.Thread(target=_compact_forever, name="post-store-compactor", daemon=True).start()
+
+
+@metrics.timed("storage")
+def add_comment(section, post_id, comment, index=None):
+    """Append a comment, or insert it at `index` in the post's comment list (for replies)"""
+    post_id = str(post_id)
+    with _transaction() as conn:
+        positions = [
+            row[0]
+            for row in conn.execute(
+                "SELECT position FROM comments WHERE section = ? AND post_id = ? ORDER BY position",
+                (section, post_id),
+            )
+        ]
+        if index is None or index >= len(positions):
+            position = positions[-1] + 1 if positions else 0.0
+        elif index <= 0:
+            position = positions[0] - 1 if positions else 0.0
+        else:
+            position = (positions[index - 1] + positions[index]) / 2
+        _insert_comment(conn, section, post_id, position, comment)
+        _index_post(conn, section, post_id)
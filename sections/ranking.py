@@ -0,0 +1,131 @@
+import math
+import bisect
+import threading
+from datetime import datetime
+
+# Process-wide ranking indexes for the file-backed feeds. Each index keeps its
+# posts in sorted key lists (one per order) that are patched with bisect on
+# every vote / new post, so a "top" page is a slice instead of a full re-sort.
+# Indexes are rebuilt only when the backing file / directory signature changes.
+# A writer that patches an index passes the signature from before its write as
+# well as after: the index only takes the new one if it was current before, so
+# a write by another process in between still forces a rebuild.
+
+ORDERS = ("upvotes", "recent", "hot")
+
+# Posts made 45000s (12.5h) later need 10x the votes to rank above in "hot"
+HOT_EPOCH = datetime(2025, 1, 1).timestamp()
+HOT_HALF_DAY = 45000
+
+_lock = threading.Lock()
+_indexes = {}
+
+
+# --- Scores ---
+def _timestamp(created_at):
+    if not created_at:
+        return 0.0
+    try:
+        return datetime.fromisoformat(str(created_at)).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def hot_score(upvotes, created_at):
+    """Time-decayed score that never needs recomputing for old posts (Reddit-style)"""
+    upvotes = upvotes or 0
+    sign = 1 if upvotes > 0 else -1 if upvotes < 0 else 0
+    order = math.log10(max(abs(upvotes), 1))
+    return round(sign * order + (_timestamp(created_at) - HOT_EPOCH) / HOT_HALF_DAY, 7)
+
+
+def _sort_key(post, order, seq):
+    # `seq` (load order) breaks ties, so equal scores keep a stable order like list.sort
+    if order == "upvotes":
+        return (-(post.get("upvotes") or 0), seq)
+    if order == "recent":
+        return (-_timestamp(post.get("timestamp")), seq)
+    return (-hot_score(post.get("upvotes"), post.get("timestamp")), seq)
+
+
+def _insert(index, post, seq):
+    post_id = post["id"]
+    keys = {order: _sort_key(post, order, seq) for order in ORDERS}
+    for order, key in keys.items():
+        bisect.insort(index["ranked"][order], (key, post_id))
+    index["entries"][post_id] = (post, seq, keys)
+
+
+def _discard(index, post_id):
+    entry = index["entries"].pop(post_id, None)
+    if entry is None:
+        return None
+    _, seq, keys = entry
+    for order, key in keys.items():
+        ranked = index["ranked"][order]
+        i = bisect.bisect_left(ranked, (key, post_id))
+        if i < len(ranked) and ranked[i] == (key, post_id):
+            del ranked[i]
+    return seq
+
+
+# --- Public API ---
+def is_current(name, signature):
+    """True if index `name` exists and was built from files with this signature"""
+    with _lock:
+        index = _indexes.get(name)
+        return index is not None and index["signature"] == signature
+
+
+def build(name, posts, signature):
+    """(Re)build index `name` from a full list of posts"""
+    index = {"signature": signature, "entries": {}, "ranked": {order: [] for order in ORDERS}, "next_seq": 0}
+    for seq, post in enumerate(posts):
+        _insert(index, post, seq)
+    index["next_seq"] = len(posts)
+    with _lock:
+        _indexes[name] = index
+
+
+def _advance(index, signature, previous):
+    # only our own write happened since the index was current: it stays current
+    if signature is not None and index["signature"] == previous:
+        index["signature"] = signature
+
+
+def update(name, post, signature=None, previous=None):
+    """Insert a new post or re-rank an existing one after a vote; no-op if the index isn't built.
+
+    `previous` / `signature` are the backing files' signatures before / after the write.
+    """
+    with _lock:
+        index = _indexes.get(name)
+        if index is None:
+            return
+        seq = _discard(index, post["id"])
+        if seq is None:
+            seq = index["next_seq"]
+            index["next_seq"] += 1
+        _insert(index, post, seq)
+        _advance(index, signature, previous)
+
+
+def remove(name, post_id, signature=None, previous=None):
+    """Drop a post from index `name`; signatures as for update()"""
+    with _lock:
+        index = _indexes.get(name)
+        if index is None:
+            return
+        _discard(index, post_id)
+        _advance(index, signature, previous)
+
+
+def top(name, order="upvotes", limit=None, offset=0):
+    """Posts of index `name` in rank order; `limit` / `offset` select a window"""
+    with _lock:
+        index = _indexes.get(name)
+        if index is None:
+            return []
+        ranked = index["ranked"][order]
+        end = len(ranked) if limit is None else offset + limit
+        return [index["entries"][post_id][0] for _, post_id in ranked[offset:end]]
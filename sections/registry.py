@@ -0,0 +1,101 @@
+import time
+import importlib
+import threading
+
+# Sections shown in the sidebar, in order. Their modules are imported (and
+# warmed up) once per process in the background, so the first visitor after a
+# deploy doesn't pay the import / seeding cost on their page load.
+SECTIONS = {
+    "Stories Sharing": {
+        "module": "stories_sharing",
+        "icon": "📖",
+        "description": "Share and discover Telugu stories"
+    },
+    "Proverb Hub": {
+        "module": "proverb_entertainment",
+        "icon": "🎭",
+        "description": "Telugu proverbs and fun activities"
+    },
+    "Desi Meme Creator": {
+        "module": "desi_meme_creator",
+        "icon": "😄",
+        "description": "Create hilarious desi memes"
+    },
+    "About Developers": {
+        "module": "about_developers",
+        "icon": "👨‍💻",
+        "description": "Meet the team behind the app"
+    },
+    # "Cooking and Recipe": {
+    #     "module": "cooking_recipe",
+    #     "icon": "🍛",
+    #     "description": "Traditional Telugu recipes"
+    # },
+    # "Landmarks and Historical Places": {
+    #     "module": "landmarks_and_historical_places",
+    #     "icon": "🏛️",
+    #     "description": "Explore Telugu heritage sites"
+    # },
+}
+
+_lock = threading.Lock()
+_preload_started = False
+_stats = {}  # module name -> {"import_ms", "warmup_ms", "error"}
+
+
+def _record(module_name, **values):
+    with _lock:
+        _stats.setdefault(module_name, {"import_ms": None, "warmup_ms": None, "error": None}).update(values)
+
+
+def load(module_name):
+    """Import `sections.<module_name>` (a no-op after the first time) and record how long it took.
+
+    Import errors propagate to the caller.
+    """
+    start = time.perf_counter()
+    try:
+        module = importlib.import_module(f"sections.{module_name}")
+    except Exception as e:
+        _record(module_name, error=f"{type(e).__name__}: {e}")
+        raise
+    with _lock:
+        first = _stats.get(module_name, {}).get("import_ms") is None
+    if first:
+        _record(module_name, import_ms=round((time.perf_counter() - start) * 1000, 1), error=None)
+    return module
+
+
+def warmup(module_names=None):
+    """Import every configured section and run its optional module-level `warmup()` hook"""
+    for module_name in module_names or [info["module"] for info in SECTIONS.values()]:
+        try:
+            module = load(module_name)
+        except Exception:
+            continue  # recorded in stats(); the page shows the error when the section is opened
+        hook = getattr(module, "warmup", None)
+        if hook is None:
+            continue
+        start = time.perf_counter()
+        try:
+            hook()
+        except Exception as e:
+            _record(module_name, error=f"warmup failed: {type(e).__name__}: {e}")
+        else:
+            _record(module_name, warmup_ms=round((time.perf_counter() - start) * 1000, 1))
+
+
+def preload():
+    """Start warming all sections in a background thread, once per process"""
+    global _preload_started
+    with _lock:
+        if _preload_started:
+            return
+        _preload_started = True
+    threading.Thread(target=warmup, name="section-preload", daemon=True).start()
+
+
+def stats():
+    """Per-section import / warmup times (ms) and load errors"""
+    with _lock:
+        return {name: dict(values) for name, values in _stats.items()}
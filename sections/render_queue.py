@@ -0,0 +1,160 @@
+import os
+import time
+import uuid
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+from . import metrics
+
+# Background jobs for work that shouldn't run in the Streamlit script thread
+# (rendering and publishing memes). Jobs run on a small worker pool shared by
+# every session. Admission is bounded twice: MAX_PENDING jobs in total and
+# MAX_PER_OWNER per user, so one burst of posts can't fill the queue for
+# everybody else. submit() returns a job id at once (or None when the queue is
+# full); the page polls status() until the job is done.
+#
+# A job function is called as fn(stage, *args) and times its steps with
+# `with stage("render"): ...`; the per-stage times end up in the job and in stats().
+
+WORKERS = int(os.environ.get("CORPUSEUM_RENDER_WORKERS", "2"))
+MAX_PENDING = int(os.environ.get("CORPUSEUM_RENDER_QUEUE", "16"))  # queued + running
+MAX_PER_OWNER = int(os.environ.get("CORPUSEUM_RENDER_PER_USER", "3"))
+JOB_TTL = 600  # seconds a finished job stays around for its page to pick it up
+
+_lock = threading.Lock()
+_pool = None
+_jobs = {}  # job id -> job dict
+_counters = {"submitted": 0, "rejected": 0, "done": 0, "failed": 0}
+_stage_totals = {}  # stage -> [count, total ms]
+
+
+def _executor():
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=max(1, WORKERS), thread_name_prefix="render-queue")
+    return _pool
+
+
+def _active(job):
+    return job["status"] in ("queued", "running")
+
+
+def _prune(now):
+    # called with _lock held
+    for job_id in [job_id for job_id, job in _jobs.items()
+                   if not _active(job) and now - job["finished"] > JOB_TTL]:
+        del _jobs[job_id]
+
+
+def _record_stage(job, name, ms):
+    with _lock:
+        job["stages"][name] = round(ms, 1)
+        count_total = _stage_totals.setdefault(name, [0, 0.0])
+        count_total[0] += 1
+        count_total[1] += ms
+    metrics.observe("render_queue", ms / 1000, stage=name)
+
+
+def _run(job, fn, args):
+    started = time.perf_counter()
+    with _lock:
+        job["status"] = "running"
+    _record_stage(job, "wait", (started - job["submitted"]) * 1000)
+
+    @contextmanager
+    def stage(name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            _record_stage(job, name, (time.perf_counter() - start) * 1000)
+
+    try:
+        result = fn(stage, *args)
+    except Exception as e:
+        with _lock:
+            job.update(status="failed", error=f"{type(e).__name__}: {e}")
+            _counters["failed"] += 1
+    else:
+        with _lock:
+            job.update(status="done", result=result)
+            _counters["done"] += 1
+    finally:
+        with _lock:
+            job["finished"] = time.perf_counter()
+            job["stages"]["total"] = round((job["finished"] - job["submitted"]) * 1000, 1)
+
+
+def _depth():
+    with _lock:
+        return {(("state", state),): sum(job["status"] == state for job in _jobs.values())
+                for state in ("queued", "running")}
+
+
+metrics.gauge("corpuseum_render_queue_jobs", "Background render jobs by state.", _depth)
+
+
+# --- Public API ---
+def submit(owner, fn, *args):
+    """Queue `fn(stage, *args)` for `owner`; returns the job id, or None if the queue is full"""
+    now = time.perf_counter()
+    with _lock:
+        _prune(now)
+        active = [job for job in _jobs.values() if _active(job)]
+        if len(active) >= MAX_PENDING or sum(job["owner"] == owner for job in active) >= MAX_PER_OWNER:
+            _counters["rejected"] += 1
+            return None
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            "id": job_id,
+            "owner": owner,
+            "status": "queued",
+            "submitted": now,
+            "finished": None,
+            "stages": {},
+            "result": None,
+            "error": None,
+        }
+        _jobs[job_id] = job
+        _counters["submitted"] += 1
+        _executor().submit(_run, job, fn, args)
+    return job_id
+
+
+def status(job_id):
+    """Snapshot of a job (status, stages, result, error), or None if unknown / expired"""
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return None
+        return dict(job, stages=dict(job["stages"]))
+
+
+def position(job_id):
+    """How many jobs were submitted before this one and are still waiting (0 = next / running)"""
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is None or job["status"] != "queued":
+            return 0
+        return sum(1 for other in _jobs.values()
+                   if other["status"] == "queued" and other["submitted"] < job["submitted"])
+
+
+def forget(job_id):
+    """Drop a finished job once its result has been shown"""
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is not None and not _active(job):
+            del _jobs[job_id]
+
+
+def stats():
+    """Queue depth, job counters and mean ms per stage"""
+    with _lock:
+        return {
+            "queued": sum(job["status"] == "queued" for job in _jobs.values()),
+            "running": sum(job["status"] == "running" for job in _jobs.values()),
+            **_counters,
+            "stage_ms": {name: round(total / count, 1) for name, (count, total) in _stage_totals.items()},
+        }
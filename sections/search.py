@@ -0,0 +1,140 @@
+import re
+import sys
+import time
+import random
+import itertools
+import tempfile
+import unicodedata
+
+# Text normalization for the full-text search index (the FTS5 table lives in
+# post_store). Documents and queries go through the same normalize() so that
+# spellings that render alike match each other:
+#   - NFC, so decomposed vowel signs (e.g. ె + ౖ) compare equal to the composed one
+#   - zero-width joiners / non-joiners and other invisible format characters dropped
+#   - the nukta dropped, candrabindu variants folded onto the anusvara
+#   - e / o vowel signs written with a separate length mark folded onto the long sign
+#   - Telugu digits folded to ASCII, everything casefolded
+# tokens() then splits on anything that isn't a letter, digit or Indic sign.
+# SQLite's own unicode61 tokenizer treats Telugu vowel signs as separators, so
+# the index stores pre-tokenized, space-joined text under the "ascii" tokenizer.
+
+# Shortest last term that is also matched as a prefix (post_store keeps prefix indexes from 2 characters)
+MIN_PREFIX = 2
+
+_INVISIBLE = dict.fromkeys(map(ord, "\u200b\u200c\u200d\u2060\ufeff\u00ad"))  # ZWSP, ZWNJ, ZWJ, WJ, BOM, soft hyphen
+_FOLD = str.maketrans({
+    "\u0c3c": None,  # nukta
+    "\u0c00": "\u0c02",  # combining candrabindu above -> anusvara
+    "\u0c01": "\u0c02",  # candrabindu -> anusvara
+    "\u0c04": "\u0c02",  # combining anusvara above -> anusvara
+    **{chr(0x0c66 + d): str(d) for d in range(10)},  # Telugu digits
+})
+_VOWEL_SIGNS = (
+    ("\u0c46\u0c55", "\u0c47"),  # e sign + length mark -> ee sign
+    ("\u0c4a\u0c55", "\u0c4b"),  # o sign + length mark -> oo sign
+)
+# letters, digits and the Indic blocks (minus the danda punctuation)
+_TOKEN = re.compile("[\\w\u0900-\u0963\u0966-\u0dff]+")
+
+
+def normalize(text):
+    """`text` with the spelling variants above folded away"""
+    text = unicodedata.normalize("NFC", text or "").translate(_INVISIBLE).translate(_FOLD)
+    for variant, canonical in _VOWEL_SIGNS:
+        text = text.replace(variant, canonical)
+    return text.casefold()
+
+
+def tokens(text):
+    """Normalized search tokens of `text`"""
+    return _TOKEN.findall(normalize(text).replace("_", " "))
+
+
+def index_text(*parts):
+    """The indexed form of some text fields: their tokens joined by spaces"""
+    return " ".join(token for part in parts if part for token in tokens(str(part)))
+
+
+def match_expression(query, prefix=True):
+    """FTS5 MATCH expression for a search box query, None if empty.
+
+    Every term must match; with `prefix` the last one also matches as a prefix
+    (search as you type) once it is at least MIN_PREFIX characters long.
+    """
+    terms = tokens(query)
+    if not terms:
+        return None
+    # tokens never contain quotes, so quoting them is enough to escape FTS syntax
+    quoted = [f'"{term}"' for term in terms]
+    if prefix and len(terms[-1]) >= MIN_PREFIX:
+        quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+# --- Benchmark ---
+_BENCH_WORDS = (
+    "సామెత", "కథ", "మీమ్", "అమ్మ", "నాన్న", "పరీక్ష", "ఆఫీసు", "పండుగ", "సినిమా", "బిర్యానీ",
+    "వర్షం", "ఊరు", "పల్లె", "చదువు", "స్నేహం", "ప్రేమ", "డబ్బు", "కాలం", "నీరు", "అన్నం",
+    "monday", "office", "exam", "reel", "cricket", "traffic", "hyderabad", "vizag", "chai", "weekend",
+)
+_BENCH_SUFFIXES = ("కు", "ని", "తో", "లో", "లు", "గారు", "s", "ing")
+
+
+def _bench_vocabulary(rng, rare_words):
+    # the common words, a few inflected forms of each (what prefix search expands to)
+    # and a long tail of rarer made-up words built from Telugu syllables
+    consonants = "కగచజటడతదనపబమయరలవసహ"
+    vowel_signs = ("", "\u0c3e", "\u0c3f", "\u0c40", "\u0c41", "\u0c42", "\u0c46", "\u0c47", "\u0c4a", "\u0c4b")
+    syllables = [c + v for c in consonants for v in vowel_signs]
+    inflected = [word + suffix for word in _BENCH_WORDS for suffix in _BENCH_SUFFIXES]
+    rare = {"".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(rare_words)}
+    return list(_BENCH_WORDS), inflected + sorted(rare)
+
+
+def benchmark(documents=1_000_000, queries=200, seed=7):
+    """Build a post store with `documents` synthetic posts and time ranked searches"""
+    from . import post_store
+
+    rng = random.Random(seed)
+    common, tail = _bench_vocabulary(rng, 20_000)
+    vocabulary = common + tail
+    cum_weights = list(itertools.accumulate([50] * len(common) + [1] * len(tail)))
+
+    def sentence(n):
+        return " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=n))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        post_store.DB_FILE = f"{tmp}/bench.db"
+        conn = post_store.get_connection()
+        start = time.perf_counter()
+        conn.execute("BEGIN")
+        for n in range(documents):
+            post_store._insert_post(conn, "bench", {
+                "id": str(n), "caption": sentence(4), "description": sentence(25),
+                "comments": [{"user": "u", "text": sentence(6)}] if n % 3 == 0 else [],
+            })
+        conn.execute("COMMIT")
+        print(f"indexed {documents:,} posts in {time.perf_counter() - start:.1f}s")
+
+        for label, make_query in (
+            ("common word       ", lambda: rng.choice(_BENCH_WORDS)),
+            ("rare word         ", lambda: rng.choice(tail)),
+            ("two common words  ", lambda: " ".join(rng.sample(_BENCH_WORDS, 2))),
+            ("common + rare     ", lambda: f"{rng.choice(_BENCH_WORDS)} {rng.choice(vocabulary)}"),
+            ("prefix (3 letters)", lambda: rng.choice(_BENCH_WORDS)[:3]),
+        ):
+            timings = []
+            for _ in range(queries):
+                query = make_query()
+                post_store._written()  # no cached plans / results: every query is planned and run
+                t = time.perf_counter()
+                post_store._search("bench", query, None, False, 10, 0)
+                timings.append((time.perf_counter() - t) * 1000)
+            timings.sort()
+            print(f"{label} top-10: median {timings[len(timings) // 2]:7.2f} ms   "
+                  f"p95 {timings[int(len(timings) * 0.95)]:7.2f} ms")
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark()
@@ -1,11 +1,12 @@
 import streamlit as st
 import uuid
 import os
-import json
 from PIL import Image
 import random
 import streamlit.components.v1 as components
 
+from . import durable, file_cache, ranking
+
 # Constants
 SECTION = "Stories Sharing"
 DATA_DIR = "posts"
@@ -30,23 +31,51 @@ def resolve_image_path(image_name):
 
 def load_posts(section=SECTION):
     path = os.path.join(DATA_DIR, section, "posts.json")
-    if not os.path.exists(path):
-        return []
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return file_cache.load_json(path, default=[])
+
+
+def _change_post(section, post_id, change, new_post=None):
+    """Apply `change(post)` to one post of posts.json (or append `new_post`), safe across processes"""
+    path = os.path.join(DATA_DIR, section, "posts.json")
+    result = {}
+
+    def mutate(posts):
+        # signature of the file these posts were read from (mutate reruns if it changes before the commit)
+        result["previous"] = file_cache.file_signature(path)
+        for post in posts:
+            if post["id"] == post_id:
+                change(post)
+                result["post"] = post
+                return
+        if new_post is not None:
+            posts.append(new_post)
+            result["post"] = new_post
+
+    durable.update_json(path, mutate, default=[], ensure_ascii=False, indent=2)
+    if "post" in result:
+        ranking.update(path, result["post"], signature=file_cache.file_signature(path), previous=result["previous"])
+    return result.get("post")
 
 
 def save_post(section, new_post):
+    def replace(post):
+        post.clear()
+        post.update(new_post)
+
+    _change_post(section, new_post["id"], replace, new_post=new_post)
+
+
+def vote(post, delta):
+    _change_post(SECTION, post["id"], lambda p: p.update(upvotes=p["upvotes"] + delta))
+
+
+def top_posts(section=SECTION):
+    """Posts with the most upvotes first, read from the section's ranking index"""
     path = os.path.join(DATA_DIR, section, "posts.json")
-    posts = load_posts(section)
-    for i, post in enumerate(posts):
-        if post["id"] == new_post["id"]:
-            posts[i] = new_post
-            break
-    else:
-        posts.append(new_post)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(posts, f, ensure_ascii=False, indent=2)
+    signature = file_cache.file_signature(path)
+    if not ranking.is_current(path, signature):
+        ranking.build(path, load_posts(section), signature)
+    return ranking.top(path)
 
 
 def update_post(updated_post):
@@ -71,15 +100,13 @@ def display_post(post):
     cols = st.columns([1, 5, 1])
     with cols[0]:
         if st.button("👍", key=f"up_{post['id']}"):
-            post["upvotes"] += 1
-            update_post(post)
+            vote(post, 1)
             st.rerun()
     with cols[1]:
         st.write(f"**{post['upvotes']} Likes**")
     with cols[2]:
         if st.button("👎", key=f"down_{post['id']}"):
-            post["upvotes"] -= 1
-            update_post(post)
+            vote(post, -1)
             st.rerun()
 
     with st.expander("💬 Comments"):
@@ -109,10 +136,8 @@ def display_post(post):
     with col2:
         if st.button("Post", key=submit_key):
             if text.strip():
-                post["comments"].append(
-                    {"user": post["author"], "text": text.strip(), "reply": ""}
-                )
-                update_post(post)
+                comment = {"user": post["author"], "text": text.strip(), "reply": ""}
+                _change_post(SECTION, post["id"], lambda p: p["comments"].append(comment))
                 st.session_state[clear_flag_key] = True
                 st.rerun()
 
@@ -309,9 +334,16 @@ def my_stories_view():
                 st.success("✅ Post deleted successfully.")
                 st.rerun()
 def delete_post(post_id, section):
-    posts = load_posts(section)
-    posts = [p for p in posts if p["id"] != post_id]
-    save_post(section, posts)
+    path = os.path.join(DATA_DIR, section, "posts.json")
+
+    read = {}
+
+    def mutate(posts):
+        read["previous"] = file_cache.file_signature(path)
+        posts[:] = [p for p in posts if p["id"] != post_id]
+
+    durable.update_json(path, mutate, default=[], ensure_ascii=False, indent=2)
+    ranking.remove(path, post_id, signature=file_cache.file_signature(path), previous=read["previous"])
 
 
 # Main App
@@ -353,8 +385,7 @@ def stories_sharing_app():
     tab1, tab2, tab3 = st.tabs(["📰 All Stories", "✍️ Write Story", "📂 My Stories"])
 
     with tab1:
-        posts = load_posts(SECTION)
-        posts.sort(key=lambda x: x["upvotes"], reverse=True)
+        posts = top_posts(SECTION)
         if not posts:
             st.info("No stories yet. Be the first to post!")
         else:
@@ -1,80 +1,167 @@
 import streamlit as st
 import streamlit.components.v1 as components
-import json
 import os
-import base64
 import random
 from datetime import datetime
 
+from . import cards, media, metrics, pagination, post_store, stylesheets
+
 # Configuration
 
+SECTION = "Stories Sharing"
 BASE_DIR = os.path.dirname(__file__)
 POSTS_FILE = os.path.join(BASE_DIR,".." ,"posts","Stories Sharing","posts.json")
 # Initialize session state
 if "posts" not in st.session_state:
     st.session_state.posts = []
 
-def get_base64_of_file(path):
-    """Convert image file to base64 string"""
-    try:
-        with open(path, "rb") as img_file:
-            return base64.b64encode(img_file.read()).decode()
-    except:
-        # Return a default placeholder image base64
-        return "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
-def load_posts():
-    """Load posts from JSON file"""
-    try:
-        with open(POSTS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return []
-
-def save_posts(posts):
-    """Save posts to JSON file"""
-    with open(POSTS_FILE, "w", encoding="utf-8") as f:
-        json.dump(posts, f, indent=2, ensure_ascii=False)
-
-def update_post(updated_post):
-    """Update a specific post"""
-    posts = load_posts()
-    for i, post in enumerate(posts):
-        if post["id"] == updated_post["id"]:
-            posts[i] = updated_post
-            break
-    save_posts(posts)
+# Stories live in the SQLite post store; posts.json only seeds it once
+post_store.seed_from_json(SECTION, POSTS_FILE)
 
-def delete_post(post_id):
-    """Delete a post by ID"""
-    posts = load_posts()
-    posts = [p for p in posts if p["id"] != post_id]
-    save_posts(posts)
+# 1x1 transparent PNG used when a story image is missing
+PLACEHOLDER_IMAGE = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
 
-def display_post(post):
-    """Display a single post with read-more functionality"""
-    expanded_key = f"expanded_{post['id']}"
-    if expanded_key not in st.session_state:
-        st.session_state[expanded_key] = False
+# Stylesheets (registered once per process, see sections/stylesheets.py)
+PAGE_STYLES = stylesheets.register("stories_page", """
+    <style>
+    .main .block-container {
+        position: relative;
+        border-radius: 12px;
+        padding: 20px;
+        background: url("https://cdn.pixabay.com/photo/2024/06/30/10/28/sky-8862862_640.png");
+        background-repeat: repeat-y;
+        background-size: 100% auto;
+        background-position: center top;
+    }
 
-    def toggle_story():
-        st.session_state[expanded_key] = not st.session_state[expanded_key]
+    .main .block-container::before {
+        content: "";
+        position: absolute;
+        top: 0;
+        bottom: 0;
+        left: 0; 
+        right: 0;
+        background: rgba(0,0,0,0.4);
+        z-index: -1;
+    }
 
-    # Load image base64
-    image_path = os.path.join("image", post.get('image', 'default.jpg'))
-    image_b64 = get_base64_of_file(image_path)
+    .stTabs [data-baseweb="tab-list"] {
+        display: flex;
+        justify-content: space-around;
+        border-radius: 12px;
+        overflow: hidden;
+        background-color: #f0f2f6;
+        padding: 5px;
+    }
 
-    preview_limit = 250
-    full_text = post["description"]
-    is_long = len(full_text) > preview_limit
+    .stTabs [data-baseweb="tab"] {
+        font-size: 18px;
+        font-weight: 600;
+        color: black;
+        border-radius: 16px;
+        padding: 12px 24px;
+        margin: 4px;
+        transition: all 0.3s ease-in-out;
+    }
 
-    # Text to display depends on toggle state
-    if is_long and not st.session_state[expanded_key]:
-        displayed_text = full_text[:preview_limit] + "..."
-    else:
-        displayed_text = full_text
+    .stTabs [aria-selected="true"] {
+        background-color: #0066cc;
+        color: white;
+    }
+
+    div[data-baseweb="base-input"] > input {
+        background-color: black !important;
+        color: white !important;
+        border: 1px solid #444 !important;
+        padding: 8px 12px !important;
+        border-radius: 5px !important;
+    }
+
+    div[data-baseweb="base-input"] > input::placeholder {
+        color: #bbb !important;
+    }
+
+     h2, h3, h4, h5, h6 {
+        color: white;
+        font-weight: 600;
+        text-shadow: 0px 2px 6px rgba(0,0,0,0.4);
+        background: linear-gradient(135deg, rgba(30, 60, 114, 0.85), rgba(42, 82, 152, 0.85));
+        border-radius: 20px;
+        padding: 12px 18px;
+        box-shadow: 0 4px 20px rgba(0,0,0,0.3);
+        max-width: 90%;
+        margin: 8px auto; 
+    }
+h1 {
+    font-weight: 800;
+    letter-spacing: 0.5px;
+    text-align: center;
+
+    /* Solid gradient background (full opacity) */
+    background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
+    border-radius: 20px;
+    padding: 16px 26px;
+    max-width: 90%;
+    margin: 12px auto;
+
+    /* Bright white text with strong outline */
+    color: #fff !important;
+    text-shadow: 
+        2px 2px 6px rgba(0,0,0,0.8), 
+        -1px -1px 4px rgba(0,0,0,0.8);
 
-    # --- CSS styling ---
-    st.markdown("""
+    /* Drop shadow around the title block */
+    box-shadow: 0 8px 25px rgba(0,0,0,0.5);
+    
+    /* Smooth animation */
+    transition: transform 0.25s ease, box-shadow 0.25s ease;
+}
+h1:hover {
+    transform: scale(1.03);
+    box-shadow: 0 10px 30px rgba(0,0,0,0.6);
+}
+
+
+    div[data-testid="stExpander"] {
+        background-color: transparent !important;
+        color: white !important;
+        border: none !important;
+        box-shadow: none !important;
+    }
+
+    div[data-testid="stExpander"] summary,
+    div[data-testid="stExpander"] summary * {
+        color: white !important;
+        background-color: transparent !important;
+    }
+
+    div[data-testid="stExpander"] details summary span div p {
+        color: white !important;
+        background-color: transparent !important;
+    }
+
+    div[data-testid="stExpander"] div[data-testid="stExpanderDetails"] {
+        background-color: transparent !important;
+        color: white !important;
+    }
+
+    div[data-testid="stExpanderDetails"] > div > div > div > div > div {
+        border-bottom: 1px solid rgba(255, 255, 255, 0.5);
+        padding-bottom: 8px;
+        margin-bottom: 8px;
+        color: white !important;
+        background-color: transparent !important;
+    }
+
+    div[data-testid="stExpanderDetails"] div[style*="border-left: 2px dashed"] {
+        background-color: transparent !important;
+        color: white !important;
+        border-color: rgba(255, 255, 255, 0.5) !important;
+    }
+    </style>
+""")
+# Feed story card
+STORY_CARD_STYLES = stylesheets.register("story_card", """
     <style>
     .story-card {
         display: flex;
@@ -115,12 +202,103 @@ def display_post(post):
         flex-grow: 1;
     }
     </style>
-    """, unsafe_allow_html=True)
+""")
+# "My Stories" card
+MY_STORY_CARD_STYLES = stylesheets.register("my_story_card", """
+        <style>
+        .my-story-card {
+            display: flex;
+            background: rgba(0,0,0,0.5);
+            border-radius: 12px;
+            overflow: hidden;
+            backdrop-filter: blur(6px);
+            box-shadow: 0 4px 20px rgba(0,0,0,0.4);
+            margin-bottom: 20px;
+            width: 100%;
+        }
+        .my-story-img {
+            width: 250px;
+            object-fit: cover;
+            border-radius: 12px 0 0 12px;
+            height: 250px; 
+        }
+        .my-story-content {
+            padding: 16px;
+            flex: 1;
+            display: flex;
+            flex-direction: column;
+        }
+        .my-story-title {
+            background: linear-gradient(135deg, #a18cd1, #fbc2eb);
+            color: white;
+            padding: 8px 12px;
+            border-radius: 8px;
+            font-size: 1.5rem;
+            margin-bottom: 10px;
+            font-weight: bold;
+        }
+        .my-story-text {
+            color: white;
+            font-size: 1rem;
+            line-height: 1.5;
+            white-space: pre-wrap;
+            flex-grow: 1;
+        }
+        </style>
+""")
+
+
+def get_image_src(path):
+    """Image URL (or data URI, depending on media.MEDIA_MODE) for a story image"""
+    try:
+        return media.image_url(path)
+    except OSError:
+        return PLACEHOLDER_IMAGE
+def load_posts(author=None, limit=None, offset=0):
+    """Load posts (or one page of them) from the post store, newest first"""
+    return post_store.list_posts(SECTION, author=author, order="recent", limit=limit, offset=offset)
+
+def change_upvotes(post_id, delta):
+    """Add or remove an upvote on a post"""
+    post_store.change_upvotes(SECTION, post_id, delta)
+
+def add_comment(post_id, comment):
+    """Append a comment to a post"""
+    post_store.add_comment(SECTION, post_id, comment)
+
+def delete_post(post_id):
+    """Delete a post by ID"""
+    post_store.delete_post(SECTION, post_id)
+
+@st.fragment
+def display_post(post):
+    """Display a single post with read-more functionality (a fragment: see sections/cards.py)"""
+    post = cards.current(SECTION, post)
+    expanded_key = f"expanded_{post['id']}"
+    if expanded_key not in st.session_state:
+        st.session_state[expanded_key] = False
+
+    def toggle_story():
+        st.session_state[expanded_key] = not st.session_state[expanded_key]
+
+    # Image source (cached per file)
+    image_path = os.path.join("image", post.get('image', 'default.jpg'))
+    image_src = get_image_src(image_path)
+
+    preview_limit = 250
+    full_text = post["description"]
+    is_long = len(full_text) > preview_limit
+
+    # Text to display depends on toggle state
+    if is_long and not st.session_state[expanded_key]:
+        displayed_text = full_text[:preview_limit] + "..."
+    else:
+        displayed_text = full_text
 
     # --- HTML card ---
     card_html = f"""
     <div class="story-card">
-        <img src="data:image/jpg;base64,{image_b64}" alt="Story Image" class="story-img" />
+        <img src="{image_src}" alt="Story Image" class="story-img" />
         <div class="story-content">
             <div class="story-title">{post["caption"]}</div>
             <div class="story-text">{displayed_text}</div>
@@ -136,12 +314,11 @@ def display_post(post):
             btn_label = "Read less" if st.session_state[expanded_key] else "Read more"
             if st.button(btn_label, key=f"readmore_{post['id']}"):
                 toggle_story()
-                st.rerun()
+                cards.rerun()
     with cols[3]:
         if st.button("👍", key=f"up_{post['id']}"):
-            post["upvotes"] += 1
-            update_post(post)
-            st.rerun()
+            change_upvotes(post["id"], 1)
+            cards.refresh(SECTION, post["id"])
     with cols[4]:
         st.markdown(f"""
         <div style="padding-top: 10px; padding-bottom: 10px;">
@@ -151,9 +328,8 @@ def display_post(post):
 
     with cols[5]:
         if st.button("👎", key=f"down_{post['id']}"):
-            post["upvotes"] = max(0, post.get("upvotes", 0) - 1)
-            update_post(post)
-            st.rerun()
+            change_upvotes(post["id"], -1)
+            cards.refresh(SECTION, post["id"])
 
     # --- Comments ---
     with st.expander("💬 Comments"):
@@ -181,14 +357,9 @@ def display_post(post):
     with col2:
         if st.button("Post", key=submit_key):
             if text.strip():
-                if "comments" not in post:
-                    post["comments"] = []
-                post["comments"].append(
-                    {"user": "Anonymous", "text": text.strip(), "reply": ""}
-                )
-                update_post(post)
+                add_comment(post["id"], {"user": "Anonymous", "text": text.strip(), "reply": ""})
                 st.session_state[clear_flag_key] = True
-                st.rerun()
+                cards.refresh(SECTION, post["id"])
 
     st.markdown("<hr style='border-color: rgba(255,255,255,0.3);'>", unsafe_allow_html=True)
 
@@ -196,13 +367,15 @@ def display_my_stories():
     """Display user's own stories with edit/delete functionality"""
     st.subheader("📂 My Stories")
 
-    posts = load_posts()
-    my_posts = [p for p in posts if p.get("author") == "You"]
+    my_posts = load_posts(author="You")
 
     if not my_posts:
         st.info("You haven't written any stories yet.")
         return
-    
+
+    # Same styling as regular posts (sent once, not once per card)
+    stylesheets.inject(MY_STORY_CARD_STYLES)
+
     for post in my_posts:
         expanded_key = f"my_expanded_{post['id']}"
         if expanded_key not in st.session_state:
@@ -210,7 +383,7 @@ def display_my_stories():
 
         # Load image
         image_path = os.path.join("image", post.get('image', 'default.jpg'))
-        image_b64 = get_base64_of_file(image_path)
+        image_src = get_image_src(image_path)
 
         preview_limit = 250
         full_text = post["description"]
@@ -221,54 +394,10 @@ def display_my_stories():
         else:
             displayed_text = full_text
 
-        # Same styling as regular posts
-        st.markdown("""
-        <style>
-        .my-story-card {
-            display: flex;
-            background: rgba(0,0,0,0.5);
-            border-radius: 12px;
-            overflow: hidden;
-            backdrop-filter: blur(6px);
-            box-shadow: 0 4px 20px rgba(0,0,0,0.4);
-            margin-bottom: 20px;
-            width: 100%;
-        }
-        .my-story-img {
-            width: 250px;
-            object-fit: cover;
-            border-radius: 12px 0 0 12px;
-            height: 250px; 
-        }
-        .my-story-content {
-            padding: 16px;
-            flex: 1;
-            display: flex;
-            flex-direction: column;
-        }
-        .my-story-title {
-            background: linear-gradient(135deg, #a18cd1, #fbc2eb);
-            color: white;
-            padding: 8px 12px;
-            border-radius: 8px;
-            font-size: 1.5rem;
-            margin-bottom: 10px;
-            font-weight: bold;
-        }
-        .my-story-text {
-            color: white;
-            font-size: 1rem;
-            line-height: 1.5;
-            white-space: pre-wrap;
-            flex-grow: 1;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-
         # Card HTML
         card_html = f"""
         <div class="my-story-card">
-            <img src="data:image/jpg;base64,{image_b64}" alt="Story Image" class="my-story-img" />
+            <img src="{image_src}" alt="Story Image" class="my-story-img" />
             <div class="my-story-content">
                 <div class="my-story-title">📖 {post["caption"]}</div>
                 <div class="my-story-text">{displayed_text}</div>
@@ -311,10 +440,8 @@ def create_new_story():
         
         if submit_button:
             if caption and description:
-                posts = load_posts()
-                
                 # Generate new post ID
-                new_id = max([p.get("id", 0) for p in posts], default=0) + 1
+                new_id = post_store.allocate_id(SECTION)
                 
                 # Handle image upload
                 image_filename = "default.jpg"
@@ -325,8 +452,8 @@ def create_new_story():
                     # Save uploaded file
                     image_filename = f"story_{new_id}_{uploaded_file.name}"
                     image_path = os.path.join("image", image_filename)
-                    with open(image_path, "wb") as f:
-                        f.write(uploaded_file.getbuffer())
+                    with metrics.timer("storage", op="save_upload") as span, open(image_path, "wb") as f:
+                        span["bytes"] = f.write(uploaded_file.getbuffer())
                 
                 # Create new post
                 new_post = {
@@ -340,8 +467,7 @@ def create_new_story():
                     "timestamp": datetime.now().isoformat()
                 }
                 
-                posts.append(new_post)
-                save_posts(posts, )
+                post_store.add_post(SECTION, new_post)
                 
                 st.success("✅ Story shared successfully!")
                 st.rerun()
@@ -504,144 +630,7 @@ def main():
 
 
     # Global CSS styling
-    st.markdown("""
-    <style>
-    .main .block-container {
-        position: relative;
-        border-radius: 12px;
-        padding: 20px;
-        background: url("https://cdn.pixabay.com/photo/2024/06/30/10/28/sky-8862862_640.png");
-        background-repeat: repeat-y;
-        background-size: 100% auto;
-        background-position: center top;
-    }
-
-    .main .block-container::before {
-        content: "";
-        position: absolute;
-        top: 0;
-        bottom: 0;
-        left: 0; 
-        right: 0;
-        background: rgba(0,0,0,0.4);
-        z-index: -1;
-    }
-
-    .stTabs [data-baseweb="tab-list"] {
-        display: flex;
-        justify-content: space-around;
-        border-radius: 12px;
-        overflow: hidden;
-        background-color: #f0f2f6;
-        padding: 5px;
-    }
-
-    .stTabs [data-baseweb="tab"] {
-        font-size: 18px;
-        font-weight: 600;
-        color: black;
-        border-radius: 16px;
-        padding: 12px 24px;
-        margin: 4px;
-        transition: all 0.3s ease-in-out;
-    }
-
-    .stTabs [aria-selected="true"] {
-        background-color: #0066cc;
-        color: white;
-    }
-
-    div[data-baseweb="base-input"] > input {
-        background-color: black !important;
-        color: white !important;
-        border: 1px solid #444 !important;
-        padding: 8px 12px !important;
-        border-radius: 5px !important;
-    }
-
-    div[data-baseweb="base-input"] > input::placeholder {
-        color: #bbb !important;
-    }
-
-     h2, h3, h4, h5, h6 {
-        color: white;
-        font-weight: 600;
-        text-shadow: 0px 2px 6px rgba(0,0,0,0.4);
-        background: linear-gradient(135deg, rgba(30, 60, 114, 0.85), rgba(42, 82, 152, 0.85));
-        border-radius: 20px;
-        padding: 12px 18px;
-        box-shadow: 0 4px 20px rgba(0,0,0,0.3);
-        max-width: 90%;
-        margin: 8px auto; 
-    }
-h1 {
-    font-weight: 800;
-    letter-spacing: 0.5px;
-    text-align: center;
-
-    /* Solid gradient background (full opacity) */
-    background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-    border-radius: 20px;
-    padding: 16px 26px;
-    max-width: 90%;
-    margin: 12px auto;
-
-    /* Bright white text with strong outline */
-    color: #fff !important;
-    text-shadow: 
-        2px 2px 6px rgba(0,0,0,0.8), 
-        -1px -1px 4px rgba(0,0,0,0.8);
-
-    /* Drop shadow around the title block */
-    box-shadow: 0 8px 25px rgba(0,0,0,0.5);
-    
-    /* Smooth animation */
-    transition: transform 0.25s ease, box-shadow 0.25s ease;
-}
-h1:hover {
-    transform: scale(1.03);
-    box-shadow: 0 10px 30px rgba(0,0,0,0.6);
-}
-
-
-    div[data-testid="stExpander"] {
-        background-color: transparent !important;
-        color: white !important;
-        border: none !important;
-        box-shadow: none !important;
-    }
-
-    div[data-testid="stExpander"] summary,
-    div[data-testid="stExpander"] summary * {
-        color: white !important;
-        background-color: transparent !important;
-    }
-
-    div[data-testid="stExpander"] details summary span div p {
-        color: white !important;
-        background-color: transparent !important;
-    }
-
-    div[data-testid="stExpander"] div[data-testid="stExpanderDetails"] {
-        background-color: transparent !important;
-        color: white !important;
-    }
-
-    div[data-testid="stExpanderDetails"] > div > div > div > div > div {
-        border-bottom: 1px solid rgba(255, 255, 255, 0.5);
-        padding-bottom: 8px;
-        margin-bottom: 8px;
-        color: white !important;
-        background-color: transparent !important;
-    }
-
-    div[data-testid="stExpanderDetails"] div[style*="border-left: 2px dashed"] {
-        background-color: transparent !important;
-        color: white !important;
-        border-color: rgba(255, 255, 255, 0.5) !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    stylesheets.inject(PAGE_STYLES)
 
     # App title
     # st.title("📖 Stories Sharing Platform")
@@ -652,10 +641,22 @@ h1:hover {
 
     with tab1:
         st.subheader("🌟 Discover Stories")
-        posts = load_posts()
-        if posts:
-            for post in reversed(posts):  # Show newest first
+        query = pagination.search_box("stories_feed", "🔍 Search stories")
+        total = post_store.count_matches(SECTION, query) if query else post_store.count_posts(SECTION)
+        if total:
+            offset, limit = pagination.page_window("stories_feed", total)
+            if query:
+                posts = post_store.search_posts(SECTION, query, limit=limit, offset=offset)  # Best match first
+            else:
+                posts = load_posts(limit=limit, offset=offset)  # Newest first
+            # card CSS goes out with the page, once, and outside the card fragments so card reruns keep it
+            stylesheets.inject(STORY_CARD_STYLES)
+            cards.begin_feed(SECTION)
+            for post in posts:
                 display_post(post)
+            pagination.page_controls("stories_feed", total)
+        elif query:
+            st.info(f"No stories match “{query}”.")
         else:
             st.info("No stories shared yet. Be the first to share your story!")
 
@@ -666,5 +667,11 @@ h1:hover {
         display_my_stories()
 
 
+def warmup():
+    """Prime the first feed page and its image URLs (called by sections.registry at startup)"""
+    for post in load_posts(limit=pagination.PAGE_SIZE):
+        get_image_src(os.path.join("image", post.get('image', 'default.jpg')))
+
+
 def stories_sharing_app():
     main()
\ No newline at end of file
@@ -0,0 +1,119 @@
+import re
+import sys
+import threading
+
+import streamlit as st
+
+# Stylesheets used by the pages, registered once per process (at module import)
+# and minified then. inject() emits each sheet at most once per page render,
+# merged into a single <style> block, so a feed no longer re-sends the same CSS
+# with every card. A render starts with begin_render(); outside one (a section
+# run on its own) inject() simply emits every time.
+
+_RENDER_KEY = "_stylesheets_render"
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_STRING = re.compile(r"""("(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')""")
+_SPACE = re.compile(r"\s+")
+_PUNCT_SPACE = re.compile(r"\s*([{};,>])\s*")
+_STYLE_TAG = re.compile(r"</?style>", re.I)
+
+_lock = threading.Lock()
+_sheets = {}  # name -> {"raw", "css", "raw_bytes"}
+_pages = {}  # page -> {"blocks", "bytes"} sent by its last render
+
+
+# --- Minify ---
+def minify(css):
+    """Strip comments / <style> tags and collapse whitespace; quoted strings are kept verbatim"""
+    css = _STYLE_TAG.sub("", _COMMENT.sub("", css))
+    parts = _STRING.split(css)
+    for i in range(0, len(parts), 2):  # odd parts are the quoted strings
+        parts[i] = _PUNCT_SPACE.sub(r"\1", _SPACE.sub(" ", parts[i])).replace(";}", "}")
+    return "".join(parts).strip()
+
+
+# --- Registry ---
+def register(name, *css):
+    """Register stylesheet `name` (several parts are merged in order); returns `name`"""
+    raw = "\n".join(css)
+    with _lock:
+        current = _sheets.get(name)
+        if current is not None and current["raw"] == raw:
+            return name
+    sheet = {"raw": raw, "css": minify(raw), "raw_bytes": len(raw.encode())}
+    with _lock:
+        _sheets[name] = sheet
+    return name
+
+
+def css(*names):
+    """Minified CSS of the given sheets, merged in order"""
+    with _lock:
+        return "".join(_sheets[name]["css"] for name in names)
+
+
+# --- Page renders ---
+def begin_render(page):
+    """Start a render of `page`: every sheet is emitted again (once) after this"""
+    st.session_state[_RENDER_KEY] = {"page": page, "sent": set(), "blocks": 0, "bytes": 0}
+
+
+def inject(*names):
+    """Emit the sheets not yet sent in this render, as one <style> block"""
+    render = st.session_state.get(_RENDER_KEY)
+    sent = render["sent"] if render is not None else set()
+    pending = [name for name in dict.fromkeys(names) if name not in sent]
+    if not pending:
+        return
+    merged = css(*pending)
+    st.markdown(f"<style>{merged}</style>", unsafe_allow_html=True)
+    if render is None:
+        return
+    sent.update(pending)
+    render["blocks"] += 1
+    render["bytes"] += len(merged.encode())
+    with _lock:
+        _pages[render["page"]] = {"blocks": render["blocks"], "bytes": render["bytes"]}
+
+
+def stats():
+    """Raw vs. minified size of each sheet, and the CSS bytes sent by the last render of each page"""
+    with _lock:
+        return {
+            "sheets": {
+                name: {"raw_bytes": sheet["raw_bytes"], "minified_bytes": len(sheet["css"].encode())}
+                for name, sheet in _sheets.items()
+            },
+            "pages": {page: dict(values) for page, values in _pages.items()},
+        }
+
+
+# --- Measurement ---
+def _measure_page():
+    import main
+    main.run()
+
+
+def measure():
+    """Render every section through main.run() and print the CSS / markdown payload of each page"""
+    from streamlit.testing.v1 import AppTest
+    from sections import registry, stylesheets  # the imported module, not __main__
+
+    style_block = re.compile(r"<style>.*?</style>", re.S)
+    for page in registry.SECTIONS:
+        at = AppTest.from_function(_measure_page, default_timeout=120)
+        at.session_state["username"] = "measure"
+        at.session_state["selected_section"] = page
+        at.run()
+        markdown = [m.value for m in at.markdown]
+        blocks = [block for value in markdown for block in style_block.findall(value)]
+        print(f"{page:20s} {len(blocks):3d} <style> blocks, {sum(len(b.encode()) for b in blocks):8,d} CSS bytes, "
+              f"{sum(len(m.encode()) for m in markdown):10,d} markdown bytes")
+    for name, sizes in sorted(stylesheets.stats()["sheets"].items()):
+        print(f"  {name:20s} {sizes['raw_bytes']:7,d} -> {sizes['minified_bytes']:7,d} bytes")
+
+
+if __name__ == "__main__":
+    if "--measure" in sys.argv:
+        measure()
@@ -0,0 +1,231 @@
+import os
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from PIL import Image
+
+from . import file_cache, metrics
+
+# --- Constants ---
+BASE_DIR = os.path.dirname(__file__)
+CACHE_DIR = os.environ.get(
+    "CORPUSEUM_THUMB_DIR", os.path.join(BASE_DIR, "..", ".cache", "thumbnails")
+)
+DISK_CACHE_MAX_BYTES = int(os.environ.get("CORPUSEUM_THUMB_DISK_MB", "256")) * 1024 * 1024
+MEMORY_CACHE_MAX_BYTES = int(os.environ.get("CORPUSEUM_THUMB_MEMORY_MB", "64")) * 1024 * 1024
+
+MIME_TYPES = {"PNG": "image/png", "JPEG": "image/jpeg", "WEBP": "image/webp"}
+EXTENSIONS = {"PNG": "png", "JPEG": "jpg", "WEBP": "webp"}
+
+_lock = threading.Lock()
+_memory = OrderedDict()  # key -> bytes, least recently used first
+_memory_bytes = 0
+_disk_bytes = None  # computed lazily from the cache directory
+_counters = {"memory_hits": 0, "disk_hits": 0, "renders": 0, "evictions": 0}
+
+
+# --- Rendering ---
+def render_thumbnail(img, target_size=(400, 400), fmt="PNG"):
+    """Fit `img` inside a white square canvas of `target_size` and encode it"""
+    # Convert to RGB if necessary
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    # Create a square canvas with white background
+    canvas = Image.new('RGB', target_size, 'white')
+
+    # Calculate scaling to fit image in square while maintaining aspect ratio
+    img_ratio = img.width / img.height
+    target_ratio = target_size[0] / target_size[1]
+
+    if img_ratio > target_ratio:
+        # Image is wider, scale by width
+        new_width = target_size[0]
+        new_height = int(target_size[0] / img_ratio)
+    else:
+        # Image is taller, scale by height
+        new_height = target_size[1]
+        new_width = int(target_size[1] * img_ratio)
+
+    # Resize image
+    img_resized = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+
+    # Center the image on the canvas
+    x_offset = (target_size[0] - new_width) // 2
+    y_offset = (target_size[1] - new_height) // 2
+    canvas.paste(img_resized, (x_offset, y_offset))
+
+    with metrics.timer("image", op="thumbnail", format=fmt) as span:
+        buffer = BytesIO()
+        canvas.save(buffer, format=fmt)
+        span["bytes"] = buffer.tell()
+    return buffer.getvalue()
+
+
+# --- Keys ---
+def _hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_hash(path):
+    """sha256 of a file's contents, recomputed only when the file changes on disk"""
+    return file_cache.load(path, _hash_file, key="sha256")
+
+
+def image_hash(pil_image):
+    """sha256 of an in-memory image's mode, size and pixels"""
+    digest = hashlib.sha256()
+    digest.update(f"{pil_image.mode}:{pil_image.size}".encode())
+    digest.update(pil_image.tobytes())
+    return digest.hexdigest()
+
+
+def _cache_key(source_hash, target_size, fmt):
+    return f"{source_hash}-{target_size[0]}x{target_size[1]}.{EXTENSIONS[fmt]}"
+
+
+# --- Memory LRU ---
+def _memory_get(key):
+    with _lock:
+        data = _memory.get(key)
+        if data is not None:
+            _memory.move_to_end(key)
+            _counters["memory_hits"] += 1
+        return data
+
+
+def _memory_put(key, data):
+    global _memory_bytes
+    with _lock:
+        if key in _memory:
+            return
+        _memory[key] = data
+        _memory_bytes += len(data)
+        while _memory_bytes > MEMORY_CACHE_MAX_BYTES and len(_memory) > 1:
+            _, evicted = _memory.popitem(last=False)
+            _memory_bytes -= len(evicted)
+
+
+# --- Disk cache ---
+def _disk_get(key):
+    path = os.path.join(CACHE_DIR, key)
+    try:
+        with metrics.timer("storage", op="thumbnail_cache_read") as span:
+            with open(path, "rb") as f:
+                data = f.read()
+            span["bytes"] = len(data)
+    except OSError:
+        return None
+    try:
+        os.utime(path)  # mark as recently used for eviction
+    except OSError:
+        pass
+    with _lock:
+        _counters["disk_hits"] += 1
+    return data
+
+
+def _disk_put(key, data):
+    global _disk_bytes
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with metrics.timer("storage", op="thumbnail_cache_write") as span:
+            span["bytes"] = len(data)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, os.path.join(CACHE_DIR, key))
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+
+    with _lock:
+        if _disk_bytes is None:
+            _disk_bytes = _scan_disk_bytes()
+        else:
+            _disk_bytes += len(data)
+        over_cap = _disk_bytes > DISK_CACHE_MAX_BYTES
+    if over_cap:
+        evict_disk()
+
+
+def _scan_disk_bytes():
+    total = 0
+    for entry in os.scandir(CACHE_DIR):
+        if entry.is_file():
+            total += entry.stat().st_size
+    return total
+
+
+def evict_disk(max_bytes=None):
+    """Delete least recently used thumbnails until the directory is under 90% of the cap"""
+    global _disk_bytes
+    max_bytes = DISK_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    if not os.path.isdir(CACHE_DIR):
+        return
+    files = []
+    for entry in os.scandir(CACHE_DIR):
+        if entry.is_file() and not entry.name.endswith(".tmp"):
+            st = entry.stat()
+            files.append((st.st_mtime, st.st_size, entry.path))
+    total = sum(size for _, size, _ in files)
+    target = int(max_bytes * 0.9)
+    evicted = 0
+    for _, size, path in sorted(files):
+        if total <= target:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        evicted += 1
+    with _lock:
+        _disk_bytes = total
+        _counters["evictions"] += evicted
+
+
+# --- Public API ---
+def _get_or_render(key, render):
+    data = _memory_get(key)
+    if data is not None:
+        return data
+    data = _disk_get(key)
+    if data is None:
+        data = render()
+        with _lock:
+            _counters["renders"] += 1
+        _disk_put(key, data)
+    _memory_put(key, data)
+    return data
+
+
+def thumbnail_for_file(image_path, target_size=(400, 400), fmt="PNG"):
+    """Encoded thumbnail bytes for an image file, served from cache when possible"""
+    key = _cache_key(file_hash(image_path), target_size, fmt)
+
+    def render():
+        with Image.open(image_path) as img:
+            return render_thumbnail(img, target_size, fmt)
+
+    return _get_or_render(key, render)
+
+
+def thumbnail_for_image(pil_image, target_size=(400, 400), fmt="PNG"):
+    """Encoded thumbnail bytes for an in-memory PIL image"""
+    key = _cache_key(image_hash(pil_image), target_size, fmt)
+    return _get_or_render(key, lambda: render_thumbnail(pil_image, target_size, fmt))
+
+
+def stats():
+    """Cache counters plus current memory / disk usage"""
+    with _lock:
+        return dict(_counters, memory_bytes=_memory_bytes, memory_entries=len(_memory), disk_bytes=_disk_bytes)
@@ -2,6 +2,8 @@
 import json
 import os
 
+from . import durable
+
 DATA_FILE = "data/memes.json"
 
 def load_memes():
@@ -12,6 +14,5 @@ def load_memes():
 
 def save_memes(memes):
     print("📦 Saving memes to JSON...")
-    with open(DATA_FILE, "w") as f:
-        json.dump(memes, f, indent=4)
+    durable.write_json(DATA_FILE, memes, group_commit=True, indent=4)
 
@@ -5,6 +5,8 @@ import uuid
 import json
 from PIL import ImageDraw, ImageFont
 
+from sections import durable, file_cache, ranking
+
 
 # Directory to store all posts
 DATA_DIR = "posts"
@@ -93,20 +95,25 @@ st.markdown(
 def load_posts(section):
     path = os.path.join(DATA_DIR, section)
     os.makedirs(path, exist_ok=True)
-    posts = []
-    for post_file in os.listdir(path):
-        with open(os.path.join(path, post_file), "r") as f:
-            posts.append(json.load(f))
-    posts.sort(key=lambda x: x["upvotes"], reverse=True)
-    return posts
+    signature = file_cache.file_signature(path)
+    if not ranking.is_current(path, signature):
+        posts = []
+        for post_file in os.listdir(path):
+            if post_file.startswith("."):
+                continue
+            with open(os.path.join(path, post_file), "r") as f:
+                posts.append(json.load(f))
+        ranking.build(path, posts, signature)
+    return ranking.top(path)
 
 
 def save_post(section, post):
     path = os.path.join(DATA_DIR, section)
     os.makedirs(path, exist_ok=True)
     post_id = post.get("id", str(uuid.uuid4())) + ".json"
-    with open(os.path.join(path, post_id), "w") as f:
-        json.dump(post, f)
+    previous = file_cache.file_signature(path)
+    durable.write_json(os.path.join(path, post_id), post)
+    ranking.update(path, post, signature=file_cache.file_signature(path), previous=previous)
 
 
 def add_dummy_posts():
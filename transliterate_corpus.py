@@ -0,0 +1,128 @@
+# transliterate_corpus.py
+"""Bulk phonetic transliteration of large romanized Telugu dumps.
+
+Uses exactly the same rules as the live typing page (transliterator.py).
+Input is streamed in chunks that are cut after a character that is not an
+ASCII letter - tokens are ASCII letters only, so no token spans a cut and
+chunked output is identical to converting the whole text at once. Newlines
+are passed through untranslated (CRLF stays CRLF). Chunks are fanned out to
+a process pool and written back in order, with a bounded number of chunks
+in flight so memory stays flat.
+
+    python transliterate_corpus.py dump1.txt dump2.txt -o telugu.txt -j 8
+    cat dump.txt | python transliterate_corpus.py > telugu.txt
+"""
+import os
+import sys
+import time
+import argparse
+from string import ascii_letters
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from transliterator import transliterate_phonetic
+
+DEFAULT_CHUNK_CHARS = 1 << 20  # ~1M characters per task
+
+
+def iter_chunks(stream, chunk_chars=DEFAULT_CHUNK_CHARS):
+    """Yield pieces of `stream`, each ending right after a character that is not an ASCII letter"""
+    pending = []  # read but not yielded yet; holds no cut point
+    while True:
+        block = stream.read(chunk_chars)
+        if not block:
+            break
+        # tokens are ASCII letters only, so cutting after any other character never splits one
+        head = block.rstrip(ascii_letters)
+        if not head:
+            # letters only so far: one run of tokens, keep reading until it ends
+            pending.append(block)
+            continue
+        pending.append(head)
+        yield "".join(pending)
+        pending = [block[len(head):]]
+    tail = "".join(pending)
+    if tail:
+        yield tail
+
+
+def iter_inputs(paths, chunk_chars=DEFAULT_CHUNK_CHARS):
+    """Chunks from each input path in order ('-' is stdin)"""
+    for path in paths:
+        if path == "-":
+            yield from iter_chunks(sys.stdin, chunk_chars)
+        else:
+            with open(path, "r", encoding="utf-8", errors="surrogateescape", newline="") as f:
+                yield from iter_chunks(f, chunk_chars)
+
+
+def run(paths, out, workers, max_pending, chunk_chars=DEFAULT_CHUNK_CHARS, report_every=5.0, quiet=False):
+    """Transliterate all inputs into `out`; returns (chars_in, chars_out, seconds)"""
+    chars_in = chars_out = 0
+    start = last_report = time.perf_counter()
+
+    def report(final=False):
+        elapsed = time.perf_counter() - start
+        rate = chars_in / elapsed if elapsed else 0.0
+        label = "done" if final else "progress"
+        print(f"[{label}] {chars_in:,} chars in, {chars_out:,} chars out, "
+              f"{elapsed:.1f}s, {rate:,.0f} chars/sec", file=sys.stderr)
+
+    def write(result):
+        nonlocal chars_out, last_report
+        out.write(result)
+        chars_out += len(result)
+        now = time.perf_counter()
+        if not quiet and now - last_report >= report_every:
+            last_report = now
+            report()
+
+    if workers <= 1:
+        for chunk in iter_inputs(paths, chunk_chars):
+            chars_in += len(chunk)
+            write(transliterate_phonetic(chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for chunk in iter_inputs(paths, chunk_chars):
+                chars_in += len(chunk)
+                pending.append(pool.submit(transliterate_phonetic, chunk))
+                # backpressure: wait for the oldest chunk before reading more
+                while len(pending) >= max_pending:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+
+    out.flush()
+    if not quiet:
+        report(final=True)
+    return chars_in, chars_out, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Transliterate romanized Telugu text in bulk.")
+    parser.add_argument("inputs", nargs="*", default=["-"], help="input files ('-' for stdin, the default)")
+    parser.add_argument("-o", "--output", default="-", help="output file ('-' for stdout, the default)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--chunk-chars", type=int, default=DEFAULT_CHUNK_CHARS, help="characters per task")
+    parser.add_argument("--max-pending", type=int, default=0, help="chunks in flight (default: 2 x workers)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no throughput report on stderr")
+    args = parser.parse_args(argv)
+
+    max_pending = args.max_pending or 2 * max(args.workers, 1)
+    sys.stdin.reconfigure(encoding="utf-8", errors="surrogateescape", newline="")
+    sys.stdout.reconfigure(encoding="utf-8", errors="surrogateescape", newline="")
+
+    if args.output == "-":
+        try:
+            run(args.inputs, sys.stdout, args.workers, max_pending, args.chunk_chars, quiet=args.quiet)
+        except BrokenPipeError:
+            # downstream closed early (e.g. `| head`); stop quietly
+            sys.stdout = None
+    else:
+        with open(args.output, "w", encoding="utf-8", errors="surrogateescape", newline="") as out:
+            run(args.inputs, out, args.workers, max_pending, args.chunk_chars, quiet=args.quiet)
+
+
+if __name__ == "__main__":
+    main()
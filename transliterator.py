@@ -0,0 +1,235 @@
+# transliterator.py
+"""Rule-based phonetic English -> Telugu transliteration.
+
+The token tables are compiled into longest-match tries once at import, so
+`transliterate_phonetic` does a handful of dict lookups per character instead
+of scanning every token with `startswith`.
+
+    python transliterator.py --bench       # chars/sec on a large synthetic input
+
+`transliterate_incremental` gives the same output but converts word by word
+through a process-wide LRU, so live typing only re-converts the edited word.
+"""
+import re
+import sys
+import time
+from functools import lru_cache
+
+from sections import metrics
+
+# ---- Transliteration rules (phonetic) ----
+# Independent vowels (include both common variants)
+VOWELS_INDEPENDENT = {
+    "aa": "ఆ", "a": "అ",
+    "ii": "ఈ", "ee": "ఈ", "i": "ఇ",
+    "eh": "ఏ", "e": "ఎ",
+    "ai": "ఐ",
+    "uu": "ఊ", "u": "ఉ",
+    "oo": "ఓ", "o": "ఒ",
+    "au": "ఔ"
+}
+
+# vowel signs (matras) used when vowel follows a consonant
+VOWEL_SIGNS = {
+    "a": "",    # implicit vowel
+    "aa": "ా",
+    "ii": "ీ", "ee": "ీ", "i": "ి",
+    "eh": "ే", "e": "ె",
+    "ai": "ై",
+    "uu": "ూ", "u": "ు",
+    "oo": "ో", "o": "ొ",
+    "au": "ౌ"
+}
+
+# Consonants (base glyphs; we add virama only when needed)
+CONSONANTS = {
+    # longer tokens first (digraphs)
+    "chh": "ఛ", "ch": "చ",
+    "kh": "ఖ", "gh": "ఘ",
+    "ph": "ఫ", "bh": "భ",
+    "jh": "ఝ", "sh": "శ", "ss": "ష",
+    "tth":"త",
+    "th": "థ", "dh": "ధ",
+    "ny": "ఞ", "gn": "ఙ",
+    # retroflex markers (capital D for retroflex is supported)
+    "dd":"ద","Dh": "ఢ", "D": "డ",
+    # single-letter consonants (lowercase dental/default)
+    "k": "క", "g": "గ",
+    "c": "చ", "j": "జ",
+    "t": "ట", "d": "డ",
+    "n": "న", "m": "మ",
+    "p": "ప", "b": "బ",
+    "y": "య", "r": "ర", "l": "ల",
+    "v": "వ", "w": "వ",
+    "s": "స", "h": "హ",
+    "x": "క్ష"
+}
+
+VIRAMA = "్"  # halant
+
+_END = ""  # trie key holding the token that ends at a node
+
+
+# ---- Compiled matchers (built once at import) ----
+def compile_trie(tokens):
+    """Nested-dict trie; node[_END] holds the token that ends there"""
+    root = {}
+    for token in tokens:
+        node = root
+        for ch in token:
+            node = node.setdefault(ch, {})
+        node[_END] = token
+    return root
+
+
+VOWEL_TRIE = compile_trie(VOWELS_INDEPENDENT)
+CONSONANT_TRIE = compile_trie(CONSONANTS)
+
+
+def match_token_at(text, i, trie):
+    """Longest token of `trie` starting at text[i], or None"""
+    node = trie
+    best = None
+    n = len(text)
+    while i < n:
+        node = node.get(text[i])
+        if node is None:
+            break
+        token = node.get(_END)
+        if token is not None:
+            best = token
+        i += 1
+    return best
+
+
+# ---- Transliteration function ----
+def transliterate_phonetic(input_text: str) -> str:
+    """
+    Greedy rule-based transliteration:
+    - attempt vowel token at current position first (independent vowel)
+    - else attempt consonant tokens (longest first)
+    - if consonant followed by vowel -> base + vowel_sign
+    - if consonant followed by consonant + vowel -> treat cluster/gemination
+    - if consonant not followed by vowel -> append virama (half-letter)
+    """
+    t = input_text  # preserve case (we allow 'D' / 'Dh' for retroflex)
+    out = []
+    i = 0
+    n = len(t)
+    while i < n:
+        ch = t[i]
+
+        # keep spaces/punct unchanged
+        if ch.isspace() or not ch.isalnum():
+            out.append(ch)
+            i += 1
+            continue
+
+        # Try independent vowel token first (e.g., 'eh', 'ee', 'ai', 'au', etc.)
+        v = match_token_at(t, i, VOWEL_TRIE)
+        if v:
+            out.append(VOWELS_INDEPENDENT[v])
+            i += len(v)
+            continue
+
+        # Try consonant token
+        c = match_token_at(t, i, CONSONANT_TRIE)
+        if c:
+            next_i = i + len(c)
+
+            # consonant cluster / gemination: c + c2 + vowel -> first + virama + second + sign
+            # (vowel and consonant tokens start with different letters, so at most
+            # one of c2 / v1 can match at next_i)
+            c2 = match_token_at(t, next_i, CONSONANT_TRIE)
+            if c2:
+                after_c2 = next_i + len(c2)
+                v2 = match_token_at(t, after_c2, VOWEL_TRIE)
+                if v2:
+                    out.append(CONSONANTS[c] + VIRAMA + CONSONANTS[c2] + VOWEL_SIGNS[v2])
+                    i = after_c2 + len(v2)
+                    continue
+                # else no vowel after c2 -> fallthrough to normal handling
+                v1 = None
+            else:
+                v1 = match_token_at(t, next_i, VOWEL_TRIE)
+
+            # Normal consonant + vowel handling
+            if v1:
+                # base + vowel sign (if sign empty -> implicit 'a')
+                out.append(CONSONANTS[c] + VOWEL_SIGNS[v1])
+                i = next_i + len(v1)
+            else:
+                # consonant not followed by vowel -> half-letter (append virama)
+                out.append(CONSONANTS[c] + VIRAMA)
+                i = next_i
+            continue
+
+        # fallback: append character as-is
+        out.append(ch)
+        i += 1
+
+    return "".join(out)
+
+
+# ---- Incremental (word-cached) transliteration ----
+# Tokens are made of ASCII letters only, so no match or lookahead ever crosses
+# whitespace: converting each whitespace-separated word on its own and joining
+# the pieces gives exactly the same output as converting the whole text.
+WORD_CACHE_SIZE = 100_000
+_WHITESPACE_SPLIT = re.compile(r"(\s+)")
+
+
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def transliterate_word(word):
+    """Cached transliteration of a single whitespace-free segment"""
+    return transliterate_phonetic(word)
+
+
+def transliterate_incremental(input_text: str) -> str:
+    """Same output as transliterate_phonetic, re-using cached words from earlier reruns/sessions"""
+    with metrics.timer("transliterate", op="incremental") as span:
+        span["bytes"] = len(input_text.encode("utf-8"))
+        parts = _WHITESPACE_SPLIT.split(input_text)
+        # split() with a capture group alternates word, whitespace, word, ...
+        parts[::2] = [transliterate_word(word) if word else word for word in parts[::2]]
+        return "".join(parts)
+
+
+def word_cache_info():
+    """Hits / misses / size of the shared word cache"""
+    return transliterate_word.cache_info()
+
+
+# ---- Benchmark ----
+def benchmark(total_chars=2_000_000):
+    """Transliterate a large synthetic romanized text and report chars/sec"""
+    sample = (
+        "voddu vellu bangaaru amma nanna chhatri Dhamaka kshetram ammaayi "
+        "pustakam 123, sheH! tthaata gnaanam nyaayam auShadham eh oo ii\n"
+    )
+    text = sample * (total_chars // len(sample) + 1)
+    start = time.perf_counter()
+    transliterate_phonetic(text)
+    elapsed = time.perf_counter() - start
+    print(f"{len(text):,} chars in {elapsed:.3f}s -> {len(text) / elapsed:,.0f} chars/sec")
+
+    # Live-typing session: append one character at a time to a long story
+    story = sample * 40
+    full = incremental = 0.0
+    for end in range(len(story) - 400, len(story) + 1):
+        start = time.perf_counter()
+        transliterate_phonetic(story[:end])
+        full += time.perf_counter() - start
+        start = time.perf_counter()
+        transliterate_incremental(story[:end])
+        incremental += time.perf_counter() - start
+    print(f"401 keystrokes on a {len(story):,}-char story: full {full * 1000:.0f}ms, "
+          f"incremental {incremental * 1000:.0f}ms ({word_cache_info()})")
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark()
+    else:
+        for line in sys.stdin:
+            sys.stdout.write(transliterate_phonetic(line))